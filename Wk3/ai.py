@@ -0,0 +1,353 @@
+"""Computer opponents that pick their own shots.
+
+These are strategies.Strategy subclasses: they work on cell indices
+(row * size + col), the engine asks for a cell with choose(rng), fires,
+and then reports the result with observe(cell, sunk_cells), where
+sunk_cells is None for a miss or the list of cell indices of the ship
+that went down. Fleets are placed at random, as in Strategy.
+
+Needs NumPy; the strategies in strategies.py do not.
+"""
+import atexit
+import os
+import random
+import threading
+import time
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import lru_cache
+
+import numpy as np
+
+from board import PlacementIndex
+from openings import default_book
+from zobrist import EvalCache
+from strategies import Strategy
+
+THINK_SECONDS = 5.0  # most MonteCarloAI.think samples while waiting for its move to be due
+MAX_ATTEMPTS_PER_SAMPLE = 20  # with max_samples, draws that may fail per layout asked for
+
+
+@lru_cache(maxsize=None)
+def placement_cells(size, length):
+    """(placements, length) array with the cells each placement covers"""
+    rows, cols = np.divmod(np.arange(size * size), size)
+    offsets = np.arange(length)
+    horizontal = np.flatnonzero(cols + length <= size)
+    vertical = np.flatnonzero(rows + length <= size)
+    cells = np.concatenate([
+        horizontal[:, None] + offsets,
+        vertical[:, None] + offsets * size,
+    ])
+    cells.setflags(write=False)
+    return cells
+
+
+@lru_cache(maxsize=None)
+def cell_placements(size, length):
+    """For each cell, the ids of the placements covering it, as (indptr, ids)"""
+    cells = placement_cells(size, length)
+    flat = cells.ravel()
+    order = np.argsort(flat, kind="stable")
+    ids = (order // length).astype(np.int32)
+    indptr = np.zeros(size * size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(flat, minlength=size * size), out=indptr[1:])
+    ids.setflags(write=False)
+    return indptr, ids
+
+
+class DensityAI(Strategy):
+    """Fires where the most remaining fleet placements overlap.
+
+    A hit sinks the whole ship in this game, so there is no separate target
+    mode: every shot is a hunt shot, and sinks feed back as blocked cells
+    and a smaller fleet. The density map is kept up to date incrementally,
+    subtracting only the placements each shot rules out.
+    """
+    slow = True  # Fast on small boards, but each move scans every cell
+
+    def __init__(self, size, lengths):
+        Strategy.__init__(self, size, lengths)
+        self.fleet = {}  # length -> ships of that length still afloat
+        for length in self.fleet_lengths:
+            self.fleet[length] = self.fleet.get(length, 0) + 1
+
+        cell_count = size * size
+        self.alive = {}  # length -> placements still possible
+        self.coverage = {}  # length -> how many live placements cover each cell
+        self.density = np.zeros(cell_count, dtype=np.int64)
+        for length, count in self.fleet.items():
+            cells = placement_cells(size, length)
+            cell_placements(size, length)  # build the lookup now rather than on the first shot
+            self.alive[length] = np.ones(len(cells), dtype=bool)
+            self.coverage[length] = np.bincount(cells.ravel(), minlength=cell_count)
+            self.density += count * self.coverage[length]
+        self.shot = np.zeros(cell_count, dtype=bool)
+
+    def choose(self, rng):
+        """Pick the untargeted cell with the highest density, breaking ties at random"""
+        scores = np.where(self.shot, -1, self.density)
+        best = np.flatnonzero(scores == scores.max())
+        return int(best[rng.randrange(len(best))])
+
+    def observe(self, cell, sunk_cells=None):
+        """Update the density map after a shot"""
+        blocked = [cell] if sunk_cells is None else sunk_cells
+        self.shot[blocked] = True
+
+        if sunk_cells is not None:
+            # One fewer ship of this length can still be out there
+            length = len(sunk_cells)
+            self.density -= self.coverage[length]
+            self.fleet[length] -= 1
+            if not self.fleet[length]:
+                del self.fleet[length]
+
+        for length, count in self.fleet.items():
+            indptr, ids = cell_placements(self.size, length)
+            covering = np.concatenate([ids[indptr[c]:indptr[c + 1]] for c in blocked])
+            if len(blocked) > 1:
+                covering = np.unique(covering)
+            alive = self.alive[length]
+            covering = covering[alive[covering]]
+            if not covering.size:
+                continue
+            alive[covering] = False
+            removed = np.bincount(
+                placement_cells(self.size, length)[covering].ravel(),
+                minlength=self.size * self.size,
+            )
+            self.coverage[length] -= removed
+            self.density -= count * removed
+
+
+def sample_layouts(size, lengths, blocked, budget, seed, max_samples=None):
+    """Sample fleet layouts that avoid the blocked cells until the budget runs out (or max_samples are drawn).
+
+    Returns (counts, samples): how many sampled layouts put a ship on each
+    cell, and how many layouts were drawn. With max_samples, it also gives
+    up after MAX_ATTEMPTS_PER_SAMPLE failed draws per sample asked for, so a
+    position no layout fits still returns. Runs inside pool workers.
+    """
+    rng = random.Random(seed)
+    counts = [0] * (size * size)
+    samples = 0
+    attempts = 0
+    max_attempts = float("inf") if max_samples is None else max_samples * MAX_ATTEMPTS_PER_SAMPLE
+    deadline = time.perf_counter() + budget
+    while (time.perf_counter() < deadline and (max_samples is None or samples < max_samples)
+           and attempts < max_attempts):
+        # A batch between clock checks keeps the timing overhead down
+        attempts += 32
+        for _ in range(32):
+            index = PlacementIndex(size, blocked)
+            cells = []
+            try:
+                for length in lengths:
+                    row, col, direction = index.choose(length, rng)
+                    start = row * size + col
+                    step = 1 if direction == "H" else size
+                    cells.extend(range(start, start + length * step, step))
+            except ValueError:
+                continue  # Earlier ships boxed a later one in; draw again
+            for cell in cells:
+                counts[cell] += 1
+            samples += 1
+    return counts, samples
+
+
+_pool = None
+_pool_workers = 0
+_cache = None
+_lock = threading.Lock()  # The server asks for these from several threads at once
+
+
+def get_pool(workers):
+    """Process pool shared by every MonteCarloAI with at least this many processes, started on first use"""
+    global _pool, _pool_workers
+    with _lock:
+        if _pool is not None and _pool_workers < workers:
+            # A bigger one replaces it; jobs other threads already handed the old pool still finish
+            _pool.shutdown(wait=False)
+            _pool = None
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers)
+            _pool_workers = workers
+        return _pool
+
+
+@atexit.register
+def shutdown_pool():
+    """Stop the shared pool's processes; the next get_pool starts a new one"""
+    global _pool
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+
+def get_cache():
+    """EvalCache shared by every MonteCarloAI in this process, made on first use"""
+    global _cache
+    with _lock:
+        if _cache is None:
+            _cache = EvalCache()
+        return _cache
+
+
+class MonteCarloAI(Strategy):
+    """Fires at the cell most often occupied in sampled fleet layouts.
+
+    Every move it draws as many layouts of the ships still afloat as it can
+    in its time budget, each one avoiding the misses and sunk ships seen so
+    far. Ships are placed one at a time, longest first, so layouts are close
+    to but not exactly uniform. With more than one worker the sampling is
+    split across a process pool. Positions in its opening book (see
+    openings.py) are looked up instead of sampled, and think() carries on
+    sampling from the book's heatmap. The counts for every position it
+    samples are kept in an EvalCache under the Zobrist hash of the board it
+    fires at (position, kept current by the engine), so a position seen in
+    an earlier game isn't sampled again.
+    """
+    slow = True  # Samples for its whole time budget every move
+
+    def __init__(self, size, lengths, budget=0.05, workers=None, book=None, cache=None):
+        Strategy.__init__(self, size, lengths)
+        self.book = book  # openings.OpeningBook, dropped once the game leaves it
+        self.cache = cache  # zobrist.EvalCache shared between games, or None
+        self.lengths = sorted(self.fleet_lengths, reverse=True)
+        self.budget = budget
+        self.workers = workers or os.cpu_count() or 1
+        # With one worker, sample in the calling thread; False sends even that to the pool,
+        # for callers like the server whose own thread must not hold the GIL that long
+        self.inline = True
+        self.blocked = 0  # mask of cells known to hold no live ship
+        self.shot = set()
+
+        # Stats for benchmarks
+        self.samples = 0
+        self.sampling_seconds = 0.0
+        self.book_moves = 0
+
+    def choose(self, rng):
+        """Pick the untargeted cell that was occupied in the most samples"""
+        cell = self.book_move()
+        if cell is not None:
+            return cell
+        counts = self.cached_counts()
+        if counts is None:
+            counts = array("q", self.sample(rng))
+            self.cache_counts(counts)
+        return self.pick(counts, rng)
+
+    def think(self, rng, stop):
+        """Keep sampling until stop is set, up to THINK_SECONDS, and pick from every sample drawn.
+
+        Starts from this position's cached counts, or the opening book's
+        heatmap, when there are any.
+        """
+        counts = self.cached_counts()
+        if counts is None:
+            counts = self.book_counts()
+        counts = array("q", counts if counts is not None else self.sample(rng))
+        deadline = time.perf_counter() + THINK_SECONDS
+        while not stop.is_set() and time.perf_counter() < deadline:
+            # Nothing new is known until the move is made, so each round's counts just add up
+            for cell, count in enumerate(self.sample(rng)):
+                counts[cell] += count
+        self.cache_counts(counts)
+        return self.pick(counts, rng)
+
+    def cache_key(self):
+        return self.size, self.position, tuple(self.lengths)
+
+    def cached_counts(self):
+        """Sampled counts for this position from an earlier game, or None"""
+        if self.cache is None:
+            return None
+        return self.cache.get(self.cache_key())
+
+    def cache_counts(self, counts):
+        if self.cache is not None:
+            self.cache.put(self.cache_key(), counts)
+
+    def book_lookup(self):
+        """The opening book's (heatmap, best cell) for this position, or None"""
+        if self.book is None:
+            return None
+        opening = self.book.lookup(self.blocked, self.lengths)
+        if opening is None:
+            self.book = None  # Shots only add up, so the game never comes back into the book
+        return opening
+
+    def book_move(self):
+        """The opening book's best cell for this position, or None"""
+        opening = self.book_lookup()
+        if opening is None:
+            return None
+        self.book_moves += 1
+        return opening[1]
+
+    def book_counts(self):
+        """The opening book's heatmap for this position as sample counts, or None"""
+        samples = self.book.samples if self.book is not None else 0
+        opening = self.book_lookup()
+        if opening is None:
+            return None
+        return np.rint(opening[0] * samples).astype(np.int64).tolist()
+
+    def sample(self, rng):
+        """One budget's worth of sampled layouts, as per-cell occupancy counts"""
+        start = time.perf_counter()
+        lengths = tuple(self.lengths)
+        if self.workers == 1 and self.inline:
+            results = [sample_layouts(self.size, lengths, self.blocked, self.budget, rng.random())]
+        else:
+            pool = get_pool(self.workers)
+            futures = [
+                pool.submit(sample_layouts, self.size, lengths, self.blocked, self.budget, rng.random())
+                for _ in range(self.workers)
+            ]
+            # Workers stop themselves at the budget; allow a little extra for the round trip
+            done, late = wait(futures, timeout=self.budget * 2)
+            if not done:
+                # Only while the pool is still starting up
+                done, late = wait(futures, return_when=FIRST_COMPLETED)
+            # Drop the ones not started yet; the rest stop at their budget, so wait for them
+            # rather than leave them holding workers into the next move
+            late = [future for future in late if not future.cancel()]
+            done, _ = wait(list(done) + late)
+            results = [future.result() for future in done]
+
+        counts = [0] * (self.size * self.size)
+        for worker_counts, samples in results:
+            self.samples += samples
+            for cell, count in enumerate(worker_counts):
+                counts[cell] += count
+        self.sampling_seconds += time.perf_counter() - start
+        return counts
+
+    def pick(self, counts, rng):
+        """The most often occupied cell not yet fired at, ties broken at random"""
+        candidates = [cell for cell in range(self.size * self.size) if cell not in self.shot]
+        best = max(counts[cell] for cell in candidates)
+        best_cells = [cell for cell in candidates if counts[cell] == best]
+        return best_cells[rng.randrange(len(best_cells))]
+
+    def observe(self, cell, sunk_cells=None):
+        """Record a shot so later samples stay consistent with it"""
+        blocked = [cell] if sunk_cells is None else sunk_cells
+        for blocked_cell in blocked:
+            self.shot.add(blocked_cell)
+            self.blocked |= 1 << blocked_cell
+        if sunk_cells is not None:
+            self.lengths.remove(len(sunk_cells))
+
+
+def make_ai(name, size, lengths):
+    """Build the named AI (see strategies.make_strategy for all of them)"""
+    if name == "density":
+        return DensityAI(size, lengths)
+    if name == "montecarlo":
+        return MonteCarloAI(size, lengths, book=default_book(size), cache=get_cache())
+    raise ValueError(f"Unknown AI: {name}")
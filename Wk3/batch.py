@@ -0,0 +1,153 @@
+"""Many games at once as stacked NumPy arrays, for large-scale evaluation.
+
+BatchGames holds N fleets being fired at, one per slot: ships is an
+(N, size, size) array of ship numbers (fleet order, -1 for water), hits
+and misses are boolean layers of the same shape, and afloat/ships_afloat
+count each fleet's ships still up. step() fires one shot into every live
+slot with a handful of array operations and follows Board.attack exactly:
+a hit sinks the whole ship, and a shot at a ship that's already down or
+at open water is a miss.
+
+A slot is one side of a game. Neither side's shots depend on the other's,
+so a two-sided game is two slots, won by whichever fleet falls in fewer
+shots (the side that fires first wins a tie). Finished slots are retired
+and refilled in place with fresh random fleets. E.g.:
+
+    games = BatchGames(10_000, seed=1)
+    while games.rows.size:
+        sunk, finished = games.step(games.random_targets())
+        shots = games.retire(finished)
+
+Needs NumPy.
+"""
+import numpy as np
+
+from ai import placement_cells
+from battleship_engine import BOARD_SIZE, ships
+
+DEFAULT_BATCH = 8192
+MAX_PLACEMENT_ROUNDS = 1000  # redraws of a ship's placement before giving up on a crowded board
+
+
+class BatchGames:
+    def __init__(self, n, size=BOARD_SIZE, fleet=None, seed=None):
+        self.size = size
+        self.lengths = list((ships if fleet is None else fleet).values())
+        self.rng = np.random.default_rng(seed)
+        cell_count = size * size
+        ship_type = np.int8 if len(self.lengths) < 127 else np.int16
+
+        self.ships = np.full((n, size, size), -1, dtype=ship_type)
+        self.hits = np.zeros((n, size, size), dtype=bool)
+        self.misses = np.zeros((n, size, size), dtype=bool)
+        self.afloat = np.ones((n, len(self.lengths)), dtype=bool)  # slot, ship number -> still up
+        self.ships_afloat = np.full(n, len(self.lengths), dtype=np.int32)
+        self.shots = np.zeros(n, dtype=np.int32)
+
+        # Flat (N, size * size) views of the same memory, indexed by cell
+        self.ship_cells = self.ships.reshape(n, cell_count)
+        self.hit_cells = self.hits.reshape(n, cell_count)
+        self.miss_cells = self.misses.reshape(n, cell_count)
+
+        # For random_targets: each slot's cells in shuffled order, and how far along it is
+        self.order = np.empty((n, cell_count), dtype=np.int32)
+        self.position = np.zeros(n, dtype=np.int32)
+
+        self.rows = np.arange(n)  # live slots; step() and random_targets() work on these, in order
+        self.new_games(self.rows)
+
+    def new_games(self, rows):
+        """Start fresh games in some slots: empty boards, a new random fleet, a new firing order"""
+        self.ship_cells[rows] = -1
+        self.hit_cells[rows] = False
+        self.miss_cells[rows] = False
+        self.afloat[rows] = True
+        self.ships_afloat[rows] = len(self.lengths)
+        self.shots[rows] = 0
+        self.place_fleets(rows)
+        cells = np.arange(self.size * self.size, dtype=np.int32)
+        self.order[rows] = self.rng.permuted(np.broadcast_to(cells, (len(rows), len(cells))), axis=1)
+        self.position[rows] = 0
+
+    def place_fleets(self, rows):
+        """Place every fleet ship by ship, each uniform over its legal placements, like PlacementIndex"""
+        occupied = np.zeros((len(rows), self.size * self.size), dtype=bool)
+        for number, length in enumerate(self.lengths):
+            table = placement_cells(self.size, length)
+            pending = np.arange(len(rows))
+            for _ in range(MAX_PLACEMENT_ROUNDS):
+                cells = table[self.rng.integers(len(table), size=len(pending))]
+                clash = occupied[pending[:, None], cells].any(axis=1)
+                placed, cells = pending[~clash], cells[~clash]
+                occupied[placed[:, None], cells] = True
+                self.ship_cells[rows[placed][:, None], cells] = number
+                pending = pending[clash]
+                if not pending.size:
+                    break
+            else:
+                raise ValueError(f"No room left for a ship of length {length}")
+
+    def random_targets(self):
+        """One random cell per live slot that hasn't been fired at, as RandomStrategy would pick"""
+        rows = self.rows
+        position = self.position[rows]
+        while True:
+            cells = self.order[rows, position]
+            # Cells of a sunk ship count as fired at; skip past them
+            taken = self.hit_cells[rows, cells] | self.miss_cells[rows, cells]
+            if not taken.any():
+                break
+            position += taken
+        self.position[rows] = position + 1
+        return cells
+
+    def step(self, cells):
+        """Fire cells[i] into live slot rows[i].
+
+        Returns (the ship number each shot sank, or -1 for a miss; which slots just lost their last ship).
+        """
+        rows = self.rows
+        ship = self.ship_cells[rows, cells].astype(np.intp)
+        sunk = ship >= 0
+        sunk[sunk] = self.afloat[rows[sunk], ship[sunk]]
+
+        missed = ~sunk
+        self.miss_cells[rows[missed], cells[missed]] = True
+        sinking = rows[sunk]
+        if sinking.size:
+            # The whole ship goes down at once
+            self.hit_cells[sinking] |= self.ship_cells[sinking] == ship[sunk, None]
+            self.afloat[sinking, ship[sunk]] = False
+            self.ships_afloat[sinking] -= 1
+        self.shots[rows] += 1
+        return np.where(sunk, ship, -1), self.ships_afloat[rows] == 0
+
+    def retire(self, finished, replace=None):
+        """Take finished slots (a mask over rows, as from step) out of play and return their shot counts.
+
+        The first `replace` of them, or all if None, start new games in
+        place; the rest leave rows for good.
+        """
+        done = self.rows[finished]
+        shots = self.shots[done].copy()
+        if done.size:
+            keep = done if replace is None else done[:replace]
+            if keep.size:
+                self.new_games(keep)
+            if keep.size < done.size:
+                self.rows = np.setdiff1d(self.rows, done[keep.size:], assume_unique=True)
+        return shots
+
+
+def play_random(n_fleets, batch=DEFAULT_BATCH, size=BOARD_SIZE, fleet=None, seed=None):
+    """Shots a random shooter needs to sink each of n_fleets random fleets, in the order they finish"""
+    games = BatchGames(min(batch, n_fleets), size, fleet, seed)
+    started = len(games.rows)
+    results = []
+    while games.rows.size:
+        _, finished = games.step(games.random_targets())
+        if finished.any():
+            replace = min(int(finished.sum()), n_fleets - started)
+            started += replace
+            results.append(games.retire(finished, replace))
+    return np.concatenate(results) if results else np.zeros(0, dtype=np.int32)
@@ -0,0 +1,239 @@
+import random
+
+from board import make_board, mask_cells, row_label
+from snapshot import pack_snapshot, restore_side, unpack_snapshot
+from strategies import make_strategy
+
+# Game constants
+BOARD_SIZE = 10
+
+# Ship definitions
+ships = {
+    "Destroyer": 2,
+    "Submarine": 3,
+    "Cruiser": 3,
+    "Battleship": 4,
+    "Carrier": 5
+}
+
+
+def make_fleet(lengths):
+    """Fleet dict for a list of ship lengths, with numbered names"""
+    return {f"Ship {number}": length for number, length in enumerate(lengths, 1)}
+
+
+class BattleshipEngine:
+    """Game rules without any display or keyboard input.
+
+    The pygame front end builds on this class, and simulate.py drives it
+    directly to play computer-vs-computer games in bulk.
+    """
+    def __init__(self, seed=None, computer_ai="random", board_size=BOARD_SIZE, fleet=None, recorder=None,
+                 player_ai="random"):
+        self.rng = random.Random(seed)
+        # Strategy names (see strategies.py); the player's is only used for computer-vs-computer games
+        self.computer_ai_name = computer_ai
+        self.player_ai_name = player_ai
+        self.board_size = board_size
+        self.fleet = ships if fleet is None else fleet
+
+        # Optional records.GameRecorder that archives each finished game
+        self.recorder = recorder
+
+        self.reset()
+
+    def reset(self):
+        """Start a new game: fresh boards, a new computer fleet and a new AI"""
+        # Game state
+        self.game_state = "SETUP"  # SETUP, PLAYING, GAME_OVER
+        self.winner = None
+
+        self.new_boards()
+        self.new_ai()
+
+        # Turn management
+        self.player_turn = True
+        self.message = ""
+
+        self.place_computer_ships()
+
+    def new_boards(self):
+        """Empty boards with no ships placed and no shots fired"""
+        # Bitboards, or sparse sets on very large boards;
+        # Board.cell() gives 0=empty, 1=ship, 2=hit, 3=miss
+        self.player_board = make_board(self.board_size)
+        self.computer_board = make_board(self.board_size)
+        self.player_attack_board = make_board(self.board_size)
+
+        # Ship positions
+        self.player_ships = {}
+        self.computer_ships = {}
+
+    def new_ai(self):
+        """Fresh strategies for both sides; each keeps track of where it has fired"""
+        self.computer_ai = make_strategy(self.computer_ai_name, self.board_size, self.fleet.values())
+        self.player_ai = make_strategy(self.player_ai_name, self.board_size, self.fleet.values())
+
+    def snapshot(self, direction="H"):
+        """The game so far as a few dozen bytes (see snapshot.py)"""
+        return pack_snapshot(self.board_size, self.fleet, self.player_board, self.computer_board,
+                             self.game_state, self.player_turn, direction, self.winner)
+
+    def restore(self, data):
+        """Pick up a game from snapshot(), rebuilding boards, target pools and the AI without replaying it.
+
+        Returns the decoded snapshot for front ends that keep more state.
+        """
+        state = unpack_snapshot(data, self.board_size, self.fleet)
+        self.new_boards()
+        self.new_ai()
+        # The computer's shots at the player's fleet, then the player's at the computer's
+        restore_side(self.player_board, self.player_ships, self.fleet, state["player_layout"],
+                     state["player_sunk"], state["player_misses"], self.place_ship)
+        restore_side(self.computer_board, self.computer_ships, self.fleet, state["computer_layout"],
+                     state["computer_sunk"], state["computer_misses"], self.place_ship, self.player_attack_board)
+        # Each side's strategy learns the results of its own shots so far
+        for strategy, board, side in ((self.computer_ai, self.player_board, "player"),
+                                      (self.player_ai, self.computer_board, "computer")):
+            for name in state[f"{side}_sunk"]:
+                cells = board.ship_cells[board.ship_ids[name]]
+                strategy.observe(cells[0], list(cells))
+            misses = state[f"{side}_misses"]
+            for cell in (misses if isinstance(misses, set) else mask_cells(misses)):
+                strategy.observe(cell)
+            strategy.position = board.zobrist
+
+        self.game_state = state["game_state"]
+        self.player_turn = state["player_turn"]
+        self.winner = state["winner"]
+        if self.recorder:
+            self.recorder.abandon()  # The archive only takes games recorded from the start
+        return state
+
+    def place_computer_ships(self):
+        """Place the computer's fleet where its strategy wants it"""
+        self.place_layout(self.computer_board, self.computer_ships, self.computer_ai.place_fleet(self.rng))
+
+    def place_random_ships(self, board, ship_dict):
+        """Randomly place the whole fleet on a board"""
+        # No retry loop: each ship is drawn straight from the legal placements
+        index = board.placement_index()
+        for ship_name, length in self.fleet.items():
+            row, col, direction = index.choose(length, self.rng)
+            self.place_ship(board, ship_dict, ship_name, row, col, length, direction)
+
+    def place_layout(self, board, ship_dict, layout):
+        """Place the fleet at given (row, col, direction) spots, in fleet order"""
+        for (ship_name, length), (row, col, direction) in zip(self.fleet.items(), layout):
+            self.place_ship(board, ship_dict, ship_name, row, col, length, direction)
+
+    def start_game(self):
+        """Both fleets are placed: start shooting"""
+        self.game_state = "PLAYING"
+        if self.recorder:
+            self.recorder.start(self)
+
+    def is_valid_placement(self, board, row, col, length, direction):
+        """Check if ship placement is valid"""
+        return board.is_valid_placement(row, col, length, direction)
+
+    def place_ship(self, board, ship_dict, ship_name, row, col, length, direction):
+        """Place a ship on the board"""
+        ship_dict[ship_name] = board.place_ship(ship_name, row, col, length, direction)
+
+    def attack(self, row, col):
+        """Attack a cell on computer's board"""
+        if self.recorder:
+            self.recorder.shot(row * self.board_size + col)
+        result, ship_name = self.computer_board.attack(row, col)
+        if result == "sunk":
+            # The whole ship is marked as hit
+            self.player_attack_board.mark_hit(self.computer_board.ship_masks[ship_name])
+            self.message = f"HIT AND SUNK! You destroyed the {ship_name}!"
+            return True
+        self.player_attack_board.mark_miss(row, col)
+        self.message = "Miss!"
+        return False
+
+    def computer_attack(self, cell=None):
+        """Computer makes an attack chosen by its strategy, unless a cell is given (for replays)"""
+        if cell is None:
+            cell = self.computer_ai.choose(self.rng)
+        if self.recorder:
+            self.recorder.shot(cell)
+        row, col = divmod(cell, self.board_size)
+
+        result, ship_name = self.player_board.attack(row, col)
+        if self.computer_ai is not None:
+            if result == "sunk":
+                # The strategy hears the whole ship went down, so it won't fire at the rest of it
+                self.computer_ai.observe(cell, self.player_board.ship_cells[self.player_board.ship_ids[ship_name]])
+            else:
+                self.computer_ai.observe(cell)
+            self.computer_ai.position = self.player_board.zobrist
+        if result == "sunk":
+            self.message = f"Computer HIT AND SUNK your {ship_name}!"
+            return True
+        self.message = f"Computer missed at {row_label(row)}{col+1}"
+        return False
+
+    def untried_cell(self):
+        """A random cell the computer hasn't fired at, picked without its strategy"""
+        size = self.board_size
+        board = self.player_board
+        for _ in range(64):
+            cell = self.rng.randrange(size * size)
+            if not board.is_attacked(*divmod(cell, size)):
+                return cell
+        # Most of the board is shot already; pick from what's left
+        return self.rng.choice([cell for cell in range(size * size) if not board.is_attacked(*divmod(cell, size))])
+
+    def auto_attack(self):
+        """Attack on behalf of the player with its strategy, used for computer-vs-computer games"""
+        cell = self.player_ai.choose(self.rng)
+        board = self.computer_board
+        sunk = self.attack(*divmod(cell, self.board_size))
+        if sunk:
+            self.player_ai.observe(cell, board.ship_cells[board.cell_ship[cell]])
+        else:
+            self.player_ai.observe(cell)
+        self.player_ai.position = board.zobrist
+        return sunk
+
+    def check_game_over(self):
+        """Check if all ships of either player are sunk"""
+        # Boards keep live fleet counters, so this is constant time
+        player_ships_alive = self.player_board.ships_afloat > 0
+        computer_ships_alive = self.computer_board.ships_afloat > 0
+
+        if not computer_ships_alive:
+            self.game_state = "GAME_OVER"
+            self.winner = "player"
+            self.message = "🎉 YOU WON! All enemy ships destroyed! 🎉"
+            if self.recorder:
+                self.recorder.finish()
+            return True
+        elif not player_ships_alive:
+            self.game_state = "GAME_OVER"
+            self.winner = "computer"
+            self.message = "💥 GAME OVER! All your ships destroyed! 💥"
+            if self.recorder:
+                self.recorder.finish()
+            return True
+        return False
+
+    def play_auto_game(self):
+        """Play a full computer-vs-computer game and return (winner, turns)"""
+        self.place_layout(self.player_board, self.player_ships, self.player_ai.place_fleet(self.rng))
+        self.start_game()
+
+        turns = 0
+        while True:
+            turns += 1
+            self.auto_attack()
+            if self.check_game_over():
+                break
+            self.computer_attack()
+            if self.check_game_over():
+                break
+        return self.winner, turns
@@ -1,18 +1,39 @@
+import argparse
 import pygame
 import random
 import sys
-
-# Initialize Pygame
-pygame.init()
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from battleship_engine import BattleshipEngine, BOARD_SIZE, make_fleet, ships
+from board import row_label
+from client import ServerConnection
+from profiler import FrameProfiler
+from records import ArchiveWriter, GameArchive
 
 # Constants
 WINDOW_WIDTH = 1200
 WINDOW_HEIGHT = 700
-BOARD_SIZE = 10
 CELL_SIZE = 40
 BOARD_OFFSET_X = 50
 BOARD_OFFSET_Y = 100
 ATTACK_BOARD_OFFSET_X = 650
+LABEL_MARGIN = 25  # room for the coordinate labels left of and above each board
+WIDE_LABEL_MARGIN = 40  # left margin for boards past 26 rows, with two- and three-letter row labels
+BOARD_PIXELS = BOARD_SIZE * CELL_SIZE  # on-screen width of each board's viewport
+ZOOM_LEVELS = [4, 6, 8, 12, 16, 20, 24, 32, 40]  # cell sizes in pixels
+LARGE_BOARD_CELL_SIZE = 16  # starting zoom for boards that don't fit on screen
+IDLE_TIMEOUT_MS = 1000  # longest the event-driven loop sleeps without any event
+PROFILE_REFRESH_SECONDS = 0.5  # how often the profiling overlay's numbers change
+PROFILE_OVERLAY_POS = (780, 520)  # top left of the overlay, below the attack board
+REPLAY_EVENT = pygame.USEREVENT + 2  # steps a replay while it's playing
+REPLAY_STEP_MS = 300
+NETWORK_EVENT = pygame.USEREVENT + 3  # a line from the server in client mode, as event.words
+AI_MOVE_EVENT = pygame.USEREVENT + 4  # a computer move worked out on the AI thread, as event.future of (cell, seconds)
+COMPUTER_MOVE_DELAY_MS = 1500
+SAVE_FILE = "battleship.sav"  # F5 saves here, F9 loads
+WALL_TOP = 50  # the spectator wall's boards start below its title and stats line
 
 # Colors
 WHITE = (255, 255, 255)
@@ -25,219 +46,305 @@ LIGHT_BLUE = (173, 216, 230)
 DARK_BLUE = (0, 0, 139)
 YELLOW = (255, 255, 0)
 
-# Ship definitions
-ships = {
-    "Destroyer": 2,
-    "Submarine": 3,
-    "Cruiser": 3,
-    "Battleship": 4,
-    "Carrier": 5
+# Arrow key -> (rows, cols) to scroll the viewport
+SCROLL_KEYS = {
+    pygame.K_UP: (-1, 0),
+    pygame.K_DOWN: (1, 0),
+    pygame.K_LEFT: (0, -1),
+    pygame.K_RIGHT: (0, 1),
 }
 
-class BattleshipPygame:
-    def __init__(self):
+def timed_think(strategy, rng, stop):
+    """strategy.think(rng, stop) and how many seconds it took, for the AI thread"""
+    start = time.perf_counter()
+    cell = strategy.think(rng, stop)
+    return cell, time.perf_counter() - start
+
+class TextCache:
+    """Bounded LRU cache of rendered text surfaces, keyed by (font, text, color)"""
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def render(self, font, text, color):
+        """Same as font.render(text, True, color), but only rasterizes text it hasn't seen recently"""
+        key = (font, text, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)  # Least recently used
+        return surface
+    
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.surfaces)}
+
+class BattleshipPygame(BattleshipEngine):
+    def __init__(self, computer_ai="random", event_driven=True, board_size=BOARD_SIZE, fleet=None,
+                 profiler=None, show_profile=False, recorder=None, save_path=SAVE_FILE):
+        # Only the subsystems the game uses; pygame.init() would start audio,
+        # joysticks and the rest too
+        pygame.display.init()
+        pygame.font.init()
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("Battleship Game")
         self.clock = pygame.time.Clock()
         self.font = pygame.font.Font(None, 24)
         self.big_font = pygame.font.Font(None, 36)
+        self.small_font = None  # For the profiling overlay, loaded the first time it's shown
+        self.text_cache = TextCache()
+        self.save_path = save_path
+        
+        # Frame timing: None unless a log was asked for or the overlay is on (F3)
+        self.profiler = profiler
+        self.show_profile = show_profile
+        self.profile_refresh = 0.0
+        self.profile_rows = []
+        
+        # Event-driven: sleep until input or a timer arrives. Otherwise poll and redraw at 60 FPS
+        self.event_driven = event_driven
+        
+        # Viewport: both boards show the same window of cells, starting at
+        # (view_row, view_col). Boards that fit are shown whole at full size
+        if board_size * CELL_SIZE <= BOARD_PIXELS:
+            self.cell_size = CELL_SIZE
+        else:
+            self.cell_size = LARGE_BOARD_CELL_SIZE
+        self.view_row = 0
+        self.view_col = 0
+        self.label_margin = LABEL_MARGIN if board_size <= 26 else WIDE_LABEL_MARGIN  # left of the board
+        
+        # Rendering caches; everything is redrawn when drawn_state falls out of date.
+        # The grid layer and text cache outlive a restart
+        self.board_layer = None
+        self.board_seen = {}  # board offset -> (board, how many of its changes are drawn)
+        self.drawn_text = {}  # text slot -> (text, color, pos, rect) on screen
+        self.preview_cells = []  # cells painted yellow by the last preview
+        self.preview_key = None
+        self.drawn_state = None
+        self.dirty_rects = []
+        
+        # Client mode: a client.ServerConnection, and whether to play other clients or the server's AI
+        self.client = None
+        self.pvp = False
+        
+        # Slow strategies work out their next move on a thread during the player's
+        # turn (see start_thinking). ai_generation tells a stale move from the current one
+        self.ai_thread = None
+        self.ai_generation = 0
+        self.ai_stop = None  # threading.Event while a move is being worked out
+        self.ai_move = None  # the move, once it arrives
+        self.ai_due = False  # the computer's turn came before its move did
         
-        # Game state
-        self.game_state = "SETUP"  # SETUP, PLAYING, GAME_OVER
+        # Boards, ships and turn state live in the engine, which calls reset()
+        BattleshipEngine.__init__(self, computer_ai=computer_ai, board_size=board_size, fleet=fleet,
+                                  recorder=recorder)
+    
+    def reset(self):
+        """New game in the same window: game state only, keeping fonts and cached surfaces"""
+        # A computer move or replay step still pending belongs to the old game
+        self.cancel_thinking()
+        BattleshipEngine.reset(self)
+        pygame.time.set_timer(pygame.USEREVENT + 1, 0)
+        pygame.time.set_timer(REPLAY_EVENT, 0)
+        
+        # Setup state
         self.current_ship = 0
-        self.ship_names = list(ships.keys())
+        self.ship_names = list(self.fleet)
         self.ship_direction = "H"  # H or V
         self.selected_cell = None
         
-        # Boards: 0=empty, 1=ship, 2=hit, 3=miss
-        self.player_board = [[0 for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
-        self.computer_board = [[0 for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
-        self.player_attack_board = [[0 for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
-        
-        # Ship positions
-        self.player_ships = {}
-        self.computer_ships = {}
-        
-        # Turn management
-        self.player_turn = True
         self.message = "Place your ships! Click to place, R to rotate"
         
-        self.place_computer_ships()
-    
-    def place_computer_ships(self):
-        """Randomly place computer ships"""
-        for ship_name, length in ships.items():
-            placed = False
-            while not placed:
-                direction = random.choice(["H", "V"])
-                row = random.randint(0, BOARD_SIZE - 1)
-                col = random.randint(0, BOARD_SIZE - 1)
-                
-                if self.is_valid_placement(self.computer_board, row, col, length, direction):
-                    self.place_ship(self.computer_board, self.computer_ships, ship_name, row, col, length, direction)
-                    placed = True
-    
-    def is_valid_placement(self, board, row, col, length, direction):
-        """Check if ship placement is valid"""
-        if direction == "H":
-            if col + length > BOARD_SIZE:
-                return False
-            for i in range(length):
-                if board[row][col + i] != 0:
-                    return False
-        else:  # Vertical
-            if row + length > BOARD_SIZE:
-                return False
-            for i in range(length):
-                if board[row + i][col] != 0:
-                    return False
-        return True
-    
-    def place_ship(self, board, ship_dict, ship_name, row, col, length, direction):
-        """Place a ship on the board"""
-        positions = []
-        if direction == "H":
-            for i in range(length):
-                board[row][col + i] = 1
-                positions.append((row, col + i))
-        else:  # Vertical
-            for i in range(length):
-                board[row + i][col] = 1
-                positions.append((row + i, col))
-        ship_dict[ship_name] = positions
+        # Replay of an archived game: (archive, game number, shots), or None
+        self.replay = None
+        self.replay_layouts = None  # (player layout, computer layout) of the replayed game
+        self.replay_turn = 0
+        self.replay_playing = False
+        
+        self.drawn_state = None  # Repaint everything on the next frame
+    
+    def visible_cells(self):
+        """How many rows (and columns) of each board fit in the viewport"""
+        return min(self.board_size, BOARD_PIXELS // self.cell_size)
+    
+    def is_visible(self, row, col):
+        visible = self.visible_cells()
+        return (self.view_row <= row < self.view_row + visible and
+                self.view_col <= col < self.view_col + visible)
+    
+    def move_view(self, rows, cols):
+        """Scroll the viewport, keeping it on the board"""
+        limit = self.board_size - self.visible_cells()
+        view_row = max(0, min(limit, self.view_row + rows))
+        view_col = max(0, min(limit, self.view_col + cols))
+        if (view_row, view_col) != (self.view_row, self.view_col):
+            self.view_row, self.view_col = view_row, view_col
+            self.board_layer = None
+            self.drawn_state = None  # Everything on the boards moves
+    
+    def zoom(self, steps):
+        """Change the cell size by some zoom levels, keeping the same cell in the middle"""
+        level = ZOOM_LEVELS.index(self.cell_size)
+        cell_size = ZOOM_LEVELS[max(0, min(len(ZOOM_LEVELS) - 1, level + steps))]
+        if cell_size == self.cell_size:
+            return
+        half = self.visible_cells() // 2
+        center_row, center_col = self.view_row + half, self.view_col + half
+        self.cell_size = cell_size
+        half = self.visible_cells() // 2
+        self.view_row, self.view_col = center_row - half, center_col - half
+        self.board_layer = None
+        self.drawn_state = None
+        self.move_view(0, 0)  # Clamp to the board
     
     def get_cell_from_mouse(self, mouse_pos, board_offset_x):
         """Convert mouse position to board cell coordinates"""
         x, y = mouse_pos
-        if (board_offset_x <= x <= board_offset_x + BOARD_SIZE * CELL_SIZE and
-            BOARD_OFFSET_Y <= y <= BOARD_OFFSET_Y + BOARD_SIZE * CELL_SIZE):
-            col = (x - board_offset_x) // CELL_SIZE
-            row = (y - BOARD_OFFSET_Y) // CELL_SIZE
+        span = self.visible_cells() * self.cell_size
+        if (board_offset_x <= x < board_offset_x + span and
+            BOARD_OFFSET_Y <= y < BOARD_OFFSET_Y + span):
+            col = self.view_col + (x - board_offset_x) // self.cell_size
+            row = self.view_row + (y - BOARD_OFFSET_Y) // self.cell_size
             return row, col
         return None
     
-    def attack(self, row, col):
-        """Attack a cell on computer's board"""
-        if self.computer_board[row][col] == 1:  # Hit
-            # Find and sink entire ship
-            for ship_name, positions in self.computer_ships.items():
-                if (row, col) in positions:
-                    # Mark all positions of this ship as hit
-                    for ship_row, ship_col in positions:
-                        self.computer_board[ship_row][ship_col] = 2
-                        self.player_attack_board[ship_row][ship_col] = 2
-                    self.message = f"HIT AND SUNK! You destroyed the {ship_name}!"
-                    return True
-        else:  # Miss
-            self.computer_board[row][col] = 3
-            self.player_attack_board[row][col] = 3
-            self.message = "Miss!"
-            return False
-    
-    def computer_attack(self):
-        """Computer makes a random attack"""
-        while True:
-            row = random.randint(0, BOARD_SIZE - 1)
-            col = random.randint(0, BOARD_SIZE - 1)
+    def get_board_layer(self):
+        """Grid lines, empty cells and coordinate labels for the viewport, rendered once and shared by both boards"""
+        if self.board_layer is None:
+            visible = self.visible_cells()
+            cell = self.cell_size
+            left = self.label_margin
+            top = LABEL_MARGIN
+            span = visible * cell
+            layer = pygame.Surface((left + span + 1, top + span + 1))
+            layer.fill(WHITE)
             
-            if self.player_board[row][col] in [0, 1]:  # Not already attacked
-                if self.player_board[row][col] == 1:  # Hit
-                    # Find and sink entire ship
-                    for ship_name, positions in self.player_ships.items():
-                        if (row, col) in positions:
-                            # Mark all positions of this ship as hit
-                            for ship_row, ship_col in positions:
-                                self.player_board[ship_row][ship_col] = 2
-                            self.message = f"Computer HIT AND SUNK your {ship_name}!"
-                            return True
-                else:  # Miss
-                    self.player_board[row][col] = 3
-                    self.message = f"Computer missed at {chr(65+row)}{col+1}"
-                    return False
-    
-    def check_game_over(self):
-        """Check if all ships of either player are sunk"""
-        player_ships_alive = any(1 in row for row in self.player_board)
-        computer_ships_alive = any(1 in row for row in self.computer_board)
-        
-        if not computer_ships_alive:
-            self.game_state = "GAME_OVER"
-            self.message = "🎉 YOU WON! All enemy ships destroyed! 🎉"
-            return True
-        elif not player_ships_alive:
-            self.game_state = "GAME_OVER"
-            self.message = "💥 GAME OVER! All your ships destroyed! 💥"
-            return True
-        return False
+            # Empty water, with a white gap along the right and bottom of each cell.
+            # One fill and a line per row and column, however many cells are showing
+            layer.fill(LIGHT_BLUE, (left, top, span, span))
+            for i in range(visible):
+                pygame.draw.line(layer, WHITE, (left, top + i * cell + cell - 1), (left + span, top + i * cell + cell - 1))
+                pygame.draw.line(layer, WHITE, (left + i * cell + cell - 1, top), (left + i * cell + cell - 1, top + span))
+            
+            # Draw grid
+            for i in range(visible + 1):
+                y = top + i * cell
+                pygame.draw.line(layer, BLACK, (left, y), (left + span, y))
+                x = left + i * cell
+                pygame.draw.line(layer, BLACK, (x, top), (x, top + span))
+            
+            # Draw coordinates, skipping some when zoomed out too far for every label to fit
+            row_step = -(-18 // cell)
+            col_step = -(-(self.font.size(str(self.board_size))[0] + 6) // cell)
+            for i in range(visible):
+                row = self.view_row + i
+                if row % row_step == 0:
+                    # Row labels (A-Z, then AA, AB, ...)
+                    text = self.text_cache.render(self.font, row_label(row), BLACK)
+                    layer.blit(text, (0, top + i * cell + cell // 2 - 8))
+                col = self.view_col + i
+                if (col + 1) % col_step == 0 or col_step == 1:
+                    # Column labels (1, 2, ...)
+                    text = self.text_cache.render(self.font, str(col + 1), BLACK)
+                    layer.blit(text, (left + i * cell + cell // 2 - 5, 0))
+            
+            self.board_layer = layer
+        return self.board_layer
     
     def draw_board(self, board, offset_x, offset_y, show_ships=True, attack_board=False):
-        """Draw a game board"""
-        # Draw grid
-        for row in range(BOARD_SIZE + 1):
-            y = offset_y + row * CELL_SIZE
-            pygame.draw.line(self.screen, BLACK, (offset_x, y), (offset_x + BOARD_SIZE * CELL_SIZE, y))
+        """Draw the visible part of a game board, redrawing only the cells that changed since the last frame"""
+        seen = self.board_seen.get((offset_x, offset_y))
+        if seen is None or seen[0] is not board:
+            # First draw: the cached layer, then every cell that isn't empty water
+            rect = self.screen.blit(self.get_board_layer(), (offset_x - self.label_margin, offset_y - LABEL_MARGIN))
+            self.dirty_rects.append(rect)
+            changed = set(board.changes)
+        else:
+            changed = set(board.changes[seen[1]:])
+        
+        for index in changed:
+            row, col = divmod(index, self.board_size)
+            if self.is_visible(row, col):
+                self.dirty_rects.append(self.draw_cell(board, row, col, offset_x, offset_y, show_ships, attack_board))
+        self.board_seen[offset_x, offset_y] = (board, len(board.changes))
+    
+    def draw_cell(self, board, row, col, offset_x, offset_y, show_ships=True, attack_board=False):
+        """Draw one visible cell and return the rect it covers"""
+        cell_size = self.cell_size
+        x = offset_x + (col - self.view_col) * cell_size
+        y = offset_y + (row - self.view_row) * cell_size
+        cell_rect = pygame.Rect(x + 1, y + 1, cell_size - 2, cell_size - 2)
+        radius = max(1, cell_size // 5)
         
-        for col in range(BOARD_SIZE + 1):
-            x = offset_x + col * CELL_SIZE
-            pygame.draw.line(self.screen, BLACK, (x, offset_y), (x, offset_y + BOARD_SIZE * CELL_SIZE))
+        cell = board.cell(row, col)
         
-        # Draw cells
-        for row in range(BOARD_SIZE):
-            for col in range(BOARD_SIZE):
-                x = offset_x + col * CELL_SIZE
-                y = offset_y + row * CELL_SIZE
-                cell_rect = pygame.Rect(x + 1, y + 1, CELL_SIZE - 2, CELL_SIZE - 2)
-                
-                if attack_board:
-                    if board[row][col] == 0:
-                        pygame.draw.rect(self.screen, LIGHT_BLUE, cell_rect)
-                    elif board[row][col] == 2:
-                        pygame.draw.rect(self.screen, RED, cell_rect)  # Hit
-                        self.draw_x(x, y)
-                    elif board[row][col] == 3:
-                        pygame.draw.rect(self.screen, WHITE, cell_rect)  # Miss
-                        pygame.draw.circle(self.screen, BLUE, (x + CELL_SIZE//2, y + CELL_SIZE//2), 8)
+        if attack_board:
+            if cell == 0:
+                pygame.draw.rect(self.screen, LIGHT_BLUE, cell_rect)
+            elif cell == 2:
+                pygame.draw.rect(self.screen, RED, cell_rect)  # Hit
+                self.draw_x(x, y)
+            elif cell == 3:
+                pygame.draw.rect(self.screen, WHITE, cell_rect)  # Miss
+                pygame.draw.circle(self.screen, BLUE, (x + cell_size//2, y + cell_size//2), radius)
+        else:
+            if cell == 0:
+                pygame.draw.rect(self.screen, LIGHT_BLUE, cell_rect)
+            elif cell == 1:
+                if show_ships:
+                    pygame.draw.rect(self.screen, GRAY, cell_rect)  # Ship
                 else:
-                    if board[row][col] == 0:
-                        pygame.draw.rect(self.screen, LIGHT_BLUE, cell_rect)
-                    elif board[row][col] == 1:
-                        if show_ships:
-                            pygame.draw.rect(self.screen, GRAY, cell_rect)  # Ship
-                        else:
-                            pygame.draw.rect(self.screen, LIGHT_BLUE, cell_rect)
-                    elif board[row][col] == 2:
-                        pygame.draw.rect(self.screen, RED, cell_rect)  # Hit
-                        self.draw_x(x, y)
-                    elif board[row][col] == 3:
-                        pygame.draw.rect(self.screen, WHITE, cell_rect)  # Miss
-                        pygame.draw.circle(self.screen, BLUE, (x + CELL_SIZE//2, y + CELL_SIZE//2), 8)
-        
-        # Draw coordinates
-        for i in range(BOARD_SIZE):
-            # Row labels (A-J)
-            text = self.font.render(chr(65 + i), True, BLACK)
-            self.screen.blit(text, (offset_x - 25, offset_y + i * CELL_SIZE + 12))
-            # Column labels (1-10)
-            text = self.font.render(str(i + 1), True, BLACK)
-            self.screen.blit(text, (offset_x + i * CELL_SIZE + 15, offset_y - 25))
+                    pygame.draw.rect(self.screen, LIGHT_BLUE, cell_rect)
+            elif cell == 2:
+                pygame.draw.rect(self.screen, RED, cell_rect)  # Hit
+                self.draw_x(x, y)
+            elif cell == 3:
+                pygame.draw.rect(self.screen, WHITE, cell_rect)  # Miss
+                pygame.draw.circle(self.screen, BLUE, (x + cell_size//2, y + cell_size//2), radius)
+        return cell_rect
     
     def draw_x(self, x, y):
         """Draw an X for hits"""
-        pygame.draw.line(self.screen, BLACK, (x + 5, y + 5), (x + CELL_SIZE - 5, y + CELL_SIZE - 5), 3)
-        pygame.draw.line(self.screen, BLACK, (x + CELL_SIZE - 5, y + 5), (x + 5, y + CELL_SIZE - 5), 3)
+        far = self.cell_size - self.cell_size // 8
+        near = self.cell_size // 8
+        width = max(1, self.cell_size // 13)
+        pygame.draw.line(self.screen, BLACK, (x + near, y + near), (x + far, y + far), width)
+        pygame.draw.line(self.screen, BLACK, (x + far, y + near), (x + near, y + far), width)
+    
+    def draw_text(self, slot, font, text, color, pos):
+        """Draw a line of text, unless the same text is already on screen in that slot"""
+        drawn = self.drawn_text.get(slot)
+        if drawn and drawn[:3] == (text, color, pos):
+            return
+        if drawn:
+            # Clear the old text first
+            self.screen.fill(WHITE, drawn[3])
+            self.dirty_rects.append(drawn[3])
+        rect = self.screen.blit(self.text_cache.render(font, text, color), pos)
+        self.dirty_rects.append(rect)
+        self.drawn_text[slot] = (text, color, pos, rect)
     
     def preview_ship_placement(self, row, col):
         """Preview where ship would be placed"""
         if self.current_ship < len(self.ship_names):
             ship_name = self.ship_names[self.current_ship]
-            length = ships[ship_name]
+            length = self.fleet[ship_name]
             
             # Check if placement would be within bounds first
             if self.ship_direction == "H":
-                if col + length > BOARD_SIZE or row < 0 or row >= BOARD_SIZE:
+                if col + length > self.board_size or row < 0 or row >= self.board_size:
                     return
             else:  # Vertical
-                if row + length > BOARD_SIZE or col < 0 or col >= BOARD_SIZE:
+                if row + length > self.board_size or col < 0 or col >= self.board_size:
                     return
             
             if self.is_valid_placement(self.player_board, row, col, length, self.ship_direction):
@@ -246,11 +353,21 @@ class BattleshipPygame:
                         preview_row, preview_col = row, col + i
                     else:
                         preview_row, preview_col = row + i, col
+                    if not self.is_visible(preview_row, preview_col):
+                        continue  # Runs off the edge of the viewport
                     
-                    x = BOARD_OFFSET_X + preview_col * CELL_SIZE
-                    y = BOARD_OFFSET_Y + preview_row * CELL_SIZE
-                    preview_rect = pygame.Rect(x + 1, y + 1, CELL_SIZE - 2, CELL_SIZE - 2)
+                    x = BOARD_OFFSET_X + (preview_col - self.view_col) * self.cell_size
+                    y = BOARD_OFFSET_Y + (preview_row - self.view_row) * self.cell_size
+                    preview_rect = pygame.Rect(x + 1, y + 1, self.cell_size - 2, self.cell_size - 2)
                     pygame.draw.rect(self.screen, YELLOW, preview_rect)
+                    self.preview_cells.append((preview_row, preview_col))
+                    self.dirty_rects.append(preview_rect)
+    
+    def clear_preview(self):
+        """Put back the cells under the last preview"""
+        for row, col in self.preview_cells:
+            self.dirty_rects.append(self.draw_cell(self.player_board, row, col, BOARD_OFFSET_X, BOARD_OFFSET_Y))
+        self.preview_cells = []
     
     def handle_setup_click(self, mouse_pos):
         """Handle mouse clicks during ship setup"""
@@ -258,30 +375,349 @@ class BattleshipPygame:
         if cell and self.current_ship < len(self.ship_names):
             row, col = cell
             ship_name = self.ship_names[self.current_ship]
-            length = ships[ship_name]
+            length = self.fleet[ship_name]
             
             if self.is_valid_placement(self.player_board, row, col, length, self.ship_direction):
                 self.place_ship(self.player_board, self.player_ships, ship_name, row, col, length, self.ship_direction)
                 self.current_ship += 1
                 
                 if self.current_ship >= len(self.ship_names):
-                    self.game_state = "PLAYING"
-                    self.message = "All ships placed! Click on attack board to attack!"
+                    self.finish_setup()
                 else:
                     next_ship = self.ship_names[self.current_ship]
-                    self.message = f"Place your {next_ship} (length {ships[next_ship]}). R to rotate"
+                    self.message = f"Place your {next_ship} (length {self.fleet[next_ship]}). R to rotate"
+    
+    def auto_place_remaining(self):
+        """Place the ships not placed yet at random, for big fleets"""
+        index = self.player_board.placement_index()
+        for ship_name in self.ship_names[self.current_ship:]:
+            length = self.fleet[ship_name]
+            row, col, direction = index.choose(length, self.rng)
+            self.place_ship(self.player_board, self.player_ships, ship_name, row, col, length, direction)
+        self.current_ship = len(self.ship_names)
+        self.finish_setup()
+    
+    def finish_setup(self):
+        """The player's fleet is placed: start shooting, or in client mode ask the server for a match"""
+        if self.client:
+            self.game_state = "PLAYING"
+            self.player_turn = False
+            self.message = "Looking for a match..."
+            self.client.send("PLAY", "pvp" if self.pvp else "ai")
+            return
+        self.start_game()
+        self.start_thinking()
+        self.message = "All ships placed! Click on attack board to attack!"
     
     def handle_attack_click(self, mouse_pos):
         """Handle mouse clicks during attack phase"""
         cell = self.get_cell_from_mouse(mouse_pos, ATTACK_BOARD_OFFSET_X)
         if cell and self.player_turn:
             row, col = cell
-            if self.player_attack_board[row][col] == 0:  # Not already attacked
+            if self.client and not self.player_attack_board.is_attacked(row, col):
+                # The server has the opponent's fleet; wait for its RESULT
+                self.client.send("FIRE", row, col)
+                self.player_turn = False
+            elif not self.player_attack_board.is_attacked(row, col):
                 self.attack(row, col)
                 
                 if not self.check_game_over():
                     self.player_turn = False
-                    pygame.time.set_timer(pygame.USEREVENT + 1, 1500)  # Computer attack delay
+                    pygame.time.set_timer(pygame.USEREVENT + 1, COMPUTER_MOVE_DELAY_MS)
+                else:
+                    self.cancel_thinking()  # The computer won't move again
+    
+    def connect(self, connection, pvp=False):
+        """Client mode: play through a server.py match instead of against the local computer"""
+        self.client = connection
+        self.pvp = pvp
+        self.recorder = None
+        self.computer_ai = None
+        connection.start(lambda words: pygame.event.post(pygame.event.Event(NETWORK_EVENT, words=words)))
+    
+    def handle_server(self, words):
+        """Act on one line from the server (see server.py for the protocol)"""
+        if words is None:
+            self.client = None
+            self.game_state = "GAME_OVER"
+            self.message = "Lost the connection to the server"
+            return
+        command = words[0]
+        if command == "WAIT":
+            self.message = "Waiting for an opponent..."
+        elif command == "MATCH":
+            fleet = []
+            for ship_name in self.ship_names:
+                positions = self.player_ships[ship_name]
+                row, col = positions[0]
+                direction = "V" if len(positions) > 1 and positions[1][0] != row else "H"
+                fleet += [row, col, direction]
+            self.client.send("FLEET", *fleet)
+            self.message = "Opponent found!"
+        elif command == "TURN":
+            self.player_turn = True
+        elif command == "RESULT":
+            row, col = int(words[1]), int(words[2])
+            if words[3] == "SUNK":
+                ship_name = self.ship_names[int(words[4])]
+                mask = self.player_attack_board.ship_mask(int(words[5]), int(words[6]), self.fleet[ship_name], words[7])
+                self.player_attack_board.mark_hit(mask)
+                self.message = f"HIT AND SUNK! You destroyed the {ship_name}!"
+            else:
+                self.player_attack_board.mark_miss(row, col)
+                self.message = "Miss!"
+        elif command == "SHOT":
+            row, col = int(words[1]), int(words[2])
+            self.computer_attack(row * self.board_size + col)
+            if words[3] == "SUNK":
+                self.message = f"Opponent HIT AND SUNK your {self.ship_names[int(words[4])]}!"
+            else:
+                self.message = f"Opponent missed at {row_label(row)}{col + 1}"
+        elif command == "OVER":
+            self.game_state = "GAME_OVER"
+            self.winner = "player" if words[1] == "WIN" else "computer"
+            if len(words) > 2:
+                self.message = "Your opponent left. You win!"
+            elif self.winner == "player":
+                self.message = "🎉 YOU WON! All enemy ships destroyed! 🎉"
+            else:
+                self.message = "💥 GAME OVER! All your ships destroyed! 💥"
+        elif command == "ERR":
+            self.message = " ".join(words[1:])
+    
+    def snapshot(self, direction=None):
+        """The game so far, including the ship being placed and which way it faces"""
+        return BattleshipEngine.snapshot(self, direction or self.ship_direction)
+    
+    def restore(self, data):
+        """Resume a snapshot in this window"""
+        self.reset()
+        state = BattleshipEngine.restore(self, data)
+        self.current_ship = len(state["player_layout"])
+        self.ship_direction = state["direction"]
+        if self.game_state == "SETUP":
+            ship_name = self.ship_names[self.current_ship]
+            self.message = f"Place your {ship_name} (length {self.fleet[ship_name]}). R to rotate"
+        elif self.game_state == "PLAYING":
+            self.start_thinking()
+            if not self.player_turn:
+                pygame.time.set_timer(pygame.USEREVENT + 1, COMPUTER_MOVE_DELAY_MS)  # The computer was about to move
+        return state
+    
+    def start_thinking(self):
+        """Start working out the computer's next move on the AI thread.
+        
+        The computer's move only depends on its own earlier shots, so this
+        starts right after its last one and runs through the player's turn,
+        refining its pick (Strategy.think) until the move is due. The result
+        comes back as an AI_MOVE_EVENT. Quick strategies skip all this and
+        choose when the move is due.
+        """
+        if self.computer_ai is None or not self.computer_ai.slow or self.game_state != "PLAYING":
+            return
+        if self.ai_thread is None:
+            self.ai_thread = ThreadPoolExecutor(max_workers=1)
+        self.ai_stop = threading.Event()
+        generation = self.ai_generation
+        rng = random.Random(self.rng.getrandbits(32))  # Its own, so the thread never shares self.rng
+        future = self.ai_thread.submit(timed_think, self.computer_ai, rng, self.ai_stop)
+        future.add_done_callback(
+            lambda done: pygame.event.post(pygame.event.Event(AI_MOVE_EVENT, generation=generation, future=done)))
+    
+    def cancel_thinking(self):
+        """Stop work on the computer's move and ignore it if it still arrives"""
+        self.ai_generation += 1
+        if self.ai_stop:
+            self.ai_stop.set()
+        self.ai_stop = None
+        self.ai_move = None
+        self.ai_due = False
+    
+    def computer_move(self):
+        """The computer's turn: fire now, or as soon as the AI thread delivers the move"""
+        if self.ai_stop is not None and self.ai_move is None:
+            self.ai_due = True
+            self.ai_stop.set()  # Done refining; answer now
+            return
+        cell = self.ai_move  # None for quick strategies, which choose inline
+        self.ai_stop = None
+        self.ai_move = None
+        self.ai_due = False
+        
+        profiler = self.profiler
+        if profiler:
+            start = time.perf_counter()
+            self.computer_attack(cell)
+            profiler.record("ai_move", time.perf_counter() - start)
+        else:
+            self.computer_attack(cell)
+        if not self.check_game_over():
+            self.player_turn = True
+            self.start_thinking()
+    
+    def save_game(self):
+        data = self.snapshot()
+        with open(self.save_path, "wb") as f:
+            f.write(data)
+        self.message = f"Game saved to {self.save_path} ({len(data)} bytes)"
+    
+    def load_game(self):
+        try:
+            with open(self.save_path, "rb") as f:
+                self.restore(f.read())
+        except FileNotFoundError:
+            self.message = f"No saved game in {self.save_path}"
+            return
+        except ValueError as error:
+            self.message = f"Can't load {self.save_path}: {error}"
+            return
+        if self.game_state != "SETUP":
+            self.message = f"Game loaded from {self.save_path}"
+    
+    def start_replay(self, archive, game_number):
+        """Show a game from a records.GameArchive, to be stepped through with the keyboard"""
+        player_layout, computer_layout, shots = archive.game(game_number)
+        self.replay = (archive, game_number, shots)
+        self.replay_layouts = (player_layout, computer_layout)
+        self.recorder = None  # Don't archive the replay again
+        self.computer_ai = None
+        self.current_ship = len(self.ship_names)
+        self.replay_turn = 0
+        self.replay_to(0)
+    
+    def replay_to(self, turn):
+        """Rebuild the replayed game as it stood after some number of shots"""
+        archive, game_number, shots = self.replay
+        turn = max(0, min(len(shots), turn))
+        first = self.replay_turn
+        if turn < self.replay_turn or self.replay_turn == 0:
+            # Going back: fresh boards and the recorded fleets, then every shot up to this turn
+            self.new_boards()
+            self.place_layout(self.player_board, self.player_ships, self.replay_layouts[0])
+            self.place_layout(self.computer_board, self.computer_ships, self.replay_layouts[1])
+            self.game_state = "PLAYING"
+            self.winner = None
+            self.message = "Both fleets placed"
+            first = 0
+        for shot in range(first, turn):
+            cell = shots[shot]
+            if shot % 2 == 0:
+                self.attack(*divmod(cell, self.board_size))
+            else:
+                self.computer_attack(cell)
+            self.check_game_over()
+        self.player_turn = turn % 2 == 0
+        self.replay_turn = turn
+    
+    def toggle_profile_overlay(self):
+        """F3: show or hide frame timings, profiling only while they're needed"""
+        self.show_profile = not self.show_profile
+        if self.show_profile and self.profiler is None:
+            self.profiler = FrameProfiler()
+        elif not self.show_profile:
+            if self.profiler and self.profiler.logger is None:
+                self.profiler = None  # Nothing is logging either
+            self.drawn_state = None  # Repaint to clear the overlay
+        self.profile_refresh = 0.0
+    
+    def draw_profile_overlay(self):
+        """p50/p95/p99 per frame phase, refreshed a couple of times a second"""
+        if self.small_font is None:
+            self.small_font = pygame.font.Font(None, 20)
+        now = time.perf_counter()
+        if now >= self.profile_refresh and self.profiler:
+            self.profile_rows = self.profiler.overlay_rows()
+            self.profile_refresh = now + PROFILE_REFRESH_SECONDS
+        x, y = PROFILE_OVERLAY_POS
+        rows = [("phase (ms)", "p50", "p95", "p99")]
+        rows += [(phase, f"{p50:.3f}", f"{p95:.3f}", f"{p99:.3f}") for phase, p50, p95, p99 in self.profile_rows]
+        for i, row in enumerate(rows):
+            for j, text in enumerate(row):
+                pos = (x + (0 if j == 0 else 60 + j * 60), y + i * 16)
+                self.draw_text(("profile", i, j), self.small_font, text, DARK_BLUE, pos)
+    
+    def run_wall(self, feed):
+        """Spectator wall: tile every game of a wall.WallFeed in the window until it's closed.
+        
+        Each frame with new boards writes all their cell codes into one 8-bit
+        palette surface with surfarray, scales it to the window and blits it,
+        so the cost barely grows with the number of games.
+        """
+        from wall import BACKGROUND, tile_boards, tile_size, wall_grid
+        
+        cols, scale = wall_grid(feed.n_games, feed.size, WINDOW_WIDTH, WINDOW_HEIGHT - WALL_TOP)
+        tile_width, tile_height = tile_size(feed.size)
+        width = cols * tile_width
+        height = -(-feed.n_games // cols) * tile_height
+        # Indexed by board.py cell code: water, ship, hit, miss, then the gaps
+        palette = [LIGHT_BLUE, GRAY, RED, BLUE]
+        palette.insert(BACKGROUND, WHITE)
+        cells = pygame.Surface((width, height), depth=8)
+        cells.set_palette(palette)
+        scaled = pygame.Surface((width * scale, height * scale), depth=8)
+        scaled.set_palette(palette)
+        wall_pos = ((WINDOW_WIDTH - width * scale) // 2, WALL_TOP)
+        
+        self.screen.fill(WHITE)
+        pygame.display.flip()
+        feed.start()
+        shown = None  # the feed's codes array on screen now
+        running = True
+        while running:
+            profiler = self.profiler
+            if profiler:
+                profiler.begin_frame()
+            
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    shown = None
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    self.toggle_profile_overlay()
+                    self.screen.fill(WHITE)
+                    self.dirty_rects.append(self.screen.get_rect())
+                    self.drawn_text.clear()
+                    shown = None
+            if profiler:
+                profiler.mark("events")
+            
+            codes = feed.codes
+            if codes is not shown:
+                # Two bulk pixel writes and a blit, however many games there are
+                pygame.surfarray.blit_array(cells, tile_boards(codes, cols).T)
+                pygame.transform.scale(cells, scaled.get_size(), scaled)
+                self.dirty_rects.append(self.screen.blit(scaled, wall_pos))
+                # The overlay sits on the wall, so it needs drawing again
+                for slot in [slot for slot in self.drawn_text if slot[0] == "profile"]:
+                    del self.drawn_text[slot]
+                shown = codes
+            if profiler:
+                profiler.mark("wall")
+            
+            self.draw_text("title", self.big_font, "BATTLESHIP", BLACK, (20, 12))
+            wins = feed.player_wins / feed.finished if feed.finished else 0.0
+            stats = (f"{feed.n_games} games | turn {feed.turns:,} | {feed.finished:,} finished | "
+                     f"first mover wins {wins:.1%} | F3 timings")
+            self.draw_text("wall_stats", self.font, stats, DARK_BLUE, (220, 20))
+            if self.show_profile:
+                self.draw_profile_overlay()
+            if profiler:
+                profiler.mark("text")
+            
+            if self.dirty_rects:
+                pygame.display.update(self.dirty_rects)
+            self.dirty_rects = []
+            if profiler:
+                profiler.mark("display")
+                profiler.end_frame()
+            self.clock.tick(60)
+        
+        feed.stop()
+        if self.profiler:
+            self.profiler.close()
+        pygame.quit()
+        sys.exit()
     
     def run(self):
         """Main game loop"""
@@ -289,15 +725,33 @@ class BattleshipPygame:
         mouse_pos = (0, 0)
         
         while running:
-            for event in pygame.event.get():
+            if self.event_driven:
+                # Block until something happens, then take whatever else is queued
+                events = [pygame.event.wait(IDLE_TIMEOUT_MS)]
+                events.extend(pygame.event.get())
+            else:
+                events = pygame.event.get()
+            
+            # Timing is skipped entirely unless profiling is on
+            profiler = self.profiler
+            if profiler:
+                profiler.begin_frame()
+            
+            for event in events:
                 if event.type == pygame.QUIT:
                     running = False
                 
+                elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    # The window was uncovered; repaint all of it
+                    self.drawn_state = None
+                
                 elif event.type == pygame.MOUSEMOTION:
                     mouse_pos = event.pos
                 
                 elif event.type == pygame.MOUSEBUTTONDOWN:
-                    if self.game_state == "SETUP":
+                    if self.replay:
+                        pass  # Replays only move with the keyboard
+                    elif self.game_state == "SETUP":
                         self.handle_setup_click(event.pos)
                     elif self.game_state == "PLAYING":
                         self.handle_attack_click(event.pos)
@@ -306,73 +760,224 @@ class BattleshipPygame:
                     if event.key == pygame.K_r and self.game_state == "SETUP":
                         # Rotate ship
                         self.ship_direction = "V" if self.ship_direction == "H" else "H"
+                    elif event.key == pygame.K_a and self.game_state == "SETUP":
+                        self.auto_place_remaining()
                     elif event.key == pygame.K_SPACE and self.game_state == "GAME_OVER":
                         # Restart game
-                        self.__init__()
+                        self.reset()
+                    elif event.key in SCROLL_KEYS:
+                        # Scroll a quarter of the viewport at a time
+                        rows, cols = SCROLL_KEYS[event.key]
+                        step = max(1, self.visible_cells() // 4)
+                        self.move_view(rows * step, cols * step)
+                    elif event.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+                        self.zoom(1)
+                    elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                        self.zoom(-1)
+                    elif event.key == pygame.K_F3:
+                        self.toggle_profile_overlay()
+                    elif event.key == pygame.K_F5 and not self.replay and not self.client:
+                        self.save_game()
+                    elif event.key == pygame.K_F9 and not self.replay and not self.client:
+                        self.load_game()
+                    elif self.replay and event.key == pygame.K_n:
+                        self.replay_to(self.replay_turn + 1)
+                    elif self.replay and event.key == pygame.K_b:
+                        self.replay_to(self.replay_turn - 1)
+                    elif self.replay and event.key == pygame.K_p:
+                        self.replay_playing = not self.replay_playing
+                        pygame.time.set_timer(REPLAY_EVENT, REPLAY_STEP_MS if self.replay_playing else 0)
+                
+                elif event.type == REPLAY_EVENT:
+                    if self.replay_playing and self.replay_turn < len(self.replay[2]):
+                        self.replay_to(self.replay_turn + 1)
+                    else:
+                        self.replay_playing = False
+                        pygame.time.set_timer(REPLAY_EVENT, 0)
+                
+                elif event.type == NETWORK_EVENT:
+                    self.handle_server(event.words)
+                
+                elif event.type == pygame.MOUSEWHEEL:
+                    self.zoom(event.y)
                 
                 elif event.type == pygame.USEREVENT + 1:
                     # Computer attack
+                    pygame.time.set_timer(pygame.USEREVENT + 1, 0)  # Cancel timer
                     if not self.player_turn and self.game_state == "PLAYING":
-                        self.computer_attack()
-                        if not self.check_game_over():
-                            self.player_turn = True
-                        pygame.time.set_timer(pygame.USEREVENT + 1, 0)  # Cancel timer
+                        self.computer_move()
+                
+                elif event.type == AI_MOVE_EVENT:
+                    if event.generation == self.ai_generation:
+                        try:
+                            self.ai_move, seconds = event.future.result()
+                            if profiler:
+                                profiler.record("ai_move", seconds)  # computer_move() only times the shot
+                        except Exception as error:
+                            # Don't lose the turn (or the game) to a bug in think(), or block the frame
+                            # asking the strategy again: fire at any cell not shot yet
+                            print(f"Computer move failed on the AI thread: {error!r}", file=sys.stderr)
+                            self.ai_move = self.untried_cell()
+                        if self.ai_due:
+                            self.computer_move()
+            if profiler:
+                profiler.mark("events")
             
-            # Clear screen
-            self.screen.fill(WHITE)
+            full_redraw = self.drawn_state != self.game_state
+            if full_redraw:
+                # The layout changes with the game state, so start from a blank screen
+                self.screen.fill(WHITE)
+                self.board_seen.clear()
+                self.drawn_text.clear()
+                self.preview_cells = []
+                self.preview_key = None
+                self.drawn_state = self.game_state
+            if profiler:
+                profiler.mark("clear")
             
             # Draw title
-            title = self.big_font.render("BATTLESHIP", True, BLACK)
-            self.screen.blit(title, (WINDOW_WIDTH // 2 - 80, 20))
+            self.draw_text("title", self.big_font, "BATTLESHIP", BLACK, (WINDOW_WIDTH // 2 - 80, 20))
             
             # Draw boards
             if self.game_state == "SETUP":
                 # Only show player board during setup
-                board_title = self.font.render("Your Ships", True, BLACK)
-                self.screen.blit(board_title, (BOARD_OFFSET_X, BOARD_OFFSET_Y - 50))
+                self.draw_text("board_title1", self.font, "Your Ships", BLACK, (BOARD_OFFSET_X, BOARD_OFFSET_Y - 50))
+                if profiler:
+                    profiler.mark("text")
                 self.draw_board(self.player_board, BOARD_OFFSET_X, BOARD_OFFSET_Y)
+                if profiler:
+                    profiler.mark("board_player")
                 
-                # Preview ship placement
+                # Preview ship placement, repainted only when the hovered cell, ship or direction changes
+                cell = None
                 if self.current_ship < len(self.ship_names):
                     cell = self.get_cell_from_mouse(mouse_pos, BOARD_OFFSET_X)
+                preview_key = (cell, self.current_ship, self.ship_direction)
+                if preview_key != self.preview_key:
+                    self.clear_preview()
                     if cell:
                         self.preview_ship_placement(cell[0], cell[1])
+                    self.preview_key = preview_key
+                if profiler:
+                    profiler.mark("preview")
                 
             else:
                 # Show both boards during play
-                board_title1 = self.font.render("Your Ships", True, BLACK)
-                self.screen.blit(board_title1, (BOARD_OFFSET_X, BOARD_OFFSET_Y - 50))
+                self.draw_text("board_title1", self.font, "Your Ships", BLACK, (BOARD_OFFSET_X, BOARD_OFFSET_Y - 50))
+                self.draw_text("board_title2", self.font, "Attack Board", BLACK, (ATTACK_BOARD_OFFSET_X, BOARD_OFFSET_Y - 50))
+                if profiler:
+                    profiler.mark("text")
                 self.draw_board(self.player_board, BOARD_OFFSET_X, BOARD_OFFSET_Y)
-                
-                board_title2 = self.font.render("Attack Board", True, BLACK)
-                self.screen.blit(board_title2, (ATTACK_BOARD_OFFSET_X, BOARD_OFFSET_Y - 50))
+                if profiler:
+                    profiler.mark("board_player")
                 self.draw_board(self.player_attack_board, ATTACK_BOARD_OFFSET_X, BOARD_OFFSET_Y, attack_board=True)
+                if profiler:
+                    profiler.mark("board_attack")
             
             # Draw message
-            message_text = self.font.render(self.message, True, BLACK)
-            self.screen.blit(message_text, (50, 600))
+            self.draw_text("message", self.font, self.message, BLACK, (50, 600))
+            
+            if self.visible_cells() < self.board_size:
+                # Where the viewport is on a board too big to show whole
+                last_row = row_label(self.view_row + self.visible_cells() - 1)
+                last_col = self.view_col + self.visible_cells()
+                view_text = (f"Showing {row_label(self.view_row)}-{last_row}, {self.view_col + 1}-{last_col} "
+                             f"of {self.board_size}x{self.board_size} | Arrows scroll, +/- or wheel zoom")
+                self.draw_text("viewport", self.font, view_text, GRAY, (50, 570))
             
             # Draw instructions
-            if self.game_state == "SETUP":
+            if self.replay:
+                archive, game_number, shots = self.replay
+                replay_text = (f"Replay of game {game_number + 1}/{len(archive)}: turn {self.replay_turn}/{len(shots)}"
+                               f" | N next, B back, P {'pause' if self.replay_playing else 'play'}")
+                self.draw_text("instructions", self.font, replay_text, DARK_BLUE, (50, 630))
+            elif self.game_state == "SETUP":
                 if self.current_ship < len(self.ship_names):
                     ship_name = self.ship_names[self.current_ship]
-                    instructions = f"Placing: {ship_name} (Length: {ships[ship_name]}) | Direction: {self.ship_direction} | Press R to rotate"
-                    inst_text = self.font.render(instructions, True, DARK_BLUE)
-                    self.screen.blit(inst_text, (50, 630))
+                    instructions = f"Placing: {ship_name} (Length: {self.fleet[ship_name]}) | Direction: {self.ship_direction} | Press R to rotate"
+                    if len(self.ship_names) > 5:
+                        instructions += ", A to place the rest"
+                    self.draw_text("instructions", self.font, instructions, DARK_BLUE, (50, 630))
             elif self.game_state == "PLAYING":
-                turn_text = "Your turn - Click on attack board" if self.player_turn else "Computer's turn..."
-                inst_text = self.font.render(turn_text, True, DARK_BLUE)
-                self.screen.blit(inst_text, (50, 630))
+                opponent = "Opponent" if self.client else "Computer"
+                turn_text = "Your turn - Click on attack board" if self.player_turn else f"{opponent}'s turn..."
+                self.draw_text("instructions", self.font, turn_text, DARK_BLUE, (50, 630))
             elif self.game_state == "GAME_OVER":
-                restart_text = self.font.render("Press SPACE to play again", True, GREEN)
-                self.screen.blit(restart_text, (50, 650))
+                self.draw_text("instructions", self.font, "Press SPACE to play again", GREEN, (50, 650))
+            if profiler:
+                profiler.mark("text")
             
-            pygame.display.flip()
-            self.clock.tick(60)
+            if self.show_profile:
+                self.draw_profile_overlay()
+                if profiler:
+                    profiler.mark("overlay")
+            
+            # Push only what changed to the display
+            if full_redraw:
+                pygame.display.flip()
+            elif self.dirty_rects:
+                pygame.display.update(self.dirty_rects)
+            self.dirty_rects = []
+            if profiler:
+                profiler.mark("display")
+                profiler.end_frame()
+            if not self.event_driven:
+                self.clock.tick(60)
         
+        if self.ai_thread:
+            self.cancel_thinking()
+            self.ai_thread.shutdown()  # Before pygame.quit(), since its last move posts an event
+        if self.profiler:
+            self.profiler.close()
         pygame.quit()
         sys.exit()
 
 if __name__ == "__main__":
-    game = BattleshipPygame()
-    game.run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Battleship")
+    parser.add_argument("--ai", default="random", help="computer opponent: random, density or montecarlo")
+    parser.add_argument("--text-stats", action="store_true", help="print text cache hits and misses on exit")
+    parser.add_argument("--fps", action="store_true", help="poll and redraw at 60 FPS instead of waiting for events")
+    parser.add_argument("--profile-log", help="write per-phase frame timings to this JSON-lines file (F3 shows them)")
+    parser.add_argument("--record", help="append every finished game to this archive file")
+    parser.add_argument("--replay", help="step through a game from an archive file instead of playing")
+    parser.add_argument("--game", type=int, default=0, help="which game of the --replay archive to show, from 0")
+    parser.add_argument("--size", type=int, default=BOARD_SIZE, help="board width and height")
+    parser.add_argument("--fleet", help="comma-separated ship lengths, e.g. 5,4,3,3,2")
+    parser.add_argument("--save-file", default=SAVE_FILE, help="where F5 saves the game and F9 loads it from")
+    parser.add_argument("--connect", metavar="HOST:PORT", help="play through a server.py server instead of locally")
+    parser.add_argument("--pvp", action="store_true", help="with --connect, play another client instead of the server's AI")
+    parser.add_argument("--wall", type=int, metavar="GAMES", help="watch this many computer-vs-computer games at once")
+    parser.add_argument("--wall-speed", type=float, default=10, help="turns per second in each --wall game")
+    args = parser.parse_args()
+    fleet = make_fleet(int(length) for length in args.fleet.split(",")) if args.fleet else None
+    profiler = FrameProfiler(args.profile_log) if args.profile_log else None
+    archive = writer = recorder = connection = None
+    if args.connect:
+        host, _, port = args.connect.rpartition(":")
+        connection = ServerConnection(host or "127.0.0.1", int(port))
+        args.size, fleet = connection.board_size, connection.fleet
+    elif args.replay:
+        archive = GameArchive(args.replay)
+        args.size, fleet = archive.board_size, archive.fleet
+    elif args.record:
+        writer = ArchiveWriter(args.record, args.size, fleet or ships)
+        recorder = writer.recorder()
+    game = BattleshipPygame(computer_ai=args.ai, event_driven=not args.fps, board_size=args.size, fleet=fleet,
+                            profiler=profiler, recorder=recorder, save_path=args.save_file)
+    if archive:
+        game.start_replay(archive, args.game)
+    if connection:
+        game.connect(connection, args.pvp)
+    try:
+        if args.wall:
+            from wall import WallFeed
+            game.run_wall(WallFeed(args.wall, args.wall_speed, args.size, fleet))
+        else:
+            game.run()
+    finally:
+        if writer:
+            writer.close()
+        if connection:
+            connection.close()
+        if args.text_stats:
+            print("Text cache:", game.text_cache.stats())
\ No newline at end of file
@@ -0,0 +1,86 @@
+"""Strength and speed of the computer opponents.
+
+Plays computer-vs-computer games where the player side always fires at
+random and the computer uses each AI in turn. Reports the computer's win
+rate, the shots it needs to sink the whole fleet, and time per move. Run from the Wk3 folder:
+
+    python benchmarks/bench_ai.py --games 50 --budget 0.05 --workers 4
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai import get_cache
+from battleship_engine import BattleshipEngine
+
+
+def bench(name, games, budget, workers):
+    wins = 0
+    computer_shots = 0
+    move_seconds = 0.0
+    samples = 0
+    sampling_seconds = 0.0
+    for seed in range(games):
+        game = BattleshipEngine(seed=seed, computer_ai=name)
+        ai = game.computer_ai
+        if name == "montecarlo":
+            ai.budget = budget
+            ai.workers = workers
+        game.place_random_ships(game.player_board, game.player_ships)
+        game.game_state = "PLAYING"
+
+        # Each side's shots never depend on the other's, so count how many
+        # each needs to sink the other fleet; the player fires first
+        player_shots = 0
+        while game.computer_board.ships_afloat:
+            game.auto_attack()
+            player_shots += 1
+        shots = 0
+        while game.player_board.ships_afloat:
+            start = time.perf_counter()
+            game.computer_attack()
+            move_seconds += time.perf_counter() - start
+            shots += 1
+
+        if shots < player_shots:
+            wins += 1
+        computer_shots += shots
+        if name == "montecarlo":
+            samples += ai.samples
+            sampling_seconds += ai.sampling_seconds
+
+    result = {
+        "win_rate": wins / games,
+        "mean_shots": computer_shots / games,
+        "mean_move_ms": move_seconds / computer_shots * 1e3,
+    }
+    if sampling_seconds:
+        result["samples_per_sec"] = samples / sampling_seconds
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the computer opponents")
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--budget", type=float, default=0.05, help="Monte Carlo seconds per move")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    print(f"{'ai':<12}{'win rate':>10}{'shots':>8}{'move ms':>10}{'samples/s':>12}")
+    for name in ("random", "density", "montecarlo"):
+        r = bench(name, args.games, args.budget, args.workers)
+        samples = f"{r['samples_per_sec']:,.0f}" if "samples_per_sec" in r else "-"
+        print(f"{name:<12}{r['win_rate']:>10.1%}{r['mean_shots']:>8.1f}{r['mean_move_ms']:>10.2f}{samples:>12}")
+
+    stats = get_cache().stats()
+    lookups = stats["hits"] + stats["misses"]
+    if lookups:
+        print(f"\nMonte Carlo eval cache: {stats['hit_rate']:.1%} of {lookups:,} lookups hit, "
+              f"{stats['entries']:,} entries in {stats['bytes'] / 1e6:.1f} MB, {stats['evictions']:,} evicted")
+
+
+if __name__ == "__main__":
+    main()
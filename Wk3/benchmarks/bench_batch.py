@@ -0,0 +1,56 @@
+"""Throughput of the NumPy batch stepper against the engine one game at a time.
+
+Both fire random shots until each fleet is sunk. Reports shots per second
+and the mean shots to sink a fleet, which should agree within the
+intervals shown since the batch follows Board.attack's rules. Run from the Wk3 folder:
+
+    python benchmarks/bench_batch.py --fleets 200000
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch import play_random
+from battleship_engine import BattleshipEngine
+
+
+def engine_shots(n_fleets):
+    shots = []
+    for seed in range(n_fleets):
+        game = BattleshipEngine(seed=seed)
+        fired = 0
+        while game.computer_board.ships_afloat:
+            game.auto_attack()
+            fired += 1
+        shots.append(fired)
+    return shots
+
+
+def describe(name, shots, seconds):
+    mean = statistics.mean(shots)
+    half = 1.96 * statistics.stdev(shots) / len(shots) ** 0.5
+    print(f"{name:<18}{sum(shots) / seconds / 1e6:>8.2f}M shots/s   mean shots to sink {mean:.2f} ± {half:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the batch stepper")
+    parser.add_argument("--fleets", type=int, default=200_000, help="fleets to sink with the batch stepper")
+    parser.add_argument("--engine-fleets", type=int, default=20_000, help="fleets to sink through the engine")
+    parser.add_argument("--batch", type=int, nargs="+", default=[1024, 8192, 32768], help="slots per batch")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    shots = engine_shots(args.engine_fleets)
+    describe("engine", shots, time.perf_counter() - start)
+    for batch in args.batch:
+        start = time.perf_counter()
+        shots = play_random(args.fleets, batch=batch, seed=1)
+        describe(f"batch of {batch}", shots.tolist(), time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
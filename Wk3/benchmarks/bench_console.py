@@ -0,0 +1,80 @@
+"""Output cost of the console game's screen, and scripted games per second.
+
+Plays seeded games through todo.py's Screen, once redrawing in place with
+ANSI cursor moves and once printing each frame whole, and reports bytes
+written per frame. Then pipes random scripted games through run_script.
+Run from the Wk3 folder:
+
+    python benchmarks/bench_console.py --games 2000
+"""
+import argparse
+import io
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from todo import BOARD_SIZE, BattleshipGame, Screen, row_labels, run_script
+
+
+def frame_bytes(ansi, n_games):
+    """Bytes each frame writes over n_games seeded games where the player fires at random"""
+    sizes = []
+    for seed in range(n_games):
+        game = BattleshipGame(seed)
+        game.place_rest_randomly()
+        game.place_computer_ships()
+        out = io.StringIO()
+        screen = Screen(out, ansi)
+        cells = [(row, col) for row in range(BOARD_SIZE) for col in range(BOARD_SIZE)]
+        game.rng.shuffle(cells)
+        for row, col in cells:
+            if game.outcome():
+                break
+            if game.player_attack_board.is_attacked(row, col):
+                continue
+            screen.message(game.fire(row, col))
+            if not game.outcome():
+                screen.message(game.computer_turn())
+            screen.show(game.panels())
+            before = out.tell()
+            screen.flush()
+            sizes.append(out.tell() - before)
+    return sizes
+
+
+def make_script(n_games, seed=0):
+    """Script lines for n_games games: random fleet, then every cell in random order"""
+    rng = random.Random(seed)
+    coords = [f"{label}{col + 1}" for label in row_labels for col in range(BOARD_SIZE)]
+    lines = []
+    for number in range(n_games):
+        lines += [f"GAME {number}", "PLACE RANDOM"]
+        rng.shuffle(coords)
+        lines += [f"FIRE {coord}" for coord in coords]
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark console output and scripted games")
+    parser.add_argument("--games", type=int, default=2_000, help="scripted games to play")
+    parser.add_argument("--frame-games", type=int, default=50, help="games to measure frame sizes over")
+    args = parser.parse_args()
+
+    for name, ansi in (("redraw in place", True), ("whole frames", False)):
+        sizes = frame_bytes(ansi, args.frame_games)
+        print(f"{name:<18}{statistics.mean(sizes):>8.0f} bytes/frame (first {sizes[0]}, median {statistics.median(sizes):.0f})")
+
+    lines = make_script(args.games)
+    start = time.perf_counter()
+    # Shots at cells of ships already sunk are rejected; only the game lines matter here
+    tally = run_script(lines, io.StringIO())
+    seconds = time.perf_counter() - start
+    print(f"\nScripted:          {sum(tally.values()):,} games in {seconds:.2f}s, {args.games / seconds:,.0f} games/s")
+
+
+if __name__ == "__main__":
+    main()
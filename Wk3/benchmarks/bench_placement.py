@@ -0,0 +1,99 @@
+"""Rejection sampling vs PlacementIndex for random fleet placement.
+
+Run from the Wk3 folder:
+
+    python benchmarks/bench_placement.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from board import Board, PlacementIndex
+
+STANDARD_FLEET = [2, 3, 3, 4, 5]
+# Enough ships to cover about 40% of the board
+CROWDED_FLEET = [5, 5, 4, 4, 4, 3, 3, 3, 3, 2, 2, 2]
+# About 60%: late ships only fit in a handful of spots
+PACKED_FLEET = [5, 5, 5, 5, 4, 4, 4, 4, 3, 3, 3, 3, 2, 2, 2, 2, 2, 2]
+MAX_RETRIES = 100_000
+
+
+def place_rejection(size, fleet, rng):
+    """The old approach: draw (row, col, direction) until one fits. Returns retries"""
+    board = Board(size)
+    retries = 0
+    for number, length in enumerate(fleet):
+        while True:
+            direction = rng.choice(["H", "V"])
+            row = rng.randint(0, size - 1)
+            col = rng.randint(0, size - 1)
+            if board.is_valid_placement(row, col, length, direction):
+                board.place_ship(number, row, col, length, direction)
+                break
+            retries += 1
+            if retries > MAX_RETRIES:
+                raise ValueError("gave up")
+    return retries
+
+
+def place_indexed(size, fleet, rng):
+    """PlacementIndex: never retries. Returns the number of filtered draws"""
+    board = Board(size)
+    index = PlacementIndex(size)
+    for number, length in enumerate(fleet):
+        row, col, direction = index.choose(length, rng)
+        board.place_ship(number, row, col, length, direction)
+    return index.fallbacks
+
+
+def bench(place, size, fleet, fleets, seed=1):
+    rng = random.Random(seed)
+    times = []
+    counts = []
+    dead_ends = 0
+    for _ in range(fleets):
+        start = time.perf_counter()
+        try:
+            counts.append(place(size, fleet, rng))
+        except ValueError:
+            # Earlier ships left no room for a later one
+            dead_ends += 1
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return {
+        "mean_us": sum(times) / len(times) * 1e6,
+        "p99_us": times[len(times) * 99 // 100] * 1e6,
+        "mean_count": sum(counts) / max(len(counts), 1),
+        "max_count": max(counts, default=0),
+        "dead_ends": dead_ends,
+    }
+
+
+def main():
+    cases = [
+        ("10x10 standard", 10, STANDARD_FLEET),
+        ("10x10 crowded", 10, CROWDED_FLEET),
+        ("10x10 packed", 10, PACKED_FLEET),
+        ("30x30 standard", 30, STANDARD_FLEET),
+        ("30x30 large fleet", 30, CROWDED_FLEET * 8),
+    ]
+    # "retries" counts redraws for rejection sampling; the index never redraws,
+    # so for it the column counts ships that needed the filtered draw instead
+    print(f"{'case':<20}{'method':<11}{'mean us':>10}{'p99 us':>10}{'retries':>10}{'max':>8}"
+          f"{'filtered':>10}{'dead':>6}")
+    for name, size, fleet in cases:
+        for method, place in (("rejection", place_rejection), ("index", place_indexed)):
+            r = bench(place, size, fleet, fleets=2000)
+            if method == "rejection":
+                retries, max_retries, filtered = r["mean_count"], r["max_count"], 0.0
+            else:
+                retries, max_retries, filtered = 0.0, 0, r["mean_count"]
+            print(f"{name:<20}{method:<11}{r['mean_us']:>10.1f}{r['p99_us']:>10.1f}"
+                  f"{retries:>10.1f}{max_retries:>8}{filtered:>10.1f}{r['dead_ends']:>6}")
+
+
+if __name__ == "__main__":
+    main()
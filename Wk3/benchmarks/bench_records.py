@@ -0,0 +1,76 @@
+"""Size and speed of the binary game archive.
+
+Plays games with recording on, then reports bytes per game, how many games
+fit in a terabyte, and how fast the archive can be scanned compared with
+reading the raw file. Run from the Wk3 folder:
+
+    python benchmarks/bench_records.py --games 50000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from battleship_engine import ships
+from records import ArchiveWriter, GameArchive
+from simulate import run_games
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the game archive format")
+    parser.add_argument("--games", type=int, default=50_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "games.bshr")
+        records = run_games(args.games, seed=1, record=True)["records"]
+
+        start = time.perf_counter()
+        writer = ArchiveWriter(path, 10, ships)
+        for record in records:
+            writer.add(record)
+        writer.close()
+        write_seconds = time.perf_counter() - start
+
+        size = os.path.getsize(path) + os.path.getsize(path + ".idx")
+        per_game = size / args.games
+        print(f"Games:              {args.games:,}")
+        print(f"Bytes per game:     {per_game:.1f} (data and index)")
+        print(f"Games per TB:       {1e12 / per_game / 1e6:,.0f} million")
+        print(f"Write:              {size / write_seconds / 1e6:,.1f} MB/s")
+
+        archive = GameArchive(path)
+        start = time.perf_counter()
+        with open(path, "rb") as f:
+            while f.read(1 << 20):
+                pass
+        raw_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        turns = sum(archive.turns(game) for game in range(len(archive)))
+        index_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        shots = 0
+        for game in range(len(archive)):
+            shots += len(archive.values(game))
+        scan_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for game in range(0, len(archive), 7):
+            archive.shot(game, archive.turns(game) // 2)
+        seek_seconds = (time.perf_counter() - start) / len(range(0, len(archive), 7))
+
+        print(f"Raw read:           {size / raw_seconds / 1e6:,.0f} MB/s")
+        print(f"Turn counts:        {len(archive) / index_seconds:,.0f} games/s from the index alone ({turns:,} turns)")
+        print(f"Record scan:        {len(archive) / scan_seconds:,.0f} games/s, "
+              f"{os.path.getsize(path) / scan_seconds / 1e6:,.0f} MB/s")
+        print(f"Seek to a turn:     {seek_seconds * 1e6:.2f} us")
+        archive.close()
+
+
+if __name__ == "__main__":
+    main()
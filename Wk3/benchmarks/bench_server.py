@@ -0,0 +1,155 @@
+"""Load generator for server.py.
+
+Starts a server on a free localhost port (or uses --port), connects many
+clients at once and has each play matches with random shots until the
+total is reached. Reports matches served per second and two latencies per
+move: until the shot's RESULT, and until the next TURN, which in an AI
+match includes the computer's reply. Run from the Wk3 folder:
+
+    python benchmarks/bench_server.py --clients 1000 --matches 5000 --ai density
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+
+WK3 = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, WK3)
+
+from profiler import percentile
+
+
+class Load:
+    """Counters shared by every client"""
+    def __init__(self, matches):
+        self.remaining = matches
+        self.served = 0
+        self.forfeits = 0
+        self.result_times = []
+        self.turn_times = []
+
+
+async def client(host, port, mode, load, seed):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+
+    async def read():
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("Server closed the connection")
+        return line.decode().split()
+
+    def send(line):
+        writer.write(line.encode() + b"\n")
+
+    _, size, lengths = await read()
+    size = int(size)
+    lengths = [int(length) for length in lengths.split(",")]
+    while load.remaining > 0:
+        load.remaining -= 1
+        send(f"PLAY {mode}")
+        targets = list(range(size * size))
+        rng.shuffle(targets)
+        shot = set()
+        fired = 0.0
+        while True:
+            words = await read()
+            if words[0] == "MATCH":
+                send("FLEET RANDOM")
+            elif words[0] == "TURN":
+                if fired:
+                    load.turn_times.append(time.perf_counter() - fired)
+                while targets[-1] in shot:
+                    targets.pop()
+                cell = targets.pop()
+                shot.add(cell)
+                fired = time.perf_counter()
+                send(f"FIRE {cell // size} {cell % size}")
+            elif words[0] == "RESULT":
+                load.result_times.append(time.perf_counter() - fired)
+                if words[3] == "SUNK":
+                    # The rest of the ship is hit too; don't fire there
+                    length = lengths[int(words[4])]
+                    row, col = int(words[5]), int(words[6])
+                    step = size if words[7] == "V" else 1
+                    shot.update(row * size + col + i * step for i in range(length))
+            elif words[0] == "OVER":
+                if fired:
+                    load.turn_times.append(time.perf_counter() - fired)
+                load.served += 1
+                load.forfeits += len(words) > 2
+                break
+            elif words[0] == "ERR":
+                raise RuntimeError(" ".join(words[1:]))
+    send("QUIT")
+    await writer.drain()
+    writer.close()
+
+
+async def run_load(host, port, clients, matches, mode):
+    load = Load(matches)
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, mode, load, seed) for seed in range(clients)))
+    return load, time.perf_counter() - start
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port, ai, workers):
+    """server.py in its own process, so its event loop doesn't share a CPU with the clients"""
+    command = [sys.executable, os.path.join(WK3, "server.py"), "--port", str(port), "--ai", ai]
+    if workers:
+        command += ["--workers", str(workers)]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    process.stdout.readline()  # "Serving Battleship on ..."
+    return process
+
+
+def describe(times):
+    times = sorted(times)
+    return (f"p50 {percentile(times, 0.50) * 1e3:.2f} ms, p95 {percentile(times, 0.95) * 1e3:.2f} ms, "
+            f"p99 {percentile(times, 0.99) * 1e3:.2f} ms ({len(times):,} moves)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Battleship server over localhost")
+    parser.add_argument("--clients", type=int, default=200, help="connections open at once")
+    parser.add_argument("--matches", type=int, default=2000, help="matches to play in total")
+    parser.add_argument("--pvp", action="store_true", help="clients play each other instead of the server's AI")
+    parser.add_argument("--ai", default="random", help="computer opponent for a server started here")
+    parser.add_argument("--workers", type=int, help="AI threads for a server started here")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="use a server already running on this port")
+    args = parser.parse_args()
+
+    process = None
+    if args.port is None:
+        args.port = free_port()
+        process = start_server(args.port, args.ai, args.workers)
+    try:
+        # In PvP every match takes two clients' PLAYs
+        plays = 2 * args.matches if args.pvp else args.matches
+        load, seconds = asyncio.run(run_load(args.host, args.port, args.clients, plays, "pvp" if args.pvp else "ai"))
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+
+    if args.pvp:
+        load.served //= 2  # Both players count each match
+    print(f"Clients:            {args.clients:,}")
+    print(f"Matches served:     {load.served:,} in {seconds:.1f} s ({load.served / seconds:,.1f} per second)")
+    print(f"Shot to RESULT:     {describe(load.result_times)}")
+    print(f"Shot to next TURN:  {describe(load.turn_times)}")
+
+
+if __name__ == "__main__":
+    main()
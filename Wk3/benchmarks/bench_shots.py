@@ -0,0 +1,73 @@
+"""Computer shot latency against board fill, retry loop vs CellPool.
+
+Fires at every cell of an empty board and buckets the time of each shot
+by how full the board was when it was taken. Run from the Wk3 folder:
+
+    python benchmarks/bench_shots.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from board import Board, CellPool
+
+BUCKETS = 10  # fill deciles
+
+
+def shots_retry(size, rng):
+    """The old approach: draw cells until one hasn't been attacked"""
+    board = Board(size)
+    times = []
+    for _ in range(size * size):
+        start = time.perf_counter()
+        while True:
+            row = rng.randint(0, size - 1)
+            col = rng.randint(0, size - 1)
+            if not board.is_attacked(row, col):
+                break
+        board.mark_miss(row, col)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def shots_pool(size, rng):
+    """One draw per shot from the untargeted-cell pool"""
+    board = Board(size)
+    pool = CellPool(size)
+    times = []
+    for _ in range(size * size):
+        start = time.perf_counter()
+        row, col = divmod(pool.pop_random(rng), size)
+        board.mark_miss(row, col)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def bench(shots, size, games, seed=1):
+    """Mean shot time in microseconds for each fill decile"""
+    rng = random.Random(seed)
+    totals = [0.0] * BUCKETS
+    counts = [0] * BUCKETS
+    cells = size * size
+    for _ in range(games):
+        for taken, seconds in enumerate(shots(size, rng)):
+            bucket = taken * BUCKETS // cells
+            totals[bucket] += seconds
+            counts[bucket] += 1
+    return [total / count * 1e6 for total, count in zip(totals, counts)]
+
+
+def main():
+    header = "".join(f"{f'{i * 10}%':>8}" for i in range(BUCKETS))
+    print(f"{'board':<8}{'method':<8}{header}   (mean us per shot by fill)")
+    for size, games in ((10, 200), (30, 10), (60, 2)):
+        for method, shots in (("retry", shots_retry), ("pool", shots_pool)):
+            row = bench(shots, size, games)
+            print(f"{f'{size}x{size}':<8}{method:<8}" + "".join(f"{t:>8.2f}" for t in row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""Timing suite for the engine and rendering hot paths.
+
+Times the engine calls a game makes (placement checks, fleet placement,
+attacks, the game-over check), whole-game throughput, and in the pygame
+front end the cost of draw_board, a restart, and a cold start, on several
+board sizes with fixed seeds. Rendering uses SDL's dummy video driver, so no window opens.
+Results are written to JSON so runs on different commits can be
+compared. Run from the Wk3 folder:
+
+    python benchmarks/bench_suite.py --out before.json
+    python benchmarks/bench_suite.py --out after.json --compare before.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Must be set before pygame is imported
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from battleship_engine import BattleshipEngine, make_fleet, ships
+from board import make_board
+
+SEED = 12345
+# (board size, full games to play); big boards take far longer per game
+SIZES = [(10, 2000), (30, 200), (100, 20), (1000, 1)]
+QUICK_SIZES = [(10, 200), (30, 20), (100, 2)]
+DEFAULT_OUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_results.json")
+
+
+def fleet_for(size):
+    """The standard fleet on 10x10, repeated to keep bigger boards about as full"""
+    if size <= 10:
+        return dict(ships)
+    return make_fleet(list(ships.values()) * (size // 10))
+
+
+def summarize(times):
+    """Mean and percentiles in microseconds for a list of timings in seconds"""
+    times = sorted(times)
+    n = len(times)
+    return {
+        "n": n,
+        "mean_us": sum(times) / n * 1e6,
+        "p50_us": times[n // 2] * 1e6,
+        "p95_us": times[n * 95 // 100] * 1e6,
+        "p99_us": times[n * 99 // 100] * 1e6,
+    }
+
+
+def new_game(size, seed):
+    """An engine with both fleets placed, ready to play"""
+    game = BattleshipEngine(seed=seed, board_size=size, fleet=fleet_for(size))
+    game.place_random_ships(game.player_board, game.player_ships)
+    game.game_state = "PLAYING"
+    return game
+
+
+def bench_is_valid_placement(size, calls=20_000):
+    game = new_game(size, SEED)
+    rng = random.Random(SEED)
+    times = []
+    for _ in range(calls):
+        row = rng.randrange(size)
+        col = rng.randrange(size)
+        direction = rng.choice("HV")
+        start = time.perf_counter()
+        game.is_valid_placement(game.computer_board, row, col, 4, direction)
+        times.append(time.perf_counter() - start)
+    return summarize(times)
+
+
+def bench_place_computer_ships(size, fleets):
+    game = BattleshipEngine(seed=SEED, board_size=size, fleet=fleet_for(size))
+    times = []
+    for _ in range(fleets):
+        game.computer_board = make_board(size)
+        game.computer_ships = {}
+        start = time.perf_counter()
+        game.place_computer_ships()
+        times.append(time.perf_counter() - start)
+    return summarize(times)
+
+
+def bench_attack(size, games):
+    """Player attacks, fired by the random strategy until the computer's fleet is gone"""
+    times = []
+    for seed in range(games):
+        game = new_game(size, SEED + seed)
+        board = game.computer_board
+        while board.ships_afloat:
+            cell = game.player_ai.choose(game.rng)
+            start = time.perf_counter()
+            sunk = game.attack(*divmod(cell, size))
+            times.append(time.perf_counter() - start)
+            game.player_ai.observe(cell, board.ship_cells[board.cell_ship[cell]] if sunk else None)
+    return summarize(times)
+
+
+def bench_computer_attack(size, games):
+    times = []
+    for seed in range(games):
+        game = new_game(size, SEED + seed)
+        while game.player_board.ships_afloat:
+            start = time.perf_counter()
+            game.computer_attack()
+            times.append(time.perf_counter() - start)
+    return summarize(times)
+
+
+def bench_check_game_over(size, calls=20_000):
+    game = new_game(size, SEED)
+    times = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        game.check_game_over()
+        times.append(time.perf_counter() - start)
+    return summarize(times)
+
+
+def bench_full_games(size, games):
+    """Whole computer-vs-computer games per second, setup included"""
+    turns = 0
+    start = time.perf_counter()
+    for seed in range(games):
+        game = BattleshipEngine(seed=SEED + seed, board_size=size, fleet=fleet_for(size))
+        turns += game.play_auto_game()[1]
+    seconds = time.perf_counter() - start
+    return {"n": games, "games_per_sec": games / seconds, "mean_turns": turns / games}
+
+
+def bench_draw_board(size, frames=200):
+    """draw_board on both boards after a game's worth of shots: first draw, and one new shot per frame"""
+    import pygame
+    from battleship_pygame import ATTACK_BOARD_OFFSET_X, BOARD_OFFSET_X, BOARD_OFFSET_Y, BattleshipPygame
+
+    game = BattleshipPygame(event_driven=False, board_size=size, fleet=fleet_for(size))
+    game.rng.seed(SEED)
+    game.auto_place_remaining()
+    # A quarter of the board's cells, capped so big boards still set up quickly
+    for _ in range(min(size * size // 4, 5000)):
+        if game.computer_board.ships_afloat > 1 and game.player_board.ships_afloat > 1:
+            game.auto_attack()
+            game.computer_attack()
+
+    def draw():
+        game.draw_board(game.player_board, BOARD_OFFSET_X, BOARD_OFFSET_Y)
+        game.draw_board(game.player_attack_board, ATTACK_BOARD_OFFSET_X, BOARD_OFFSET_Y, attack_board=True)
+        game.dirty_rects = []
+
+    full = []
+    for _ in range(frames):
+        game.board_seen.clear()
+        game.board_layer = None  # Include building the grid layer
+        start = time.perf_counter()
+        draw()
+        full.append(time.perf_counter() - start)
+
+    incremental = []
+    for _ in range(frames):
+        if game.computer_board.ships_afloat > 1:
+            game.auto_attack()
+        start = time.perf_counter()
+        draw()
+        incremental.append(time.perf_counter() - start)
+    pygame.display.quit()
+    return {"full": summarize(full), "incremental": summarize(incremental)}
+
+
+COLD_START = """
+import os, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {wk3!r})
+from battleship_pygame import BattleshipPygame
+game = BattleshipPygame(event_driven=False)
+print(time.perf_counter() - start)
+"""
+
+
+def bench_cold_start(runs=5):
+    """New process to a constructed BattleshipPygame: import, window, fonts and first fleet"""
+    wk3 = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = COLD_START.format(wk3=wk3)
+    inside = []
+    process = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        process.append(time.perf_counter() - start)
+        inside.append(float(out.stdout.split()[-1]))
+    return {"import_and_init": summarize(inside), "process": summarize(process)}
+
+
+def bench_restart(size, restarts=200):
+    """BattleshipPygame.reset() after a finished game, as on pressing SPACE"""
+    import pygame
+    from battleship_pygame import BattleshipPygame
+
+    game = BattleshipPygame(event_driven=False, board_size=size, fleet=fleet_for(size))
+    game.rng.seed(SEED)
+    times = []
+    for _ in range(restarts):
+        game.auto_place_remaining()
+        start = time.perf_counter()
+        game.reset()
+        times.append(time.perf_counter() - start)
+    pygame.display.quit()
+    return summarize(times)
+
+
+def git_commit():
+    """Current commit hash, or None outside a git checkout"""
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+
+def run_suite(sizes, render=True, repeat=1):
+    results = []
+    if render:
+        result = min((bench_cold_start() for _ in range(repeat)), key=headline)
+        results.append({"bench": "cold_start", "size": sizes[0][0], **result})
+        print(f"{sizes[0][0]:>5}  {'cold_start':<22}{describe(result)}", flush=True)
+    for size, games in sizes:
+        cases = [
+            ("is_valid_placement", lambda: bench_is_valid_placement(size)),
+            ("place_computer_ships", lambda: bench_place_computer_ships(size, max(games, 10))),
+            ("attack", lambda: bench_attack(size, max(1, games // 10))),
+            ("computer_attack", lambda: bench_computer_attack(size, max(1, games // 10))),
+            ("check_game_over", lambda: bench_check_game_over(size)),
+            ("full_game", lambda: bench_full_games(size, games)),
+        ]
+        if render:
+            cases.append(("draw_board", lambda: bench_draw_board(size)))
+            cases.append(("restart", lambda: bench_restart(size, 200 if size < 1000 else 20)))
+        for name, bench in cases:
+            # Keep the best of several runs; slower ones are mostly other load on the machine
+            runs = [bench() for _ in range(repeat)]
+            if name == "full_game":
+                result = max(runs, key=headline)
+            else:
+                result = min(runs, key=headline)
+            results.append({"bench": name, "size": size, **result})
+            print(f"{size:>5}  {name:<22}{describe(result)}", flush=True)
+    return results
+
+
+def describe(result):
+    """One-line summary of a result for the console"""
+    if "games_per_sec" in result:
+        return f"{result['games_per_sec']:>12,.1f} games/s"
+    if "full" in result:
+        return (f"{result['full']['mean_us']:>12.1f} us full, "
+                f"{result['incremental']['mean_us']:.1f} us incremental")
+    if "process" in result:
+        return (f"{result['import_and_init']['mean_us'] / 1e3:>12.1f} ms import and init, "
+                f"{result['process']['mean_us'] / 1e3:.1f} ms whole process")
+    return f"{result['mean_us']:>12.2f} us mean, p99 {result['p99_us']:.2f}"
+
+
+def headline(result):
+    """The single number compared across runs: a time in us, or games/s"""
+    if "games_per_sec" in result:
+        return result["games_per_sec"]
+    if "full" in result:
+        return result["incremental"]["mean_us"]
+    if "process" in result:
+        return result["import_and_init"]["mean_us"]
+    return result["mean_us"]
+
+
+def compare(results, baseline_path):
+    """Print each result's change against a previous run"""
+    with open(baseline_path) as f:
+        baseline = {(r["bench"], r["size"]): r for r in json.load(f)["results"]}
+    print(f"\nChange vs {baseline_path} (negative is faster for times, positive is better for games/s):")
+    for result in results:
+        old = baseline.get((result["bench"], result["size"]))
+        if old is None:
+            continue
+        before, after = headline(old), headline(result)
+        print(f"{result['size']:>5}  {result['bench']:<22}{(after - before) / before:>+9.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the engine and rendering hot paths")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="where to write the JSON results")
+    parser.add_argument("--compare", help="JSON results from an earlier run to compare against")
+    parser.add_argument("--quick", action="store_true", help="smaller boards and fewer games")
+    parser.add_argument("--no-render", action="store_true", help="skip the pygame draw_board timings")
+    parser.add_argument("--repeat", type=int, default=3, help="runs of each benchmark, keeping the best")
+    args = parser.parse_args()
+
+    try:
+        import pygame
+        pygame_version = pygame.version.ver
+    except ImportError:
+        pygame_version = None
+        args.no_render = True
+
+    results = run_suite(QUICK_SIZES if args.quick else SIZES, render=not args.no_render, repeat=args.repeat)
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "pygame": pygame_version,
+        "seed": SEED,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {args.out}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Frame cost of the spectator wall as the number of tiled games grows.
+
+Renders the same boards two ways: one pygame.draw.rect per cell, as
+draw_board does for the main game, and the wall's bulk path (tile the
+cell codes with NumPy, surfarray.blit_array into an 8-bit surface, scale
+once, blit). Rendering uses SDL's dummy video driver, so no window opens.
+Run from the Wk3 folder:
+
+    python benchmarks/bench_wall.py --games 64 256 1024
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from battleship_pygame import BLUE, GRAY, LIGHT_BLUE, RED, WALL_TOP, WHITE, WINDOW_HEIGHT, WINDOW_WIDTH
+from wall import BACKGROUND, WallFeed, tile_boards, tile_size, wall_grid
+
+PALETTE = [LIGHT_BLUE, GRAY, RED, BLUE]
+PALETTE.insert(BACKGROUND, WHITE)
+
+
+def frame_ms(render, feed, frames):
+    """Median and worst milliseconds per frame, with the feed playing a turn before each"""
+    times = []
+    for _ in range(frames):
+        feed.turn()
+        start = time.perf_counter()
+        render(feed.codes)
+        times.append((time.perf_counter() - start) * 1e3)
+    return statistics.median(times), max(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark spectator wall rendering")
+    parser.add_argument("--games", type=int, nargs="+", default=[64, 256, 1024])
+    parser.add_argument("--frames", type=int, default=60)
+    args = parser.parse_args()
+
+    pygame.display.init()
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    print(f"{'games':>6}{'cells/px':>10}{'draw.rect ms':>16}{'surfarray ms':>16}")
+    for n_games in args.games:
+        feed = WallFeed(n_games, seed=1)
+        cols, scale = wall_grid(n_games, feed.size, WINDOW_WIDTH, WINDOW_HEIGHT - WALL_TOP)
+        tile_width, tile_height = tile_size(feed.size)
+        image_size = (cols * tile_width, -(-n_games // cols) * tile_height)
+        cells = pygame.Surface(image_size, depth=8)
+        cells.set_palette(PALETTE)
+        scaled = pygame.Surface((image_size[0] * scale, image_size[1] * scale), depth=8)
+        scaled.set_palette(PALETTE)
+
+        def per_cell(codes):
+            image = tile_boards(codes, cols)
+            for y, row in enumerate(image.tolist()):
+                for x, code in enumerate(row):
+                    if code != BACKGROUND:
+                        pygame.draw.rect(screen, PALETTE[code], (x * scale, WALL_TOP + y * scale, scale, scale))
+            pygame.display.flip()
+
+        def bulk(codes):
+            pygame.surfarray.blit_array(cells, tile_boards(codes, cols).T)
+            pygame.transform.scale(cells, scaled.get_size(), scaled)
+            pygame.display.update(screen.blit(scaled, (0, WALL_TOP)))
+
+        rect_median, _ = frame_ms(per_cell, feed, max(1, args.frames // 6))
+        bulk_median, bulk_worst = frame_ms(bulk, feed, args.frames)
+        print(f"{n_games:>6}{scale:>10}{rect_median:>16.2f}{bulk_median:>16.2f}  (max {bulk_worst:.2f})")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,457 @@
+"""Bitboard storage for a Battleship board.
+
+Each layer (ships, hits, misses) is a single Python int where bit
+``row * size + col`` is set for an occupied cell, so placement checks,
+hit tests and "any ship left" are one mask operation each.
+
+Very large boards use SparseBoard instead, which keeps the same layers as
+sets of cell indices so memory follows ships and shots, not board area.
+"""
+from functools import lru_cache
+
+from zobrist import zobrist_keys
+
+# Cell codes returned by Board.cell: 0=empty, 1=ship, 2=hit, 3=miss
+EMPTY = 0
+SHIP = 1
+HIT = 2
+MISS = 3
+
+# Boards at least this wide use SparseBoard
+SPARSE_MIN_SIZE = 64
+# Random probes SparsePlacementIndex makes before listing every legal placement
+MAX_PROBES = 64
+
+
+def row_label(row):
+    """Row name like a spreadsheet column: A-Z, then AA, AB, ..."""
+    label = ""
+    row += 1
+    while row:
+        row, remainder = divmod(row - 1, 26)
+        label = chr(65 + remainder) + label
+    return label
+
+
+def make_board(size):
+    """Bitboard for normal sizes, set-based storage for very large ones"""
+    if size >= SPARSE_MIN_SIZE:
+        return SparseBoard(size)
+    return Board(size)
+
+
+@lru_cache(maxsize=None)
+def placement_masks(size, length, direction):
+    """Ship mask for every start cell, indexed by row * size + col (0 if it runs off the board)"""
+    if direction == "H":
+        line = (1 << length) - 1
+    else:  # Vertical
+        line = 0
+        for i in range(length):
+            line |= 1 << (i * size)
+
+    masks = []
+    for row in range(size):
+        for col in range(size):
+            if direction == "H":
+                fits = col + length <= size
+            else:
+                fits = row + length <= size
+            masks.append(line << (row * size + col) if fits else 0)
+    return masks
+
+
+try:
+    popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+    def popcount(x):
+        return bin(x).count("1")
+
+
+def nth_set_bit(x, n):
+    """Index of the n-th (0-based) set bit of x, by binary search on bit counts"""
+    shift = 0
+    width = x.bit_length()
+    while width > 1:
+        half = width // 2
+        low = x & ((1 << half) - 1)
+        count = popcount(low)
+        if n < count:
+            x = low
+            width = half
+        else:
+            n -= count
+            x >>= half
+            shift += half
+            width -= half
+    return shift
+
+
+@lru_cache(maxsize=None)
+def placement_starts(size, length, direction):
+    """Mask of every start cell where a ship of this length fits on an empty board"""
+    starts = 0
+    for index, mask in enumerate(placement_masks(size, length, direction)):
+        if mask:
+            starts |= 1 << index
+    return starts
+
+
+@lru_cache(maxsize=None)
+def placement_table(size, length):
+    """Every (row, col, direction, mask) where a ship of this length fits on an empty board"""
+    table = []
+    for direction in ("H", "V"):
+        for index, mask in enumerate(placement_masks(size, length, direction)):
+            if mask:
+                table.append((index // size, index % size, direction, mask))
+    return tuple(table)
+
+
+class PlacementIndex:
+    """Random legal ship placements without retry loops.
+
+    Each ship first probes one entry of the precomputed placement table.
+    If that overlaps a placed ship, the table is filtered down to the legal
+    start cells with a few mask operations and one of them is drawn. Either
+    way the pick is uniform over legal placements and takes at most two
+    draws, however crowded the board is.
+    """
+    def __init__(self, size, occupied=0):
+        self.size = size
+        self.occupied = occupied
+        self.fallbacks = 0  # probes that overlapped and needed the filtered draw
+
+    def legal_starts(self, length, direction):
+        """Mask of start cells where a ship of this length still fits"""
+        step = 1 if direction == "H" else self.size
+        free = ~self.occupied
+        legal = placement_starts(self.size, length, direction)
+        for i in range(length):
+            legal &= free >> (i * step)
+        return legal
+
+    def choose(self, length, rng):
+        """Pick a random legal (row, col, direction) for a ship of this length"""
+        table = placement_table(self.size, length)
+        row, col, direction, mask = table[rng.randrange(len(table))]
+
+        if mask & self.occupied:
+            self.fallbacks += 1
+            horizontal = self.legal_starts(length, "H")
+            vertical = self.legal_starts(length, "V")
+            h_count = popcount(horizontal)
+            total = h_count + popcount(vertical)
+            if not total:
+                raise ValueError(f"No room left for a ship of length {length}")
+
+            n = rng.randrange(total)
+            if n < h_count:
+                direction, index = "H", nth_set_bit(horizontal, n)
+            else:
+                direction, index = "V", nth_set_bit(vertical, n - h_count)
+            row, col = index // self.size, index % self.size
+            mask = placement_masks(self.size, length, direction)[index]
+
+        self.occupied |= mask
+        return row, col, direction
+
+
+class CellPool:
+    """Cells not fired at yet, drawn at random without replacement in O(1).
+
+    This is a lazy Fisher-Yates shuffle: slot i holds cell i unless a
+    swap-remove moved something there, and only those moves are stored,
+    so memory grows with shots taken rather than with board area.
+    """
+    def __init__(self, size):
+        self.count = size * size
+        self.slot_cell = {}  # slot -> cell, for slots that were swapped
+        self.cell_slot = {}  # cell -> slot, for cells that were moved or removed
+
+    def __len__(self):
+        return self.count
+
+    def pop_random(self, rng):
+        """Remove and return a random cell index"""
+        slot = rng.randrange(self.count)
+        cell = self.slot_cell.get(slot, slot)
+        self._remove(slot, cell)
+        return cell
+
+    def discard(self, cell):
+        """Remove a specific cell if it is still in the pool"""
+        slot = self.cell_slot.get(cell, cell)
+        if slot < self.count:
+            self._remove(slot, cell)
+
+    def _remove(self, slot, cell):
+        # Move the last cell into the freed slot; removed cells end up at slots >= count
+        last = self.count - 1
+        if slot != last:
+            last_cell = self.slot_cell.get(last, last)
+            self.slot_cell[slot] = last_cell
+            self.cell_slot[last_cell] = slot
+        self.slot_cell.pop(last, None)
+        self.cell_slot[cell] = last
+        self.count = last
+
+
+def mask_cells(mask):
+    """Cell indices of the set bits in a mask"""
+    cells = []
+    while mask:
+        low = mask & -mask
+        cells.append(low.bit_length() - 1)
+        mask ^= low
+    return cells
+
+
+class Board:
+    def __init__(self, size):
+        self.size = size
+        self.ships = 0
+        self.hits = 0
+        self.misses = 0
+        self.ship_masks = {}  # ship name -> mask of its cells
+
+        # Reverse index for O(1) hit resolution
+        self.cell_ship = {}  # cell index -> ship id
+        self.ship_names = []  # ship id -> ship name
+        self.ship_ids = {}  # ship name -> ship id
+        self.ship_remaining = []  # ship id -> cells not yet hit
+        self.ship_cells = []  # ship id -> cell indices
+
+        # Live fleet status, so game-over checks never scan the board
+        self.ships_afloat = 0
+        self.cells_remaining = 0
+
+        # Every cell index whose code changed, in order, so views can redraw just those
+        self.changes = []
+
+        # Zobrist hash of the hits and misses (see zobrist.py), kept up to date shot by shot
+        self.zobrist = 0
+        self.miss_keys, self.hit_keys = zobrist_keys(size)
+        self.ship_zobrist = []  # ship id -> XOR of its cells' hit keys, for O(1) sinking
+
+    def bit(self, row, col):
+        """Single-cell mask"""
+        return 1 << (row * self.size + col)
+
+    def ship_mask(self, row, col, length, direction):
+        """Mask covered by a ship, or 0 if it doesn't fit on the board"""
+        if not (0 <= row < self.size and 0 <= col < self.size):
+            return 0
+        return placement_masks(self.size, length, direction)[row * self.size + col]
+
+    def is_valid_placement(self, row, col, length, direction):
+        """Check if ship placement is valid"""
+        mask = self.ship_mask(row, col, length, direction)
+        return bool(mask) and not (self.ships & mask)
+
+    def place_ship(self, ship_name, row, col, length, direction):
+        """Place a ship on the board and return its cells"""
+        mask = self.ship_mask(row, col, length, direction)
+        self.ships |= mask
+        self.ship_masks[ship_name] = mask
+
+        if direction == "H":
+            positions = [(row, col + i) for i in range(length)]
+        else:
+            positions = [(row + i, col) for i in range(length)]
+
+        cells = [ship_row * self.size + ship_col for ship_row, ship_col in positions]
+        ship_id = len(self.ship_names)
+        self.ship_names.append(ship_name)
+        self.ship_ids[ship_name] = ship_id
+        self.ship_remaining.append(length)
+        self.ship_cells.append(cells)
+        zobrist = 0
+        for cell in cells:
+            zobrist ^= self.hit_keys[cell]
+        self.ship_zobrist.append(zobrist)
+        self.ships_afloat += 1
+        self.cells_remaining += length
+        for cell in cells:
+            self.cell_ship[cell] = ship_id
+        self.changes.extend(cells)
+        return positions
+
+    def attack(self, row, col):
+        """Fire at a cell. A hit sinks the whole ship: returns ("sunk", name) or ("miss", None)"""
+        ship_id = self.cell_ship.get(row * self.size + col)
+        if ship_id is not None and self.ship_remaining[ship_id]:
+            ship_name = self.ship_names[ship_id]
+            self.hits |= self.ship_masks[ship_name]
+            self.cells_remaining -= self.ship_remaining[ship_id]
+            self.ship_remaining[ship_id] = 0
+            self.zobrist ^= self.ship_zobrist[ship_id]
+            self.ships_afloat -= 1
+            self.changes.extend(self.ship_cells[ship_id])
+            return "sunk", ship_name
+        self.mark_miss(row, col)
+        return "miss", None
+
+    def mark_hit(self, mask):
+        """Record hits on an attack-tracking board"""
+        for cell in mask_cells(mask & ~self.hits):
+            self.zobrist ^= self.hit_keys[cell]
+        self.hits |= mask
+        self.changes.extend(mask_cells(mask))
+
+    def mark_miss(self, row, col):
+        """Record a miss on an attack-tracking board"""
+        bit = self.bit(row, col)
+        if not self.misses & bit:
+            self.zobrist ^= self.miss_keys[row * self.size + col]
+        self.misses |= bit
+        self.changes.append(row * self.size + col)
+
+    def mark_misses(self, mask):
+        """Record many misses at once, e.g. when loading a saved game"""
+        for cell in mask_cells(mask & ~self.misses):
+            self.zobrist ^= self.miss_keys[cell]
+        self.misses |= mask
+        self.changes.extend(mask_cells(mask))
+
+    def is_ship_sunk(self, ship_name):
+        return self.ship_remaining[self.ship_ids[ship_name]] == 0
+
+    def is_attacked(self, row, col):
+        return bool((self.hits | self.misses) & self.bit(row, col))
+
+    def placement_index(self):
+        """PlacementIndex for placing more ships on this board"""
+        return PlacementIndex(self.size, self.ships)
+
+    def ships_left(self):
+        """True while any ship is still afloat"""
+        return self.ships_afloat > 0
+
+    def cell(self, row, col):
+        """Cell code: 0=empty, 1=ship, 2=hit, 3=miss"""
+        bit = self.bit(row, col)
+        if self.hits & bit:
+            return HIT
+        if self.misses & bit:
+            return MISS
+        if self.ships & bit:
+            return SHIP
+        return EMPTY
+
+
+class SparsePlacementIndex:
+    """PlacementIndex for SparseBoard, with an implicit placement table.
+
+    Placements are numbered arithmetically rather than stored, and a random
+    one is probed against the occupied cells. On a large board that almost
+    always succeeds at once; after MAX_PROBES misses it lists every legal
+    placement and draws from those, so the pick stays uniform and bounded.
+    """
+    def __init__(self, size, occupied=()):
+        self.size = size
+        self.occupied = set(occupied)
+        self.fallbacks = 0
+
+    def cells(self, row, col, length, direction):
+        start = row * self.size + col
+        step = 1 if direction == "H" else self.size
+        return range(start, start + length * step, step)
+
+    def choose(self, length, rng):
+        """Pick a random legal (row, col, direction) for a ship of this length"""
+        span = self.size - length + 1  # start positions along the ship's direction
+        per_direction = self.size * span
+        for _ in range(MAX_PROBES):
+            n = rng.randrange(2 * per_direction)
+            if n < per_direction:
+                direction = "H"
+                row, col = divmod(n, span)
+            else:
+                direction = "V"
+                col, row = divmod(n - per_direction, span)
+            cells = self.cells(row, col, length, direction)
+            if not any(cell in self.occupied for cell in cells):
+                break
+        else:
+            # Crowded board: fall back to every legal placement
+            self.fallbacks += 1
+            legal = [
+                (row, col, direction)
+                for direction in ("H", "V")
+                for row in range(self.size if direction == "H" else span)
+                for col in range(span if direction == "H" else self.size)
+                if not any(cell in self.occupied for cell in self.cells(row, col, length, direction))
+            ]
+            if not legal:
+                raise ValueError(f"No room left for a ship of length {length}")
+            row, col, direction = legal[rng.randrange(len(legal))]
+            cells = self.cells(row, col, length, direction)
+
+        self.occupied.update(cells)
+        return row, col, direction
+
+
+class SparseBoard(Board):
+    """Board for very large grids: the ships, hits and misses layers are sets of
+    cell indices and each ship's "mask" is a frozenset of its cells"""
+    def __init__(self, size):
+        Board.__init__(self, size)
+        self.ships = set()
+        self.hits = set()
+        self.misses = set()
+
+    def bit(self, row, col):
+        """Single-cell mask"""
+        return frozenset((row * self.size + col,))
+
+    def ship_mask(self, row, col, length, direction):
+        """Cells covered by a ship, or an empty set if it doesn't fit on the board"""
+        if not (0 <= row < self.size and 0 <= col < self.size):
+            return frozenset()
+        if (col if direction == "H" else row) + length > self.size:
+            return frozenset()
+        start = row * self.size + col
+        step = 1 if direction == "H" else self.size
+        return frozenset(range(start, start + length * step, step))
+
+    def mark_hit(self, mask):
+        """Record hits on an attack-tracking board"""
+        for cell in mask - self.hits:
+            self.zobrist ^= self.hit_keys[cell]
+        self.hits |= mask
+        self.changes.extend(mask)
+
+    def mark_miss(self, row, col):
+        """Record a miss on an attack-tracking board"""
+        cell = row * self.size + col
+        if cell not in self.misses:
+            self.zobrist ^= self.miss_keys[cell]
+        self.misses.add(cell)
+        self.changes.append(cell)
+
+    def mark_misses(self, mask):
+        """Record many misses at once, e.g. when loading a saved game"""
+        for cell in mask - self.misses:
+            self.zobrist ^= self.miss_keys[cell]
+        self.misses |= mask
+        self.changes.extend(mask)
+
+    def is_attacked(self, row, col):
+        cell = row * self.size + col
+        return cell in self.hits or cell in self.misses
+
+    def placement_index(self):
+        """PlacementIndex for placing more ships on this board"""
+        return SparsePlacementIndex(self.size, self.ships)
+
+    def cell(self, row, col):
+        """Cell code: 0=empty, 1=ship, 2=hit, 3=miss"""
+        cell = row * self.size + col
+        if cell in self.hits:
+            return HIT
+        if cell in self.misses:
+            return MISS
+        if cell in self.ships:
+            return SHIP
+        return EMPTY
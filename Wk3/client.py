@@ -0,0 +1,51 @@
+"""Blocking connection to server.py, for front ends with their own event loop.
+
+Lines from the server arrive on a background thread and are handed to a
+callback as lists of words; the pygame front end turns them into events.
+"""
+import socket
+import threading
+
+from battleship_engine import make_fleet, ships
+
+
+class ServerConnection:
+    def __init__(self, host, port, timeout=10):
+        self.sock = socket.create_connection((host, port), timeout)
+        self.sock.settimeout(None)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.file = self.sock.makefile("r", encoding="utf-8", newline="\n")
+        words = self.file.readline().split()
+        if len(words) != 3 or words[0] != "WELCOME":
+            self.close()
+            raise ConnectionError(f"{host}:{port} is not a Battleship server")
+        self.board_size = int(words[1])
+        lengths = [int(length) for length in words[2].split(",")]
+        # Use the usual ship names when the server plays the standard fleet
+        self.fleet = dict(ships) if lengths == list(ships.values()) else make_fleet(lengths)
+        self.thread = None
+
+    def start(self, on_words):
+        """Call on_words(words) from a background thread for each server line, then on_words(None) at the end"""
+        def read():
+            try:
+                for line in self.file:
+                    words = line.split()
+                    if words:
+                        on_words(words)
+            except OSError:
+                pass
+            on_words(None)
+
+        self.thread = threading.Thread(target=read, daemon=True)
+        self.thread.start()
+
+    def send(self, *words):
+        self.sock.sendall((" ".join(str(word) for word in words) + "\n").encode())
+
+    def close(self):
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
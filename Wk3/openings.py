@@ -0,0 +1,249 @@
+"""Precomputed Monte Carlo heatmaps for the first turns of a game, memory-mapped from disk.
+
+MonteCarloAI starts every game knowing nothing, and its first shots are
+mostly misses, so the first few positions it faces are the same game after
+game. build() samples them once, offline, with far more layouts than a
+move's time budget allows: from the empty board it takes the likeliest few
+cells, assumes each is a miss, and branches out like that for the given
+number of turns. Each position's heatmap (the share of sampled layouts with
+a ship on each cell) and best cell go into one file:
+
+    header    magic, version, board size, positions, key bytes, ship count, samples per position
+    lengths   the fleet's ship lengths, longest first, one byte each
+    keys      cells fired at as big-endian masks, sorted, in canonical orientation
+    heatmaps  float32, size * size per position
+    best      uint16 best cell per position
+
+A position is stored once for all eight rotations and reflections of the
+board, in whichever orientation gives the smallest mask. OpeningBook maps
+the file and reads it in place, so opening it costs nothing and every
+process using it shares the same pages. MonteCarloAI plays the best cell
+straight from the book, and its think() starts from the heatmap rather than
+from nothing. Build it with:
+
+    python openings.py --turns 6 --branch 3 --samples 100000
+
+Needs NumPy.
+"""
+import argparse
+import mmap
+import os
+import struct
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from battleship_engine import BOARD_SIZE, make_fleet, ships
+from board import mask_cells
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "openings.bin")
+MAGIC = b"BSOB"
+VERSION = 2
+HEADER = struct.Struct("<4sHHIHHI")  # magic, version, size, positions, key bytes, ship count, samples
+DEFAULT_TURNS = 6
+DEFAULT_BRANCH = 3  # likeliest cells followed from each position
+DEFAULT_SAMPLES = 100_000  # layouts sampled per position
+
+
+def sections(size, positions, key_bytes, ship_count):
+    """Byte offsets of the lengths, keys, heatmaps and best cells, and the file size"""
+    lengths = HEADER.size
+    keys = lengths + ship_count
+    heatmaps = keys + positions * key_bytes
+    heatmaps += -heatmaps % 4  # float32 alignment
+    best = heatmaps + positions * size * size * 4
+    return lengths, keys, heatmaps, best, best + positions * 2
+
+
+def symmetries(size):
+    """The eight rotations and reflections of the board, each as an array taking a cell to where it moves"""
+    rows, cols = np.divmod(np.arange(size * size), size)
+    last = size - 1
+    moves = [
+        (rows, cols), (cols, last - rows), (last - rows, last - cols), (last - cols, rows),
+        (rows, last - cols), (last - rows, cols), (cols, rows), (last - cols, last - rows),
+    ]
+    return [new_rows * size + new_cols for new_rows, new_cols in moves]
+
+
+def canonical(cells, perms):
+    """(mask, perm) for the orientation of a set of cells with the smallest mask"""
+    best = None
+    for perm in perms:
+        mask = 0
+        for cell in cells:
+            mask |= 1 << int(perm[cell])
+        if best is None or mask < best[0]:
+            best = (mask, perm)
+    return best
+
+
+class OpeningBook:
+    """Read-only view of a file written by build(), looked up in place"""
+    def __init__(self, path=DEFAULT_PATH):
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)  # ValueError if it's empty
+        if len(self.data) < HEADER.size:
+            raise ValueError(f"{path} is not a version {VERSION} opening book")
+        magic, version, size, positions, key_bytes, ship_count, samples = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} opening book")
+        lengths, keys, heatmaps, best, end = sections(size, positions, key_bytes, ship_count)
+        if len(self.data) != end:
+            raise ValueError(f"{path} is truncated")
+
+        self.size = size
+        self.positions = positions
+        self.samples = samples  # layouts behind each heatmap, to weigh it against fresh samples
+        self.key_bytes = key_bytes
+        self.keys_offset = keys
+        self.lengths = list(self.data[lengths:keys])
+        # NumPy views straight onto the mapped pages; nothing is copied
+        self.heatmaps = np.frombuffer(self.data, dtype="<f4", count=positions * size * size,
+                                      offset=heatmaps).reshape(positions, size * size)
+        self.best = np.frombuffer(self.data, dtype="<u2", count=positions, offset=best)
+        self.perms = symmetries(size)
+        # Most shots in any stored position; deeper positions skip the search
+        self.deepest = max((bin(int.from_bytes(self.key(i), "big")).count("1") for i in range(positions)), default=-1)
+
+    def __len__(self):
+        return self.positions
+
+    def key(self, i):
+        start = self.keys_offset + i * self.key_bytes
+        return self.data[start:start + self.key_bytes]
+
+    def lookup(self, blocked, lengths):
+        """(heatmap, best cell) for a position, oriented like the board, or None if it isn't in the book.
+
+        blocked is the mask of cells fired at, and lengths the ships still afloat.
+        """
+        if sorted(lengths, reverse=True) != self.lengths:
+            return None
+        cells = mask_cells(blocked)
+        if len(cells) > self.deepest:
+            return None
+        mask, perm = canonical(cells, self.perms)
+        key = mask.to_bytes(self.key_bytes, "big")
+        # Big-endian keys sort like the masks, so a binary search over the mapped bytes finds it
+        # (by hand, since bisect only takes key= from Python 3.10)
+        low, high = 0, self.positions
+        while low < high:
+            middle = (low + high) // 2
+            if self.key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        i = low
+        if i == self.positions or self.key(i) != key:
+            return None
+        # Cell c of this board is cell perm[c] of the stored orientation
+        heatmap = self.heatmaps[i][perm]
+        best = int(np.flatnonzero(perm == self.best[i])[0])
+        return heatmap, best
+
+
+_books = {}
+
+
+def default_book(size, path=DEFAULT_PATH):
+    """The book at path, mapped once per process; None if it hasn't been built, is out of date or is for another board size"""
+    if path not in _books:
+        try:
+            _books[path] = OpeningBook(path) if os.path.exists(path) else None
+        except ValueError as error:
+            print(f"Ignoring the opening book: {error}; rebuild it with openings.py", file=sys.stderr)
+            _books[path] = None
+    book = _books[path]
+    return book if book is not None and book.size == size else None
+
+
+def sample_position(size, lengths, blocked, samples, seed):
+    """(per-cell occupancy counts, layouts drawn) over up to samples layouts. Runs inside pool workers."""
+    from ai import sample_layouts
+    return sample_layouts(size, lengths, blocked, float("inf"), seed, max_samples=samples)
+
+
+def build(path=DEFAULT_PATH, turns=DEFAULT_TURNS, samples=DEFAULT_SAMPLES, size=BOARD_SIZE, fleet=None,
+          workers=None, seed=0, branch=DEFAULT_BRANCH):
+    """Sample all-miss positions up to turns shots deep, following the branch likeliest cells of each, and write them to path"""
+    lengths = sorted((ships if fleet is None else fleet).values(), reverse=True)
+    workers = workers or os.cpu_count() or 1
+    perms = symmetries(size)
+    key_bytes = (size * size + 7) // 8
+    entries = {}  # canonical mask -> (heatmap, best cell)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        level = [0]  # canonical masks of the positions this many shots in
+        tasks_run = 0
+        for turn in range(turns):
+            # Split each position's samples so every worker has a share even on the first turns
+            jobs = -(-workers // len(level))
+            share = -(-samples // jobs)
+            tasks = [(mask, job) for mask in level for job in range(jobs)]
+            seeds = range(seed * 1_000_003 + tasks_run, seed * 1_000_003 + tasks_run + len(tasks))
+            tasks_run += len(tasks)
+            results = pool.map(sample_position, [size] * len(tasks), [tuple(lengths)] * len(tasks),
+                               [mask for mask, _ in tasks], [share] * len(tasks), seeds)
+            totals = {}
+            for (mask, _), (counts, drawn) in zip(tasks, results):
+                total = totals.setdefault(mask, [np.zeros(size * size, dtype=np.int64), 0])
+                total[0] += counts
+                total[1] += drawn
+
+            next_level = set()
+            for mask in level:
+                counts, drawn = totals[mask]
+                if not drawn:
+                    continue  # No fleet layout fits; nothing to store or follow
+                heatmap = (counts / drawn).astype("<f4")
+                open_cells = np.flatnonzero([not mask >> cell & 1 for cell in range(size * size)])
+                ranked = open_cells[np.argsort(-heatmap[open_cells], kind="stable")]
+                entries[mask] = (heatmap, int(ranked[0]))
+                # Each of the likeliest cells as a miss, put back in canonical orientation
+                for cell in ranked[:branch]:
+                    child, _ = canonical(mask_cells(mask | 1 << int(cell)), perms)
+                    if child not in entries:
+                        next_level.add(child)
+            print(f"turn {turn + 1}: sampled {len(level)} positions, {len(entries)} in the book")
+            level = sorted(next_level)
+            if not level:
+                break
+
+    keys = sorted(entries)
+    offsets = sections(size, len(keys), key_bytes, len(lengths))
+    data = bytearray(offsets[-1])
+    HEADER.pack_into(data, 0, MAGIC, VERSION, size, len(keys), key_bytes, len(lengths), samples)
+    data[offsets[0]:offsets[1]] = bytes(lengths)
+    for i, mask in enumerate(keys):
+        heatmap, best = entries[mask]
+        data[offsets[1] + i * key_bytes:offsets[1] + (i + 1) * key_bytes] = mask.to_bytes(key_bytes, "big")
+        row = offsets[2] + i * size * size * 4
+        data[row:row + size * size * 4] = heatmap.tobytes()
+        struct.pack_into("<H", data, offsets[3] + i * 2, best)
+    # Write under a temporary name so a process mapping the old file never sees half of the new one
+    with open(path + ".tmp", "wb") as f:
+        f.write(data)
+    os.replace(path + ".tmp", path)
+    return len(keys)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the opening book MonteCarloAI reads")
+    parser.add_argument("--out", default=DEFAULT_PATH)
+    parser.add_argument("--turns", type=int, default=DEFAULT_TURNS, help="shots deep to cover")
+    parser.add_argument("--branch", type=int, default=DEFAULT_BRANCH, help="likeliest cells to follow from each position")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES, help="layouts sampled per position")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--size", type=int, default=BOARD_SIZE, help="board width and height")
+    parser.add_argument("--fleet", help="comma-separated ship lengths, e.g. 5,4,3,3,2")
+    args = parser.parse_args()
+    fleet = make_fleet(int(length) for length in args.fleet.split(",")) if args.fleet else None
+    positions = build(args.out, args.turns, args.samples, args.size, fleet, args.workers, args.seed, args.branch)
+    print(f"Wrote {positions} positions to {args.out} ({os.path.getsize(args.out):,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
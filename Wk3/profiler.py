@@ -0,0 +1,119 @@
+"""Per-frame timing for the pygame front end.
+
+The game loop calls begin_frame() once its events are in, then mark(phase)
+after each part of the frame; a mark charges the time since the previous
+one to that phase. Work timed on its own, like an AI move, goes through
+record(phase, seconds). end_frame() closes the frame.
+
+Recent frames are kept for the on-screen overlay. With a log path, a
+summary line of p50/p95/p99 per phase is written as JSON every few
+seconds to a log file that rotates by size.
+"""
+import json
+import logging
+import time
+from collections import deque
+from logging.handlers import RotatingFileHandler
+
+# Order phases are shown in; any others follow
+PHASES = ["events", "ai_move", "clear", "board_player", "board_attack", "preview", "text", "overlay", "display", "frame"]
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def summarize(samples):
+    """{phase: {"p50": ms, "p95": ms, "p99": ms, "n": count}} for lists of times in seconds"""
+    summary = {}
+    for phase, times in samples.items():
+        if times:
+            times = sorted(times)
+            summary[phase] = {
+                "p50": round(percentile(times, 0.50) * 1e3, 4),
+                "p95": round(percentile(times, 0.95) * 1e3, 4),
+                "p99": round(percentile(times, 0.99) * 1e3, 4),
+                "n": len(times),
+            }
+    return summary
+
+
+class FrameProfiler:
+    def __init__(self, log_path=None, window=600, log_interval=5.0, max_bytes=1_000_000, backups=3):
+        self.recent = {}  # phase -> deque of the last `window` times, for the overlay
+        self.window = window
+        self.pending = {}  # phase -> times since the last log line, only kept with a log
+        self.frame = {}  # phase -> time so far in the current frame
+        self.frame_start = 0.0
+        self.last_mark = 0.0
+        self.frames = 0
+
+        self.logger = None
+        self.log_interval = log_interval
+        self.next_log = time.perf_counter() + log_interval
+        if log_path:
+            handler = RotatingFileHandler(log_path, maxBytes=max_bytes, backupCount=backups)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self.logger = logging.getLogger(f"battleship.profile.{log_path}")
+            self.logger.propagate = False
+            self.logger.setLevel(logging.INFO)
+            self.logger.handlers = [handler]
+
+    def begin_frame(self):
+        self.frame_start = self.last_mark = time.perf_counter()
+        self.frame = {}
+
+    def mark(self, phase):
+        """Charge the time since the last mark to a phase"""
+        now = time.perf_counter()
+        self.frame[phase] = self.frame.get(phase, 0.0) + now - self.last_mark
+        self.last_mark = now
+
+    def record(self, phase, seconds):
+        """Add a time measured separately, e.g. an AI move"""
+        self.frame[phase] = self.frame.get(phase, 0.0) + seconds
+
+    def end_frame(self):
+        now = time.perf_counter()
+        self.frame["frame"] = now - self.frame_start
+        self.frames += 1
+        for phase, seconds in self.frame.items():
+            if phase not in self.recent:
+                self.recent[phase] = deque(maxlen=self.window)
+            self.recent[phase].append(seconds)
+            if self.logger:
+                # Only write_log empties these, so without a log they'd grow every frame
+                self.pending.setdefault(phase, []).append(seconds)
+        if self.logger and now >= self.next_log:
+            self.write_log()
+            self.next_log = now + self.log_interval
+
+    def write_log(self):
+        """Write one JSON line summarizing the frames since the last one"""
+        frames = len(self.pending.get("frame", ()))
+        if not frames:
+            return
+        line = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "frames": frames,
+            "phases_ms": summarize(self.pending),
+        }
+        self.logger.info(json.dumps(line))
+        for times in self.pending.values():
+            times.clear()
+
+    def overlay_rows(self):
+        """(phase, p50, p95, p99) in ms over recent frames, in display order"""
+        summary = summarize(self.recent)
+        order = PHASES + sorted(set(summary) - set(PHASES))
+        return [(phase, summary[phase]["p50"], summary[phase]["p95"], summary[phase]["p99"])
+                for phase in order if phase in summary]
+
+    def close(self):
+        """Flush the last partial summary and close the log"""
+        if self.logger:
+            self.write_log()
+            for handler in self.logger.handlers:
+                handler.close()
+            self.logger.handlers = []
@@ -0,0 +1,225 @@
+"""Compact binary archive of finished games.
+
+An archive is two files. The data file starts with a header:
+
+    magic "BSHR", version (u8), value width in bytes (u8),
+    board size (u16), ship count (u16), one u8 length per ship,
+    then the ship names as UTF-8 lines, prefixed by their size (u16)
+
+followed by one record per game, back to back:
+
+    player fleet, computer fleet  one value per ship, in fleet order:
+                                  start cell * 2, plus 1 if vertical
+    shots                         one value per shot, the cell fired at;
+                                  the player fires first and turns alternate
+
+Every value has the same width: 1 byte on boards up to 10x10, then 2 or 4.
+The second file, with ".idx" added to the name, holds one u64 per game: the
+offset where that game's record ends. With both memory-mapped, any game or
+any turn within it is found without reading anything else, and turn counts
+come from the index alone. All integers are little-endian.
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+MAGIC = b"BSHR"
+VERSION = 1
+HEADER = struct.Struct("<4sBBHH")
+TYPECODES = {1: "B", 2: "H", 4: "I"}
+
+
+def value_width(board_size):
+    """Bytes per value: enough for a placement (start cell * 2 + direction)"""
+    for width in (1, 2, 4):
+        if 2 * board_size * board_size <= 1 << (8 * width):
+            return width
+    raise ValueError(f"Board too large to record: {board_size}x{board_size}")
+
+
+def pack(values, width):
+    data = array(TYPECODES[width], values)
+    if sys.byteorder == "big":
+        data.byteswap()
+    return data.tobytes()
+
+
+def encode_fleet(board, fleet, size):
+    """Placement values for the ships on a board, in fleet order"""
+    values = []
+    for name in fleet:
+        cells = board.ship_cells[board.ship_ids[name]]
+        vertical = len(cells) > 1 and cells[1] - cells[0] != 1
+        values.append(cells[0] * 2 + vertical)
+    return values
+
+
+def decode_fleet(values, size):
+    """[(row, col, direction)] for placement values"""
+    layout = []
+    for value in values:
+        row, col = divmod(value >> 1, size)
+        layout.append((row, col, "V" if value & 1 else "H"))
+    return layout
+
+
+class GameRecorder:
+    """Builds one game's record as it's played and hands it to sink when it ends.
+
+    The engine calls start(engine) once both fleets are placed, shot(cell)
+    for every shot, and finish() at game over. A game restarted before it
+    finishes is dropped.
+    """
+    def __init__(self, board_size, fleet, sink):
+        self.board_size = board_size
+        self.fleet = list(fleet)
+        self.width = value_width(board_size)
+        self.sink = sink
+        self.values = None
+
+    def start(self, engine):
+        self.values = (encode_fleet(engine.player_board, self.fleet, self.board_size) +
+                       encode_fleet(engine.computer_board, self.fleet, self.board_size))
+
+    def shot(self, cell):
+        if self.values is not None:
+            self.values.append(cell)
+
+    def abandon(self):
+        """Drop the game in progress without writing it"""
+        self.values = None
+
+    def finish(self):
+        if self.values is not None:
+            self.sink(pack(self.values, self.width))
+            self.values = None
+
+
+class ArchiveWriter:
+    """Appends finished games to an archive, creating it if needed"""
+    def __init__(self, path, board_size, fleet):
+        self.path = path
+        self.board_size = board_size
+        self.fleet = dict(fleet)
+        self.width = value_width(board_size)
+        lengths = list(self.fleet.values())
+        names = "\n".join(self.fleet).encode()
+        header = (HEADER.pack(MAGIC, VERSION, self.width, board_size, len(lengths)) + bytes(lengths) +
+                  struct.pack("<H", len(names)) + names)
+
+        index_path = path + ".idx"
+        if os.path.exists(path) and os.path.getsize(path):
+            with open(path, "rb") as f:
+                if f.read(len(header)) != header:
+                    raise ValueError(f"{path} holds games for a different board size or fleet")
+            # Drop anything a crash left half written: index entries past the
+            # end of the data, then data past the last indexed game
+            ends = array("Q")
+            if os.path.exists(index_path):
+                with open(index_path, "rb") as f:
+                    ends.frombytes(f.read()[: os.path.getsize(index_path) // 8 * 8])
+            data_size = os.path.getsize(path)
+            while ends and ends[-1] > data_size:
+                ends.pop()
+            self.end = ends[-1] if ends else len(header)
+            with open(path, "r+b") as f:
+                f.truncate(self.end)
+            with open(index_path, "wb") as f:
+                ends.tofile(f)
+            self.data = open(path, "ab")
+        else:
+            self.data = open(path, "wb")
+            self.data.write(header)
+            self.end = len(header)
+        self.index = open(index_path, "ab")
+        self.games = 0
+
+    def recorder(self):
+        """A GameRecorder that writes its games here"""
+        return GameRecorder(self.board_size, self.fleet, self.add)
+
+    def add(self, record):
+        """Append one packed game record"""
+        self.data.write(record)
+        self.end += len(record)
+        self.index.write(struct.pack("<Q", self.end))
+        self.games += 1
+
+    def close(self):
+        self.data.close()
+        self.index.close()
+
+
+class GameArchive:
+    """Memory-mapped reader for an archive written by ArchiveWriter"""
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            magic, version, self.width, self.board_size, ships = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a Battleship game archive")
+            lengths = list(f.read(ships))
+            names = f.read(struct.unpack("<H", f.read(2))[0]).decode().split("\n")
+            self.header_size = f.tell()
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.fleet = dict(zip(names, lengths))
+        self.lengths = lengths
+        self.typecode = TYPECODES[self.width]
+
+        self.index = None
+        self.ends = memoryview(b"").cast("Q")
+        if os.path.exists(path + ".idx") and os.path.getsize(path + ".idx") >= 8:
+            with open(path + ".idx", "rb") as f:
+                self.index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            count = len(self.index) // 8
+            self.ends = memoryview(self.index)[: count * 8].cast("Q")
+            if sys.byteorder == "big":
+                self.ends = array("Q", self.ends)
+                self.ends.byteswap()
+
+    def __len__(self):
+        return len(self.ends)
+
+    def span(self, game):
+        """(start, end) byte offsets of a game's record"""
+        start = self.ends[game - 1] if game else self.header_size
+        return start, self.ends[game]
+
+    def values(self, game):
+        """All of a game's values, as a memoryview into the mapped file"""
+        start, end = self.span(game)
+        view = memoryview(self.data)[start:end].cast(self.typecode)
+        if sys.byteorder == "big":
+            view = array(self.typecode, view)
+            view.byteswap()
+        return view
+
+    def turns(self, game):
+        """Shots fired in a game, from the index alone"""
+        start, end = self.span(game)
+        return (end - start) // self.width - 2 * len(self.lengths)
+
+    def game(self, game):
+        """(player layout, computer layout, shots) where layouts are [(row, col, direction)]"""
+        values = self.values(game)
+        ships = len(self.lengths)
+        return (
+            decode_fleet(values[:ships], self.board_size),
+            decode_fleet(values[ships:2 * ships], self.board_size),
+            values[2 * ships:],
+        )
+
+    def shot(self, game, turn):
+        """The cell fired at on one turn of one game"""
+        start, _ = self.span(game)
+        offset = start + (2 * len(self.lengths) + turn) * self.width
+        return int.from_bytes(self.data[offset:offset + self.width], "little")
+
+    def close(self):
+        if isinstance(self.ends, memoryview):
+            self.ends.release()
+        if self.index is not None:
+            self.index.close()
+        self.data.close()
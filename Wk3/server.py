@@ -0,0 +1,320 @@
+"""Asyncio server hosting networked Battleship matches over TCP.
+
+Clients play either the server's computer opponent or each other. The
+protocol is one line of space-separated words per message; rows and
+columns count from 0 and ships are numbered in fleet order.
+
+    server -> client
+        WELCOME <size> <length,length,...>   on connecting
+        WAIT                                 queued for a human opponent
+        MATCH ai|pvp                         matched: send your fleet
+        TURN                                 your move
+        RESULT <row> <col> MISS              your shot missed
+        RESULT <row> <col> SUNK <ship> <row> <col> H|V
+                                             your shot sank this ship
+        SHOT <row> <col> MISS|SUNK [<ship>]  your opponent fired at you
+        OVER WIN|LOSE [FORFEIT]              the match is over
+        ERR <reason>                         the last command was refused
+
+    client -> server
+        PLAY ai|pvp                          join a match
+        FLEET RANDOM                         place the fleet at random
+        FLEET <row> <col> H|V ...            or one placement per ship
+        FIRE <row> <col>
+        QUIT
+
+After OVER the client can send PLAY again for another match. Rules come
+from BattleshipEngine: in a match the first player takes the engine's
+player side and the second, human or computer, the computer side. AI
+moves run on a thread pool, and Monte Carlo sampling in worker processes,
+so a slow opponent never stalls the event loop.
+Run from the Wk3 folder:
+
+    python server.py --port 8765 --ai density
+"""
+import argparse
+import asyncio
+import os
+import random
+import signal
+from concurrent.futures import ThreadPoolExecutor
+
+from battleship_engine import BOARD_SIZE, BattleshipEngine, make_fleet, ships
+from board import make_board
+
+DEFAULT_PORT = 8765
+BACKLOG = 1024  # pending connections, for load tests that connect thousands of clients at once
+
+
+class Connection:
+    """One client and the match it's in, if any.
+
+    Lines sent while handling one command go out together in a single write.
+    """
+    def __init__(self, writer):
+        self.writer = writer
+        self.match = None
+        self.side = 0
+        self.pending = []
+
+    def send(self, line):
+        if not self.pending:
+            asyncio.get_running_loop().call_soon(self.flush)
+        self.pending.append(line)
+
+    def flush(self):
+        if not self.writer.is_closing():
+            self.writer.write("".join(line + "\n" for line in self.pending).encode())
+        self.pending = []
+
+
+class Match:
+    """A game between two sides; side 1 is None when it's the server's AI"""
+    def __init__(self, server, seats):
+        self.server = server
+        self.seats = seats
+        self.vs_ai = seats[1] is None
+        self.engine = BattleshipEngine(seed=server.rng.getrandbits(64),
+                                       computer_ai=server.computer_ai if self.vs_ai else "random",
+                                       board_size=server.board_size, fleet=server.fleet)
+        if not self.vs_ai:
+            self.engine.new_boards()  # Both fleets come from the players
+        elif hasattr(self.engine.computer_ai, "inline"):
+            from ai import get_pool
+            # Pure-Python sampling in an executor thread holds the GIL and stalls the event loop
+            # (on one CPU, for its whole budget), so even a single worker samples in a process,
+            # with a process per AI thread so concurrent moves don't queue for the pool
+            self.engine.computer_ai.inline = False
+            get_pool(server.ai_threads)
+        self.ai_task = None
+        self.ship_numbers = {name: number for number, name in enumerate(server.fleet)}
+        self.placed = [False, self.vs_ai]
+        self.turn = 0
+        self.over = False
+        for side, seat in enumerate(seats):
+            if seat:
+                seat.match = self
+                seat.side = side
+                seat.send(f"MATCH {'ai' if self.vs_ai else 'pvp'}")
+
+    def send(self, side, line):
+        if self.seats[side]:
+            self.seats[side].send(line)
+
+    def boards(self, side):
+        """(the side's own board, the board it fires at)"""
+        if side == 0:
+            return self.engine.player_board, self.engine.computer_board
+        return self.engine.computer_board, self.engine.player_board
+
+    def place(self, side, words):
+        """FLEET: check a whole layout and place it, or place one at random"""
+        if self.placed[side]:
+            raise ValueError("Fleet already placed")
+        engine = self.engine
+        board = make_board(engine.board_size)
+        ship_dict = {}
+        if words == ["RANDOM"]:
+            engine.place_random_ships(board, ship_dict)
+        else:
+            if len(words) != 3 * len(engine.fleet):
+                raise ValueError(f"Expected a row, column and H or V for each of {len(engine.fleet)} ships")
+            for number, (ship_name, length) in enumerate(engine.fleet.items()):
+                row, col = read_cell(words[3 * number:3 * number + 2])
+                direction = words[3 * number + 2].upper()
+                if direction not in ("H", "V") or not engine.is_valid_placement(board, row, col, length, direction):
+                    raise ValueError(f"Ship {number} doesn't fit at {row} {col} {direction}")
+                engine.place_ship(board, ship_dict, ship_name, row, col, length, direction)
+
+        if side == 0:
+            engine.player_board, engine.player_ships = board, ship_dict
+        else:
+            engine.computer_board, engine.computer_ships = board, ship_dict
+        self.placed[side] = True
+        if all(self.placed):
+            engine.start_game()
+            self.send(self.turn, "TURN")
+
+    async def fire(self, side, row, col):
+        """FIRE: the side's shot, then the AI's reply in an AI match"""
+        if self.engine.game_state != "PLAYING":
+            raise ValueError("The match hasn't started")
+        if self.turn != side:
+            raise ValueError("Not your turn")
+        size = self.engine.board_size
+        if not (0 <= row < size and 0 <= col < size):
+            raise ValueError("Off the board")
+        if self.boards(side)[1].is_attacked(row, col):
+            raise ValueError("Already fired there")
+
+        self.shoot(side, row * size + col)
+        if self.vs_ai and not self.over:
+            if self.engine.computer_ai.slow:
+                # Sampling opponents take milliseconds a move; keep them off the event loop, and
+                # let handle() go on reading so a disconnect while the AI thinks ends the match
+                self.ai_task = asyncio.create_task(self.computer_move())
+            else:
+                self.shoot(1, self.engine.computer_ai.choose(self.engine.rng))
+
+    async def computer_move(self):
+        engine = self.engine
+        loop = asyncio.get_running_loop()
+        cell = await loop.run_in_executor(self.server.executor, engine.computer_ai.choose, engine.rng)
+        if self.over:
+            return  # The player left while the AI was thinking
+        self.shoot(1, cell)
+
+    def shoot(self, side, cell):
+        """Fire for one side and tell both what happened"""
+        row, col = divmod(cell, self.engine.board_size)
+        if side == 0:
+            sunk = self.engine.attack(row, col)
+        else:
+            sunk = self.engine.computer_attack(cell)
+
+        if sunk:
+            target = self.boards(side)[1]
+            ship_id = target.cell_ship[cell]
+            ship_name = target.ship_names[ship_id]
+            cells = target.ship_cells[ship_id]
+            direction = "V" if len(cells) > 1 and cells[1] - cells[0] != 1 else "H"
+            start_row, start_col = divmod(cells[0], self.engine.board_size)
+            number = self.ship_numbers[ship_name]
+            self.send(side, f"RESULT {row} {col} SUNK {number} {start_row} {start_col} {direction}")
+            self.send(1 - side, f"SHOT {row} {col} SUNK {number}")
+        else:
+            self.send(side, f"RESULT {row} {col} MISS")
+            self.send(1 - side, f"SHOT {row} {col} MISS")
+
+        if self.engine.check_game_over():
+            winner = 0 if self.engine.winner == "player" else 1
+            self.send(winner, "OVER WIN")
+            self.send(1 - winner, "OVER LOSE")
+            self.end()
+        else:
+            self.turn = 1 - side
+            self.send(self.turn, "TURN")
+
+    def forfeit(self, side):
+        """The side disconnected: the other one wins"""
+        if not self.over:
+            self.send(1 - side, "OVER WIN FORFEIT")
+            self.end()
+
+    def end(self):
+        self.over = True
+        self.server.matches_finished += 1
+        for seat in self.seats:
+            if seat and seat.match is self:
+                seat.match = None
+
+
+def read_cell(words):
+    """(row, col) from two words"""
+    try:
+        return int(words[0]), int(words[1])
+    except (IndexError, ValueError):
+        raise ValueError("Expected a row and column") from None
+
+
+class GameServer:
+    """Matches clients up and runs their games; handle() serves one connection"""
+    def __init__(self, board_size=BOARD_SIZE, fleet=None, computer_ai="random", workers=None, seed=None):
+        self.board_size = board_size
+        self.fleet = ships if fleet is None else fleet
+        self.computer_ai = computer_ai
+        self.ai_threads = workers or min(32, (os.cpu_count() or 1) + 4)  # ThreadPoolExecutor's default
+        self.executor = ThreadPoolExecutor(max_workers=self.ai_threads)
+        self.rng = random.Random(seed)
+        self.waiting = None  # Connection waiting for a human opponent
+        self.connections = 0
+        self.matches_started = 0
+        self.matches_finished = 0
+
+    async def handle(self, reader, writer):
+        connection = Connection(writer)
+        self.connections += 1
+        lengths = ",".join(str(length) for length in self.fleet.values())
+        connection.send(f"WELCOME {self.board_size} {lengths}")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                words = line.decode(errors="replace").split()
+                if words and not await self.command(connection, words):
+                    break
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            if self.waiting is connection:
+                self.waiting = None
+            if connection.match:
+                connection.match.forfeit(connection.side)
+            writer.close()
+
+    async def command(self, connection, words):
+        """Act on one line from a client; False when it's leaving"""
+        command = words[0].upper()
+        match = connection.match
+        try:
+            if command == "QUIT":
+                return False
+            elif command == "PLAY":
+                self.play(connection, words[1:])
+            elif match is None:
+                raise ValueError("Not in a match: send PLAY ai or PLAY pvp")
+            elif command == "FLEET":
+                match.place(connection.side, [word.upper() for word in words[1:]])
+            elif command == "FIRE":
+                await match.fire(connection.side, *read_cell(words[1:]))
+            else:
+                raise ValueError(f"Unknown command {command}")
+        except ValueError as error:
+            connection.send(f"ERR {error}")
+        return True
+
+    def play(self, connection, words):
+        mode = words[0].lower() if words else "ai"
+        if connection.match or self.waiting is connection:
+            raise ValueError("Already in a match")
+        if mode == "ai":
+            Match(self, [connection, None])
+        elif mode == "pvp":
+            if self.waiting is None:
+                self.waiting = connection
+                connection.send("WAIT")
+                return
+            opponent, self.waiting = self.waiting, None
+            Match(self, [opponent, connection])
+        else:
+            raise ValueError(f"Unknown mode {mode}: ai or pvp")
+        self.matches_started += 1
+
+    async def serve(self, host="127.0.0.1", port=DEFAULT_PORT):
+        server = await asyncio.start_server(self.handle, host, port, backlog=BACKLOG)
+        # Only once it's listening, since load tests start connecting when they see this
+        print(f"Serving Battleship on {host}:{port}", flush=True)
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Host Battleship matches over TCP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--ai", default="random", help="computer opponent: random, density or montecarlo")
+    parser.add_argument("--workers", type=int, help="threads for computer moves (default: Python's choice)")
+    parser.add_argument("--size", type=int, default=BOARD_SIZE, help="board width and height")
+    parser.add_argument("--fleet", help="comma-separated ship lengths, e.g. 5,4,3,3,2")
+    args = parser.parse_args()
+    fleet = make_fleet(int(length) for length in args.fleet.split(",")) if args.fleet else None
+    server = GameServer(args.size, fleet, args.ai, args.workers)
+    # Stop on SIGTERM as on Ctrl-C, so exit handlers shut down the AI's sampling processes
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,114 @@
+"""Headless computer-vs-computer simulation.
+
+Plays games with BattleshipEngine (no window, no input) and spreads them
+across a process pool, e.g.:
+
+    python simulate.py --games 1000000 --workers 8
+    python simulate.py --games 100 --size 1000 --fleet 5,4,4,3,3,2
+    python simulate.py --games 1000000 --record games.bshr
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from battleship_engine import BOARD_SIZE, BattleshipEngine, make_fleet, ships
+from records import ArchiveWriter, GameRecorder
+
+
+def run_games(n_games, seed, computer_ai="random", board_size=BOARD_SIZE, fleet=None, record=False):
+    """Play n_games back to back and return the tally for this chunk.
+
+    With record, the packed game records come back too, under "records".
+    """
+    result = {"games": 0, "player_wins": 0, "computer_wins": 0, "turns": 0}
+    records = []
+    recorder = GameRecorder(board_size, ships if fleet is None else fleet, records.append) if record else None
+    for i in range(n_games):
+        # Each game gets its own seed so any chunk can be replayed exactly
+        game = BattleshipEngine(seed=seed * 1_000_003 + i, computer_ai=computer_ai,
+                                board_size=board_size, fleet=fleet, recorder=recorder)
+        if hasattr(game.computer_ai, "workers"):
+            game.computer_ai.workers = 1  # Already one chunk per core; no pool inside the pool
+        winner, turns = game.play_auto_game()
+        result["games"] += 1
+        result["turns"] += turns
+        if winner == "player":
+            result["player_wins"] += 1
+        else:
+            result["computer_wins"] += 1
+    if record:
+        result["records"] = records
+    return result
+
+
+def merge(total, results, writer=None):
+    """Add each chunk's counters into total, and its games to the archive if there is one"""
+    for result in results:
+        for key in total:
+            total[key] += result[key]
+        if writer:
+            for record in result["records"]:
+                writer.add(record)
+
+
+def simulate(n_games, workers=None, chunk_size=10_000, seed=0, computer_ai="random",
+             board_size=BOARD_SIZE, fleet=None, record_path=None):
+    """Run n_games across a process pool and return the merged tally.
+
+    With record_path, every game is appended to that archive (see records.py).
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = []
+    remaining = n_games
+    while remaining > 0:
+        chunks.append(min(chunk_size, remaining))
+        remaining -= chunks[-1]
+    seeds = [seed + i for i in range(len(chunks))]
+    ais = [computer_ai] * len(chunks)
+    sizes = [board_size] * len(chunks)
+    fleets = [fleet] * len(chunks)
+    records = [record_path is not None] * len(chunks)
+    writer = ArchiveWriter(record_path, board_size, ships if fleet is None else fleet) if record_path else None
+
+    total = {"games": 0, "player_wins": 0, "computer_wins": 0, "turns": 0}
+    start = time.perf_counter()
+    if workers == 1:
+        # Skip the pool entirely so single-core numbers carry no IPC cost
+        merge(total, map(run_games, chunks, seeds, ais, sizes, fleets, records), writer)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            merge(total, pool.map(run_games, chunks, seeds, ais, sizes, fleets, records), writer)
+    if writer:
+        writer.close()
+    total["seconds"] = time.perf_counter() - start
+    total["workers"] = workers
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run headless Battleship games")
+    parser.add_argument("--games", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk", type=int, default=10_000, help="games per pool task")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ai", default="random", help="computer opponent (the player side is always random)")
+    parser.add_argument("--size", type=int, default=BOARD_SIZE, help="board width and height")
+    parser.add_argument("--fleet", help="comma-separated ship lengths, e.g. 5,4,3,3,2")
+    parser.add_argument("--record", help="append every game to this archive file")
+    args = parser.parse_args()
+
+    fleet = make_fleet(int(length) for length in args.fleet.split(",")) if args.fleet else None
+    total = simulate(args.games, args.workers, args.chunk, args.seed, args.ai, args.size, fleet, args.record)
+    games_per_sec = total["games"] / total["seconds"]
+    print(f"Games played:      {total['games']}")
+    print(f"Player wins:       {total['player_wins']}")
+    print(f"Computer wins:     {total['computer_wins']}")
+    print(f"Mean turns:        {total['turns'] / total['games']:.2f}")
+    print(f"Elapsed:           {total['seconds']:.2f}s on {total['workers']} worker(s)")
+    print(f"Games/sec:         {games_per_sec:,.0f}")
+    print(f"Games/sec/core:    {games_per_sec / total['workers']:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""Bit-packed snapshots of a game in progress, for saving and resuming.
+
+Layout, all integers little-endian:
+
+    version (u8), flags (u8), board size (u16), ship count (u16),
+    player ships placed so far (u16)
+    player fleet     one value per ship, in fleet order: start cell * 2,
+                     plus 1 if vertical; ships not placed yet are 0
+    computer fleet   the same
+    sunk             one bit per ship, the player's fleet then the computer's
+    misses           shots that missed the player's board, then the
+                     computer's: a bitmap of every cell on bitboards, or a
+                     u32 count and one value per cell on sparse boards
+
+Values use the same width as game archives (records.value_width). Hits are
+not stored: a hit always sinks the whole ship, so they follow from the sunk
+bits. A 10x10 game with the standard fleet packs into 46 bytes, and on
+bitboards every snapshot for a given board size and fleet is the same
+length, which SnapshotStore uses to keep one fixed-size slot per session.
+"""
+import os
+import struct
+import sys
+from array import array
+
+from board import SPARSE_MIN_SIZE, SparseBoard, mask_cells
+from records import TYPECODES, pack, value_width
+
+VERSION = 1
+HEADER = struct.Struct("<BBHHH")
+GAME_STATES = ["SETUP", "PLAYING", "GAME_OVER"]
+WINNERS = [None, "player", "computer"]
+
+
+def unpack_values(data, width):
+    values = array(TYPECODES[width])
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def bitmap_bytes(size):
+    return (size * size + 7) // 8
+
+
+def snapshot_size(size, fleet):
+    """Length of every snapshot of a bitboard game with this size and fleet"""
+    ships = len(fleet)
+    return HEADER.size + 2 * ships * value_width(size) + (2 * ships + 7) // 8 + 2 * bitmap_bytes(size)
+
+
+def fleet_values(board, fleet, size):
+    """Placement values in fleet order, 0 for ships not on the board"""
+    values = []
+    for name in fleet:
+        if name in board.ship_ids:
+            cells = board.ship_cells[board.ship_ids[name]]
+            vertical = len(cells) > 1 and cells[1] - cells[0] != 1
+            values.append(cells[0] * 2 + vertical)
+        else:
+            values.append(0)
+    return values
+
+
+def pack_misses(board, width):
+    if isinstance(board, SparseBoard):
+        cells = sorted(board.misses)
+        return struct.pack("<I", len(cells)) + pack(cells, width)
+    return board.misses.to_bytes(bitmap_bytes(board.size), "little")
+
+
+def pack_snapshot(size, fleet, player_board, computer_board, game_state="PLAYING", player_turn=True,
+                  direction="H", winner=None):
+    """Snapshot of both boards and the turn state, as bytes"""
+    width = value_width(size)
+    placed = sum(1 for name in fleet if name in player_board.ship_ids)
+    flags = (GAME_STATES.index(game_state) | player_turn << 2 | (direction == "V") << 3 |
+             WINNERS.index(winner) << 4)
+
+    sunk = 0
+    for side, board in enumerate((player_board, computer_board)):
+        for number, name in enumerate(fleet):
+            if name in board.ship_ids and board.is_ship_sunk(name):
+                sunk |= 1 << (side * len(fleet) + number)
+
+    return b"".join([
+        HEADER.pack(VERSION, flags, size, len(fleet), placed),
+        pack(fleet_values(player_board, fleet, size) + fleet_values(computer_board, fleet, size), width),
+        sunk.to_bytes((2 * len(fleet) + 7) // 8, "little"),
+        pack_misses(player_board, width),
+        pack_misses(computer_board, width),
+    ])
+
+
+def unpack_snapshot(data, size, fleet):
+    """Decode a snapshot into a dict of layouts, sunk ship names, misses and turn state.
+
+    Raises ValueError for a snapshot of another game, or one cut short or too long.
+    """
+    if len(data) < HEADER.size:
+        raise ValueError(f"Snapshot is {len(data)} bytes, too short for its header")
+    version, flags, snapshot_board, ships, placed = HEADER.unpack_from(data)
+    if version != VERSION:
+        raise ValueError(f"Unknown snapshot version {version}")
+    if snapshot_board != size or ships != len(fleet):
+        raise ValueError(f"Snapshot is for a {snapshot_board}x{snapshot_board} board with {ships} ships")
+    if size < SPARSE_MIN_SIZE and len(data) != snapshot_size(size, fleet):
+        raise ValueError(f"Snapshot is {len(data)} bytes, expected {snapshot_size(size, fleet)}")
+
+    width = value_width(size)
+    names = list(fleet)
+    offset = HEADER.size
+    values = unpack_values(data[offset:offset + 2 * ships * width], width)
+    offset += 2 * ships * width
+    sunk_size = (2 * ships + 7) // 8
+    sunk = int.from_bytes(data[offset:offset + sunk_size], "little")
+    offset += sunk_size
+
+    misses = []
+    for _ in range(2):
+        if size >= SPARSE_MIN_SIZE:
+            if offset + 4 > len(data):
+                raise ValueError("Snapshot is cut short")
+            count = struct.unpack_from("<I", data, offset)[0]
+            offset += 4
+            if offset + count * width > len(data):
+                raise ValueError("Snapshot is cut short")
+            misses.append(set(unpack_values(data[offset:offset + count * width], width)))
+            offset += count * width
+        else:
+            misses.append(int.from_bytes(data[offset:offset + bitmap_bytes(size)], "little"))
+            offset += bitmap_bytes(size)
+    if offset != len(data):
+        raise ValueError(f"Snapshot has {len(data) - offset} bytes left over")
+
+    def layout(values):
+        return [(*divmod(value >> 1, size), "V" if value & 1 else "H") for value in values]
+
+    return {
+        "player_layout": layout(values[:placed]),
+        "computer_layout": layout(values[ships:]),
+        "player_sunk": [name for number, name in enumerate(names) if sunk >> number & 1],
+        "computer_sunk": [name for number, name in enumerate(names) if sunk >> (ships + number) & 1],
+        "player_misses": misses[0],
+        "computer_misses": misses[1],
+        "game_state": GAME_STATES[flags & 3],
+        "player_turn": bool(flags >> 2 & 1),
+        "direction": "V" if flags >> 3 & 1 else "H",
+        "winner": WINNERS[flags >> 4 & 3],
+    }
+
+
+def restore_side(board, ship_dict, fleet, layout, sunk, misses, place_ship, attack_board=None):
+    """Rebuild one fleet's board from a snapshot and return the cells shot at it.
+
+    place_ship is the game's own place_ship(board, ship_dict, name, row, col,
+    length, direction). attack_board, if given, is the opponent's record of
+    its shots on this board and gets the same hits and misses.
+    """
+    for (name, length), (row, col, direction) in zip(fleet.items(), layout):
+        place_ship(board, ship_dict, name, row, col, length, direction)
+    shot = []
+    for name in sunk:
+        cells = board.ship_cells[board.ship_ids[name]]
+        board.attack(*divmod(cells[0], board.size))
+        shot.extend(cells)
+        if attack_board is not None:
+            attack_board.mark_hit(board.ship_masks[name])
+    board.mark_misses(misses)
+    if attack_board is not None:
+        attack_board.mark_misses(misses)
+    shot.extend(misses if isinstance(misses, set) else mask_cells(misses))
+    return shot
+
+
+class SnapshotStore:
+    """One file of fixed-size snapshot slots, one per session, for bitboard games.
+
+    Saving or loading a session is a single seek and a write or read of
+    snapshot_size bytes, however many sessions the file holds.
+    """
+    def __init__(self, path, size, fleet):
+        if size >= SPARSE_MIN_SIZE:
+            raise ValueError("Sparse boards have variable-size snapshots")
+        self.slot_size = snapshot_size(size, fleet)
+        mode = "r+b" if os.path.exists(path) else "w+b"
+        self.file = open(path, mode)
+
+    def save(self, session, data):
+        if len(data) != self.slot_size:
+            raise ValueError(f"Snapshot is {len(data)} bytes, slots are {self.slot_size}")
+        self.file.seek(session * self.slot_size)
+        self.file.write(data)
+
+    def load(self, session):
+        """The session's snapshot, or None if it was never saved"""
+        self.file.seek(session * self.slot_size)
+        data = self.file.read(self.slot_size)
+        if len(data) < self.slot_size or data[0] == 0:
+            return None  # Past the end, or a gap left by a later session
+        return data
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
@@ -0,0 +1,106 @@
+"""Computer strategies: where a side puts its fleet and where it fires.
+
+A strategy is built for one game as Strategy(size, lengths), with the ship
+lengths in fleet order, and the engine calls:
+
+    place_fleet(rng)                 [(row, col, direction)] for the fleet, in order
+    choose(rng)                      the next cell index (row * size + col) to fire at
+    observe(cell, sunk_cells=None)   a shot's result: None for a miss, or the
+                                     cells of the ship that went down
+    think(rng, stop)                 choose() run ahead of time on another thread,
+                                     free to keep improving its pick until stop
+                                     (a threading.Event) is set
+
+and after every observe() sets strategy.position to the Zobrist hash
+(Board.zobrist) of the board it fires at, for strategies that cache work
+by position.
+
+Subclass Strategy and override either half. Strategy places ships
+uniformly at random and RandomStrategy also fires at random; the smarter
+shooters in ai.py need NumPy.
+"""
+from board import CellPool, make_board
+
+PLACEMENT_ATTEMPTS = 100  # layouts ApartStrategy tries before settling for touching ships
+
+
+class Strategy:
+    slow = False  # choose() can take milliseconds, so servers run it off their event loop
+    position = 0  # Board.zobrist of the board fired at, set by the engine; 0 before any shot
+
+    def __init__(self, size, lengths):
+        self.size = size
+        self.fleet_lengths = list(lengths)
+
+    def place_fleet(self, rng):
+        """A uniformly random legal layout"""
+        index = make_board(self.size).placement_index()
+        return [index.choose(length, rng) for length in self.fleet_lengths]
+
+    def choose(self, rng):
+        raise NotImplementedError
+
+    def think(self, rng, stop):
+        """Same as choose() unless a strategy can use the extra time"""
+        return self.choose(rng)
+
+    def observe(self, cell, sunk_cells=None):
+        pass
+
+
+class RandomStrategy(Strategy):
+    """Fires at a random cell it hasn't fired at yet"""
+    def __init__(self, size, lengths):
+        Strategy.__init__(self, size, lengths)
+        self.targets = CellPool(size)
+
+    def choose(self, rng):
+        return self.targets.pop_random(rng)
+
+    def observe(self, cell, sunk_cells=None):
+        # choose() already took the cell out, unless the shot came from elsewhere (a loaded game)
+        self.targets.discard(cell)
+        for sunk_cell in sunk_cells or ():
+            self.targets.discard(sunk_cell)
+
+
+class ApartStrategy(RandomStrategy):
+    """Fires at random, and places ships so that no two touch"""
+    def place_fleet(self, rng):
+        for _ in range(PLACEMENT_ATTEMPTS):
+            index = make_board(self.size).placement_index()
+            layout = []
+            try:
+                for length in self.fleet_lengths:
+                    row, col, direction = index.choose(length, rng)
+                    layout.append((row, col, direction))
+                    self.block_around(index, row, col, length, direction)
+            except ValueError:
+                continue  # Boxed in; start over
+            return layout
+        return Strategy.place_fleet(self, rng)
+
+    def block_around(self, index, row, col, length, direction):
+        """Mark the water next to a ship as taken in a placement index"""
+        rows = range(row - 1, row + (length if direction == "V" else 1) + 1)
+        cols = range(col - 1, col + (length if direction == "H" else 1) + 1)
+        cells = [r * self.size + c for r in rows for c in cols if 0 <= r < self.size and 0 <= c < self.size]
+        if isinstance(index.occupied, set):
+            index.occupied.update(cells)
+        else:
+            for cell in cells:
+                index.occupied |= 1 << cell
+
+
+STRATEGY_NAMES = ["random", "apart", "density", "montecarlo"]
+
+
+def make_strategy(name, size, lengths):
+    """Build a strategy by name, for one side of one game"""
+    if name == "random":
+        return RandomStrategy(size, lengths)
+    if name == "apart":
+        return ApartStrategy(size, lengths)
+    # Smarter opponents need NumPy, so only import them when asked for
+    from ai import make_ai
+    return make_ai(name, size, lengths)
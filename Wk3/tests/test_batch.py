@@ -0,0 +1,73 @@
+"""BatchGames.step against Board.attack, shot by shot. Run from the Wk3 folder:
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from batch import BatchGames
+from battleship_engine import ships
+from board import EMPTY, HIT, MISS, SHIP, make_board
+
+SLOTS = 300
+SHOTS = 150
+
+
+def boards_for(games):
+    """A Board per slot holding the same fleet as the batch"""
+    names = list(ships)
+    boards = []
+    for slot in games.ships:
+        board = make_board(games.size)
+        for number, length in enumerate(games.lengths):
+            rows, cols = np.nonzero(slot == number)
+            direction = "H" if rows[0] == rows[-1] else "V"
+            board.place_ship(names[number], int(rows[0]), int(cols[0]), length, direction)
+        boards.append(board)
+    return boards
+
+
+def batch_codes(games, slot):
+    codes = np.where(games.ships[slot] >= 0, SHIP, EMPTY)
+    codes[games.misses[slot]] = MISS
+    codes[games.hits[slot]] = HIT
+    return codes
+
+
+def test_step_matches_board_attack():
+    games = BatchGames(SLOTS, seed=7)
+    boards = boards_for(games)
+    names = list(ships)
+    rng = np.random.default_rng(8)
+    for _ in range(SHOTS):
+        # Any cell, so repeats and cells of ships already down get fired at too
+        cells = rng.integers(games.size * games.size, size=SLOTS)
+        sunk, finished = games.step(cells)
+        for slot, board in enumerate(boards):
+            result, ship_name = board.attack(*divmod(int(cells[slot]), games.size))
+            expected = names.index(ship_name) if result == "sunk" else -1
+            assert sunk[slot] == expected
+            assert finished[slot] == (board.ships_afloat == 0)
+            assert games.ships_afloat[slot] == board.ships_afloat
+    assert finished.any()
+    for slot, board in enumerate(boards):
+        cells = [[board.cell(row, col) for col in range(games.size)] for row in range(games.size)]
+        assert (batch_codes(games, slot) == np.array(cells)).all()
+
+
+def test_random_targets_never_repeat():
+    games = BatchGames(SLOTS, seed=9)
+    shots = []
+    while games.rows.size:
+        cells = games.random_targets()
+        assert not (games.hit_cells | games.miss_cells)[games.rows, cells].any()
+        _, finished = games.step(cells)
+        shots.append(games.retire(finished, replace=0))
+    shots = np.concatenate(shots)
+    # Every fleet went down, with no shot wasted on a cell already fired at
+    assert len(shots) == SLOTS
+    assert shots.max() <= games.size * games.size
@@ -0,0 +1,47 @@
+"""Snapshots round-trip, and damaged ones are rejected with ValueError. Run from the Wk3 folder:
+
+    python -m pytest tests
+"""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from battleship_engine import BattleshipEngine, make_fleet
+
+
+def game_in_progress(size, fleet):
+    game = BattleshipEngine(seed=size, board_size=size, fleet=fleet)
+    game.place_random_ships(game.player_board, game.player_ships)
+    game.start_game()
+    rng = random.Random(size)
+    for _ in range(40):
+        game.attack(*divmod(rng.randrange(size * size), size))
+        game.computer_attack()
+    return game
+
+
+SIZES = [(10, None), (80, make_fleet([5, 4, 3, 3, 2] * 4))]
+
+
+@pytest.mark.parametrize("size, fleet", SIZES)
+def test_snapshot_round_trip(size, fleet):
+    game = game_in_progress(size, fleet)
+    data = game.snapshot()
+    restored = BattleshipEngine(seed=0, board_size=size, fleet=fleet)
+    restored.restore(data)
+    assert restored.snapshot() == data
+    assert restored.player_board.ships_afloat == game.player_board.ships_afloat
+    assert restored.computer_board.ships_afloat == game.computer_board.ships_afloat
+
+
+@pytest.mark.parametrize("size, fleet", SIZES)
+def test_damaged_snapshot_rejected(size, fleet):
+    data = game_in_progress(size, fleet).snapshot()
+    restored = BattleshipEngine(seed=0, board_size=size, fleet=fleet)
+    for damaged in (b"", data[:3], data[:10], data[:-5], data[:-1], data + b"\0"):
+        with pytest.raises(ValueError):
+            restored.restore(damaged)
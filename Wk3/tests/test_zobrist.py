@@ -0,0 +1,111 @@
+"""Zobrist hashes kept shot by shot against a from-scratch recomputation, and the evaluation cache.
+Run from the Wk3 folder:
+
+    python -m pytest tests
+"""
+import os
+import random
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from ai import MonteCarloAI
+from battleship_engine import BattleshipEngine, make_fleet
+from board import mask_cells
+from zobrist import ENTRY_OVERHEAD, EvalCache, shots_hash
+
+
+def cells(layer):
+    return layer if isinstance(layer, set) else mask_cells(layer)
+
+
+def recomputed(board):
+    return shots_hash(board.size, cells(board.misses), cells(board.hits))
+
+
+def random_target(board, rng):
+    """A ship cell half the time, so ships go down; repeats and cells of sunk ships included"""
+    if rng.random() < 0.5:
+        return rng.choice(board.ship_cells[rng.randrange(len(board.ship_cells))])
+    return rng.randrange(board.size * board.size)
+
+
+@pytest.mark.parametrize("size, fleet", [(10, None), (80, make_fleet([5, 4, 3, 3, 2] * 4))])
+def test_board_hash_matches_recomputation(size, fleet):
+    rng = random.Random(size)
+    game = BattleshipEngine(seed=size, board_size=size, fleet=fleet)
+    game.place_random_ships(game.player_board, game.player_ships)
+    game.start_game()
+    boards = (game.player_board, game.computer_board, game.player_attack_board)
+    for _ in range(200):
+        game.attack(*divmod(random_target(game.computer_board, rng), size))
+        game.computer_attack(random_target(game.player_board, rng))
+        for board in boards:
+            assert board.zobrist == recomputed(board)
+    assert game.player_board.zobrist == game.computer_ai.position
+    assert game.computer_board.ships_afloat < len(game.fleet)
+
+    restored = BattleshipEngine(seed=0, board_size=size, fleet=fleet)
+    restored.restore(game.snapshot())
+    # Recomputed rather than compared with the old boards: a snapshot drops shots at ships already down
+    for board in (restored.player_board, restored.computer_board, restored.player_attack_board):
+        assert board.zobrist == recomputed(board)
+    assert restored.computer_ai.position == restored.player_board.zobrist
+    assert restored.player_ai.position == restored.computer_board.zobrist
+
+
+def test_montecarlo_cache_keyed_by_board_hash():
+    cache = EvalCache()
+    for _ in range(2):
+        game = BattleshipEngine(seed=5)
+        game.computer_ai = MonteCarloAI(game.board_size, game.fleet.values(), budget=0.002, workers=1, cache=cache)
+        game.place_random_ships(game.player_board, game.player_ships)
+        game.start_game()
+        for _ in range(10):
+            game.computer_attack()
+            assert game.computer_ai.position == game.player_board.zobrist
+            assert game.computer_ai.cache_key()[1] == game.player_board.zobrist
+    # The second game's positions start out the same as the first's
+    assert cache.hits >= 1
+
+
+def test_cache_evicts_least_recently_used():
+    entry = sys.getsizeof(1000) + ENTRY_OVERHEAD
+    cache = EvalCache(max_bytes=3 * entry)
+    for key in range(3):
+        cache.put(key, 1000 + key)
+    cache.get(0)
+    cache.put(3, 1003)
+    assert cache.get(1) is None
+    assert cache.get(0) == 1000
+    assert cache.stats()["evictions"] == 1
+    assert cache.bytes == 3 * entry
+
+
+def test_cache_shared_between_threads():
+    entry = sys.getsizeof(1000) + ENTRY_OVERHEAD
+    cache = EvalCache(max_bytes=20 * entry)
+    errors = []
+
+    def work(seed):
+        rng = random.Random(seed)
+        try:
+            for _ in range(20_000):
+                key = rng.randrange(40)
+                if rng.random() < 0.5:
+                    cache.get(key)
+                else:
+                    cache.put(key, 1000 + key)
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=work, args=(seed,)) for seed in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert cache.bytes == len(cache) * entry <= cache.max_bytes
@@ -1,12 +1,19 @@
+import argparse
+import os
 import random
+import sys
+
+from board import Board
+from snapshot import pack_snapshot, restore_side, unpack_snapshot
+from strategies import make_strategy
 
 # Battleship Game
-print("Welcome to Battleship!")
 
 # Game constants
 BOARD_SIZE = 10
 row_labels = ["A", "B", "C", "D", "E", "F", "G", "H", "I", "J"]
 row_to_num = {label: i for i, label in enumerate(row_labels)}
+SAVE_FILE = "battleship_console.sav"  # Apart from the pygame version's battleship.sav
 
 # Ship definitions
 ships = {
@@ -17,257 +24,422 @@ ships = {
     "Carrier": 5
 }
 
+# Screen layout: two boards side by side, a few message lines, then the prompt
+CELL_CHARS = ".SXO"  # By Board.cell code: empty, ship, hit, miss
+PANEL_WIDTH = 2 + 2 * BOARD_SIZE + 6
+MESSAGE_ROW = 3 + BOARD_SIZE + 1
+MESSAGE_LINES = 4
+PROMPT_ROW = MESSAGE_ROW + MESSAGE_LINES + 1
+
+# ANSI escapes
+CLEAR_SCREEN = "\x1b[2J"
+ERASE_LINE = "\x1b[K"
+
+
+def move_to(row, col):
+    """ANSI cursor move; rows and columns count from 1"""
+    return f"\x1b[{row};{col}H"
+
+
+def parse_coord(text):
+    """(row, col) for a coordinate like A1; raises ValueError with the message to show"""
+    text = text.strip().upper()
+    if len(text) < 2:
+        raise ValueError("Invalid coordinate format")
+    row_letter = text[0]
+    try:
+        col = int(text[1:]) - 1
+    except ValueError:
+        raise ValueError("Invalid input. Please try again.")
+    if row_letter not in row_to_num or col < 0 or col >= BOARD_SIZE:
+        raise ValueError("Invalid coordinate")
+    return row_to_num[row_letter], col
+
+
+class Screen:
+    """Terminal output for the console game, written once per frame.
+    
+    On a terminal the boards stay in place and each frame only rewrites the
+    cells and message lines that changed, with ANSI cursor moves. Piped
+    output (or --plain) gets the new messages and, when a board changed,
+    the whole frame as plain text instead.
+    """
+    def __init__(self, out=None, ansi=None):
+        self.out = out or sys.stdout
+        self.ansi = self.out.isatty() if ansi is None else ansi
+        
+        # (screen row, column) -> text, for the next frame and for what's drawn now
+        self.segments = {}
+        self.on_screen = {}
+        
+        self.messages = []  # The last MESSAGE_LINES status lines
+        self.unprinted = []  # Messages plain mode hasn't written yet
+        
+    def show(self, panels):
+        """Lay out boards side by side for the next frame: [(title, board, show_ships)]"""
+        header = "  " + "".join(f"{i:2}" for i in range(1, BOARD_SIZE + 1))
+        segments = {}
+        for number, (title, board, show_ships) in enumerate(panels):
+            left = 1 + number * PANEL_WIDTH
+            segments[(1, left)] = title
+            segments[(2, left)] = header
+            for i, row_label in enumerate(row_labels):
+                segments[(3 + i, left)] = row_label
+                for j in range(BOARD_SIZE):
+                    cell = board.cell(i, j)
+                    segments[(3 + i, left + 3 + 2 * j)] = "." if cell == 1 and not show_ships else CELL_CHARS[cell]
+        self.segments = segments
+        
+    def message(self, text):
+        self.messages = (self.messages + [text])[-MESSAGE_LINES:]
+        self.unprinted.append(text)
+        
+    def render(self):
+        """Everything the next frame needs written, as one string"""
+        if not self.ansi:
+            return self.render_plain()
+        
+        wanted = dict(self.segments)
+        for i in range(MESSAGE_LINES):
+            text = self.messages[i] if i < len(self.messages) else ""
+            wanted[(MESSAGE_ROW + i, 1)] = text + ERASE_LINE
+        parts = [] if self.on_screen else [CLEAR_SCREEN]
+        for (row, col), text in wanted.items():
+            if self.on_screen.get((row, col)) != text:
+                parts.append(move_to(row, col) + text)
+        self.on_screen = wanted
+        self.unprinted = []
+        
+        # Leave the cursor on a blank prompt line
+        parts.append(move_to(PROMPT_ROW, 1) + ERASE_LINE)
+        return "".join(parts)
+    
+    def render_plain(self):
+        lines = self.unprinted
+        self.unprinted = []
+        if self.segments != self.on_screen:
+            rows = {}
+            for (row, col), text in sorted(self.segments.items()):
+                rows[row] = rows.get(row, "").ljust(col - 1) + text
+            lines = lines + [""] + [rows[row] for row in sorted(rows)] + [""]
+            self.on_screen = self.segments
+        return "".join(line + "\n" for line in lines)
+    
+    def flush(self):
+        self.out.write(self.render())
+        self.out.flush()
+        
+    def ask(self, prompt):
+        """Draw the frame, then read a line of input"""
+        self.flush()
+        return input(prompt)
+
+
 class BattleshipGame:
-    def __init__(self):
-        # 0 = empty water, 1 = ship, 2 = hit, 3 = miss
-        self.player_board = [[0 for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
-        self.computer_board = [[0 for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
-        self.player_attack_board = [[0 for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
-        self.computer_attack_board = [[0 for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+        
+        # Bitboards; cell() gives 0 = empty water, 1 = ship, 2 = hit, 3 = miss
+        self.player_board = Board(BOARD_SIZE)
+        self.computer_board = Board(BOARD_SIZE)
+        self.player_attack_board = Board(BOARD_SIZE)
+        self.computer_attack_board = Board(BOARD_SIZE)
         
         self.player_ships = {}
         self.computer_ships = {}
+        self.shots = 0  # Fired by the player
         
-    def print_board(self, board, show_ships=True, attack_board=False):
-        print("  ", end="")
-        for i in range(1, BOARD_SIZE + 1): # from 1 to 10
-            print(f"{i:2}", end="") # 
-        print()
+        # Where the computer puts its ships and fires (see strategies.py)
+        self.computer_ai = make_strategy("random", BOARD_SIZE, ships.values())
         
-        for i, row_label in enumerate(row_labels):
-            print(f"{row_label} ", end="") # print
-            for j in range(BOARD_SIZE):
-                if attack_board:
-                    if board[i][j] == 0:
-                        print(" .", end="")
-                    elif board[i][j] == 2:
-                        print(" X", end="")  # Hit
-                    elif board[i][j] == 3:
-                        print(" O", end="")  # Miss
-                else:
-                    if board[i][j] == 0:
-                        print(" .", end="")
-                    elif board[i][j] == 1:
-                        print(" S", end="") if show_ships else print(" .", end="")
-                    elif board[i][j] == 2:
-                        print(" X", end="")  # Hit
-                    elif board[i][j] == 3:
-                        print(" O", end="")  # Miss
-            print()
-        print()
+    def panels(self):
+        """What the screen shows: the player's fleet and the player's shots"""
+        return [("Your fleet", self.player_board, True), ("Your attacks", self.player_attack_board, False)]
     
     def is_valid_placement(self, board, row, col, length, direction):
-        if direction == "H":
-            if col + length > BOARD_SIZE:
-                return False
-            for i in range(length):
-                if board[row][col + i] != 0:
-                    return False
-        else:  # Vertical
-            if row + length > BOARD_SIZE:
-                return False
-            for i in range(length):
-                if board[row + i][col] != 0:
-                    return False
-        return True
+        return board.is_valid_placement(row, col, length, direction)
     
     def place_ship(self, board, ship_dict, ship_name, row, col, length, direction):
-        positions = []
-        if direction == "H":
-            for i in range(length):
-                board[row][col + i] = 1
-                positions.append((row, col + i))
-        else:  # Vertical
-            for i in range(length):
-                board[row + i][col] = 1
-                positions.append((row + i, col))
-        ship_dict[ship_name] = positions
+        ship_dict[ship_name] = board.place_ship(ship_name, row, col, length, direction)
+    
+    def next_ship(self):
+        """(name, length) of the player's next ship to place, or None once the fleet is out"""
+        return next(((name, length) for name, length in ships.items() if name not in self.player_ships), None)
     
-    def place_player_ships(self):
-        print("Place your ships!")
-        self.print_board(self.player_board)
+    def place_next_ship(self, direction, row, col):
+        """Place the player's next ship; raises ValueError with the message to show"""
+        ship_name, length = self.next_ship()
+        if direction not in ["H", "V"]:
+            raise ValueError("Please enter H or V")
+        if not self.is_valid_placement(self.player_board, row, col, length, direction):
+            raise ValueError("Cannot place ship there. Try again.")
+        self.place_ship(self.player_board, self.player_ships, ship_name, row, col, length, direction)
+        return f"{ship_name} placed successfully!"
+    
+    def place_rest_randomly(self):
+        """Place whatever is left of the player's fleet at random"""
+        index = self.player_board.placement_index()
+        while self.next_ship():
+            ship_name, length = self.next_ship()
+            row, col, direction = index.choose(length, self.rng)
+            self.place_ship(self.player_board, self.player_ships, ship_name, row, col, length, direction)
+    
+    def place_player_ships(self, screen):
+        screen.message("Place your ships!")
         
-        for ship_name, length in ships.items():
-            placed = False
-            while not placed:
-                try:
-                    print(f"\nPlacing {ship_name} (length {length})")
-                    direction = input("Direction (H for horizontal, V for vertical): ").upper()
-                    if direction not in ["H", "V"]:
-                        print("Please enter H or V")
-                        continue
-                    
-                    coord_input = input("Enter starting coordinate (e.g., A1): ").upper()
-                    if len(coord_input) < 2:
-                        print("Invalid coordinate format")
-                        continue
-                    
-                    row_letter = coord_input[0]
-                    col_num = int(coord_input[1:]) - 1
-                    
-                    if row_letter not in row_to_num or col_num < 0 or col_num >= BOARD_SIZE:
-                        print("Invalid coordinate")
-                        continue
-                    
-                    row = row_to_num[row_letter]
-                    
-                    if self.is_valid_placement(self.player_board, row, col_num, length, direction):
-                        self.place_ship(self.player_board, self.player_ships, ship_name, row, col_num, length, direction)
-                        placed = True
-                        print(f"{ship_name} placed successfully!")
-                        self.print_board(self.player_board)
-                    else:
-                        print("Cannot place ship there. Try again.")
-                        
-                except ValueError:
-                    print("Invalid input. Please try again.")
+        while self.next_ship():
+            ship_name, length = self.next_ship()
+            screen.show(self.panels())
+            try:
+                direction = screen.ask(f"Placing {ship_name} (length {length}). "
+                                       "Direction (H for horizontal, V for vertical): ").upper()
+                if direction not in ["H", "V"]:
+                    screen.message("Please enter H or V")
+                    continue
+                
+                row, col = parse_coord(screen.ask("Enter starting coordinate (e.g., A1): "))
+                screen.message(self.place_next_ship(direction, row, col))
+                
+            except ValueError as e:
+                screen.message(str(e))
     
     def place_computer_ships(self):
-        print("Computer is placing ships...")
-        for ship_name, length in ships.items():
-            placed = False
-            while not placed:
-                direction = random.choice(["H", "V"])
-                row = random.randint(0, BOARD_SIZE - 1)
-                col = random.randint(0, BOARD_SIZE - 1)
-                
-                if self.is_valid_placement(self.computer_board, row, col, length, direction):
-                    self.place_ship(self.computer_board, self.computer_ships, ship_name, row, col, length, direction)
-                    placed = True
-        print("Computer ships placed!")
+        layout = self.computer_ai.place_fleet(self.rng)
+        for (ship_name, length), (row, col, direction) in zip(ships.items(), layout):
+            self.place_ship(self.computer_board, self.computer_ships, ship_name, row, col, length, direction)
     
     def attack(self, board, attack_board, row, col):
-        if board[row][col] == 1:  # Hit a ship
-            # Find which ship was hit and sink the entire ship
-            ship_to_sink = None
-            ship_dict = self.computer_ships if board == self.computer_board else self.player_ships
-            
-            for ship_name, positions in ship_dict.items():
-                if (row, col) in positions:
-                    # positions is a list, ship name and its position.
-                    ship_to_sink = (ship_name, positions)
-                    break
-            
-            if ship_to_sink:
-                ship_name, positions = ship_to_sink
-                # Mark all positions of this ship as hit (sunk)
-                for ship_row, ship_col in positions:
-                    board[ship_row][ship_col] = 2
-                    attack_board[ship_row][ship_col] = 2
-                return "sunk", ship_name
-            else:
-                # Single hit (shouldn't happen, but fallback)
-                board[row][col] = 2
-                attack_board[row][col] = 2
-                return "hit", None
+        # A hit sinks the entire ship
+        result, ship_name = board.attack(row, col)
+        if result == "sunk":
+            attack_board.mark_hit(board.ship_masks[ship_name])
         else:  # Miss
-            board[row][col] = 3
-            attack_board[row][col] = 3
-            return "miss", None
+            attack_board.mark_miss(row, col)
+        return result, ship_name
     
     def is_ship_sunk(self, ship_dict, ship_name, board):
-        positions = ship_dict[ship_name]
-        for row, col in positions:
-            if board[row][col] != 2:  # Not hit
-                return False
-        return True
+        return board.is_ship_sunk(ship_name)
     
     def check_all_ships_sunk(self, ship_dict, board):
-        for ship_name in ship_dict:
-            if not self.is_ship_sunk(ship_dict, ship_name, board):
-                return False
-        return True
+        return board.ships_afloat == 0
+    
+    def fire(self, row, col):
+        """The player's shot; returns the message to show, or raises ValueError for a repeat"""
+        if self.player_attack_board.is_attacked(row, col):
+            raise ValueError("You already attacked this position!")
+        self.shots += 1
+        result, ship_name = self.attack(self.computer_board, self.player_attack_board, row, col)
+        
+        if result == "sunk":
+            return f"HIT AND SUNK! You destroyed the computer's {ship_name}!"
+        elif result == "hit":
+            return "HIT!"
+        return "Miss!"
     
-    def player_turn(self):
-        print("\n--- Your Turn ---")
-        print("Your attack board:")
-        self.print_board(self.player_attack_board, attack_board=True)
+    def player_turn(self, screen):
+        screen.show(self.panels())
         
         while True:
             try:
-                coord_input = input("Enter attack coordinate (e.g., A1): ").upper()
-                if len(coord_input) < 2:
-                    print("Invalid coordinate format")
-                    continue
-                
-                row_letter = coord_input[0]
-                col_num = int(coord_input[1:]) - 1
-                
-                if row_letter not in row_to_num or col_num < 0 or col_num >= BOARD_SIZE:
-                    print("Invalid coordinate")
-                    continue
-                
-                row = row_to_num[row_letter]
-                
-                if self.player_attack_board[row][col_num] != 0:
-                    print("You already attacked this position!")
-                    continue
-                
-                result, ship_name = self.attack(self.computer_board, self.player_attack_board, row, col_num)
-                
-                if result == "sunk":
-                    print(f"HIT AND SUNK! You destroyed the computer's {ship_name}!")
-                elif result == "hit":
-                    print("HIT!")
-                else:
-                    print("Miss!")
+                coord_input = screen.ask("Enter attack coordinate (e.g., A1), or SAVE to save and quit: ").upper()
+                if coord_input == "SAVE":
+                    self.save()
+                    screen.message(f"Game saved to {SAVE_FILE}")
+                    return False
                 
-                break
+                screen.message(self.fire(*parse_coord(coord_input)))
+                return True
                 
-            except ValueError:
-                print("Invalid input. Please try again.")
+            except ValueError as e:
+                screen.message(str(e))
     
     def computer_turn(self):
-        print("\n--- Computer's Turn ---")
-        while True:
-            row = random.randint(0, BOARD_SIZE - 1)
-            col = random.randint(0, BOARD_SIZE - 1)
-            
-            if self.computer_attack_board[row][col] == 0:
-                result, ship_name = self.attack(self.player_board, self.computer_attack_board, row, col)
-                coord = f"{row_labels[row]}{col + 1}"
-                
-                if result == "sunk":
-                    print(f"Computer attacks {coord} - HIT AND SUNK! Computer destroyed your {ship_name}!")
-                elif result == "hit":
-                    print(f"Computer attacks {coord} - HIT!")
-                else:
-                    print(f"Computer attacks {coord} - Miss!")
-                
-                break
+        """The computer fires back; returns the message to show"""
+        cell = self.computer_ai.choose(self.rng)
+        row, col = divmod(cell, BOARD_SIZE)
+        result, ship_name = self.attack(self.player_board, self.computer_attack_board, row, col)
+        coord = f"{row_labels[row]}{col + 1}"
+        
+        if result == "sunk":
+            # The rest of the sunk ship is no longer a target
+            sunk_cells = [ship_row * BOARD_SIZE + ship_col for ship_row, ship_col in self.player_ships[ship_name]]
+            self.computer_ai.observe(cell, sunk_cells)
+            return f"Computer attacks {coord} - HIT AND SUNK! Computer destroyed your {ship_name}!"
+        elif result == "hit":
+            return f"Computer attacks {coord} - HIT!"
+        self.computer_ai.observe(cell)
+        return f"Computer attacks {coord} - Miss!"
     
-    def play(self):
+    def outcome(self):
+        """WIN or LOSE once a fleet is gone, else None"""
+        if self.check_all_ships_sunk(self.computer_ships, self.computer_board):
+            return "WIN"
+        if self.check_all_ships_sunk(self.player_ships, self.player_board):
+            return "LOSE"
+        return None
+    
+    def save(self):
+        with open(SAVE_FILE, "wb") as f:
+            f.write(pack_snapshot(BOARD_SIZE, ships, self.player_board, self.computer_board))
+    
+    def load(self):
+        """Rebuild a new game's boards from SAVE_FILE and delete it; the game resumes on the player's turn.
+
+        Raises ValueError for a damaged save, which is deleted all the same.
+        """
+        with open(SAVE_FILE, "rb") as f:
+            data = f.read()
+        # Resumed once, so later starts don't offer it again; SAVE writes a new one
+        os.remove(SAVE_FILE)
+        state = unpack_snapshot(data, BOARD_SIZE, ships)
+        computer_shots = restore_side(self.player_board, self.player_ships, ships, state["player_layout"],
+                                      state["player_sunk"], state["player_misses"], self.place_ship,
+                                      self.computer_attack_board)
+        restore_side(self.computer_board, self.computer_ships, ships, state["computer_layout"],
+                     state["computer_sunk"], state["computer_misses"], self.place_ship, self.player_attack_board)
+        for cell in computer_shots:
+            self.computer_ai.observe(cell)
+        # One shot per miss, plus one per ship sunk since a hit sinks it
+        self.shots = bin(self.player_attack_board.misses).count("1") + len(ships) - self.computer_board.ships_afloat
+    
+    def play(self, screen, resume=False):
         # Setup phase
-        self.place_player_ships()
-        self.place_computer_ships()
+        if resume:
+            try:
+                self.load()
+                screen.message("Saved game loaded!")
+            except ValueError as e:
+                screen.message(f"Can't resume the saved game ({e}), starting a new one")
+                resume = False
+        if not resume:
+            self.place_player_ships(screen)
+            self.place_computer_ships()
+            screen.message("Computer ships placed!")
         
-        print("\n" + "="*50)
-        print("BATTLE BEGINS!")
-        print("="*50)
+        screen.message("BATTLE BEGINS!")
         
-        # Game loop
+        # Game loop; the boards stay on screen, so there's no pause between turns
         while True:
             # Player turn
-            self.player_turn()
+            if not self.player_turn(screen):
+                break  # Saved
             
-            if self.check_all_ships_sunk(self.computer_ships, self.computer_board):
-                print("\n🎉 CONGRATULATIONS! You won! All computer ships destroyed! 🎉")
+            if self.outcome() == "WIN":
+                screen.message("🎉 CONGRATULATIONS! You won! All computer ships destroyed! 🎉")
                 break
             
             # Computer turn
-            self.computer_turn()
+            screen.message(self.computer_turn())
             
-            if self.check_all_ships_sunk(self.player_ships, self.player_board):
-                print("\n💥 Game Over! Computer won! All your ships destroyed! 💥")
+            if self.outcome() == "LOSE":
+                screen.message("💥 Game Over! Computer won! All your ships destroyed! 💥")
                 break
+        
+        screen.show(self.panels())
+        screen.flush()
+
+
+def run_script(lines, out=None):
+    """Play scripted games without prompts or boards, writing one result line per game.
+    
+    Each line is a command; blank lines and anything after # are skipped:
+    
+        GAME [seed]      start a new game, with the computer's fleet and shots drawn from the seed
+        PLACE H A1       place your next ship (fleet order) facing H or V from a coordinate
+        PLACE RANDOM     place the rest of your fleet at random
+        FIRE B7          fire at a coordinate; the computer fires back
+    
+    The first PLACE or FIRE starts a game if no GAME line has. Shots after
+    a game is decided are ignored. Writes "GAME <n> WIN|LOSE|UNFINISHED
+    <shots fired>" per game, "ERR line <n>: <reason>" for a line that was
+    rejected, and returns the tally of outcomes.
+    """
+    out = out or sys.stdout
+    tally = {"WIN": 0, "LOSE": 0, "UNFINISHED": 0}
+    game = None
+    number = 0
+    for line_number, line in enumerate(lines, 1):
+        words = line.split("#", 1)[0].upper().split()
+        if not words:
+            continue
+        command = words[0]
+        try:
+            # Check the whole line before it can end the current game or start one
+            if command not in ("GAME", "PLACE", "FIRE"):
+                raise ValueError(f"Unknown command {command}")
+            seed = None
+            if command == "GAME" and len(words) > 1:
+                if len(words) > 2 or not words[1].lstrip("-").isdigit():
+                    raise ValueError("GAME takes at most one seed, a whole number")
+                seed = int(words[1])
+            
+            if command == "GAME" or game is None:
+                if game is not None:
+                    report_game(out, tally, number, game)
+                number += 1
+                game = BattleshipGame(seed)
+                game.place_computer_ships()
+                if command == "GAME":
+                    continue
             
-            # Show current status
-            print("\nYour board:")
-            self.print_board(self.player_board)
+            if command == "PLACE":
+                if words[1:] == ["RANDOM"]:
+                    game.place_rest_randomly()
+                elif len(words) != 3:
+                    raise ValueError("PLACE needs a direction and a coordinate, or RANDOM")
+                elif not game.next_ship():
+                    raise ValueError("Your whole fleet is already placed")
+                else:
+                    game.place_next_ship(words[1], *parse_coord(words[2]))
+            elif command == "FIRE":
+                if len(words) != 2:
+                    raise ValueError("FIRE needs a coordinate")
+                if game.next_ship():
+                    raise ValueError("Place your whole fleet before firing")
+                if game.outcome():
+                    continue
+                game.fire(*parse_coord(words[1]))
+                if not game.outcome():
+                    game.computer_turn()
             
-            input("Press Enter to continue...")
+        except ValueError as e:
+            out.write(f"ERR line {line_number}: {e}\n")
+    
+    if game is not None:
+        report_game(out, tally, number, game)
+    out.flush()
+    return tally
+
+
+def report_game(out, tally, number, game):
+    # A fleet not yet placed would count as all sunk
+    outcome = (None if game.next_ship() else game.outcome()) or "UNFINISHED"
+    tally[outcome] += 1
+    out.write(f"GAME {number} {outcome} {game.shots}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Console Battleship")
+    parser.add_argument("--script", metavar="FILE",
+                        help="play scripted games from a file, or - for stdin, instead of prompting")
+    parser.add_argument("--plain", action="store_true", help="print each frame whole instead of redrawing in place")
+    args = parser.parse_args()
+    
+    if args.script:
+        source = sys.stdin if args.script == "-" else open(args.script)
+        with source:
+            tally = run_script(source)
+        print(f"{sum(tally.values())} games: {tally['WIN']} won, {tally['LOSE']} lost, "
+              f"{tally['UNFINISHED']} unfinished", file=sys.stderr)
+        return
+    
+    print("Welcome to Battleship!")
+    game = BattleshipGame()
+    resume = os.path.exists(SAVE_FILE) and input("Resume your saved game? (Y/N): ").upper() == "Y"
+    screen = Screen(ansi=False if args.plain else None)
+    game.play(screen, resume)
+
 
 # Start the game
 if __name__ == "__main__":
-    game = BattleshipGame()
-    game.play()
\ No newline at end of file
+    main()
@@ -0,0 +1,180 @@
+"""Round-robin tournament between computer strategies.
+
+Every pair of strategies (see strategies.py) plays the given number of
+games, swapping who fires first each game, spread across a process pool
+the same way as simulate.py. Reports each side's win rate with a 95%
+Wilson interval, the mean shots the winner needed with a 95% interval,
+and games per second, e.g.:
+
+    python tournament.py --games 1000000 --strategies random,apart
+    python tournament.py --games 20000 --strategies random,apart,density --workers 8
+"""
+import argparse
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+from battleship_engine import BOARD_SIZE, BattleshipEngine, make_fleet
+from strategies import STRATEGY_NAMES
+
+Z = 1.96  # 95% confidence intervals
+
+
+def run_pair(a, b, n_games, seed, board_size=BOARD_SIZE, fleet=None):
+    """Play strategy a against b n_games times and return the tally for this chunk.
+
+    a fires first in even-numbered games and b in odd ones. Shots are
+    counted for the winner, with their squares kept for the interval.
+    """
+    result = new_tally()
+    cache = None  # This process's evaluation cache, if either strategy uses one
+    for i in range(n_games):
+        a_first = i % 2 == 0
+        player, computer = (a, b) if a_first else (b, a)
+        # Each game gets its own seed so any chunk can be replayed exactly
+        game = BattleshipEngine(seed=seed * 1_000_003 + i, computer_ai=computer, board_size=board_size,
+                                fleet=fleet, player_ai=player)
+        for strategy in (game.player_ai, game.computer_ai):
+            if hasattr(strategy, "workers"):
+                strategy.workers = 1  # Already one game per core; no pool inside the pool
+            if cache is None and getattr(strategy, "cache", None) is not None:
+                cache = strategy.cache
+                before = cache.stats()
+        winner, turns = game.play_auto_game()
+        # Either way the winner fired on every one of the turns
+        side = "a" if (winner == "player") == a_first else "b"
+        result["games"] += 1
+        result["a_wins"] += side == "a"
+        result[f"{side}_shots"] += turns
+        result[f"{side}_shots_sq"] += turns * turns
+    if cache is not None:
+        # The cache outlives the chunk, so count only this chunk's lookups
+        after = cache.stats()
+        result["cache_hits"] = after["hits"] - before["hits"]
+        result["cache_misses"] = after["misses"] - before["misses"]
+    return result
+
+
+def new_tally():
+    return {"games": 0, "a_wins": 0, "a_shots": 0, "a_shots_sq": 0, "b_shots": 0, "b_shots_sq": 0,
+            "cache_hits": 0, "cache_misses": 0}
+
+
+def wilson(wins, games, z=Z):
+    """(low, high) Wilson score interval for a win rate"""
+    if not games:
+        return 0.0, 1.0
+    p = wins / games
+    centre = (p + z * z / (2 * games)) / (1 + z * z / games)
+    half = z * math.sqrt(p * (1 - p) / games + z * z / (4 * games * games)) / (1 + z * z / games)
+    return centre - half, centre + half
+
+
+def mean_interval(total, total_sq, n, z=Z):
+    """(mean, half-width) of a normal-approximation interval, from a sum and sum of squares"""
+    if not n:
+        return float("nan"), float("nan")
+    mean = total / n
+    if n == 1:
+        return mean, float("nan")
+    variance = max(0.0, (total_sq - total * total / n) / (n - 1))
+    return mean, z * math.sqrt(variance / n)
+
+
+def tournament(names, n_games, workers=None, chunk_size=10_000, seed=0, board_size=BOARD_SIZE, fleet=None):
+    """Play every pair of strategies n_games times and return {(a, b): tally}, plus timing"""
+    workers = workers or os.cpu_count() or 1
+    chunk_size += chunk_size % 2  # Keep each chunk's first-move split even
+    pairs = list(combinations(names, 2))
+    tasks = []  # (pair, chunk size), one pool task each
+    for pair in pairs:
+        remaining = n_games
+        while remaining > 0:
+            tasks.append((pair, min(chunk_size, remaining)))
+            remaining -= tasks[-1][1]
+    args = (
+        [pair[0] for pair, _ in tasks],
+        [pair[1] for pair, _ in tasks],
+        [chunk for _, chunk in tasks],
+        [seed + i for i in range(len(tasks))],
+        [board_size] * len(tasks),
+        [fleet] * len(tasks),
+    )
+
+    totals = {pair: new_tally() for pair in pairs}
+    start = time.perf_counter()
+    if workers == 1:
+        results = map(run_pair, *args)
+        merge(totals, tasks, results)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            merge(totals, tasks, pool.map(run_pair, *args))
+    seconds = time.perf_counter() - start
+    return {"pairs": totals, "seconds": seconds, "workers": workers}
+
+
+def merge(totals, tasks, results):
+    """Add each chunk's counters into its pair's total"""
+    for (pair, _), result in zip(tasks, results):
+        for key in totals[pair]:
+            totals[pair][key] += result[key]
+
+
+def report(results):
+    """Print the pairings table, an overall table per strategy, and throughput"""
+    print(f"{'Pairing':<26}{'Games':>10}  {'A win rate (95% CI)':<24}{'A shots to win':<18}{'B shots to win':<18}")
+    overall = {}
+    games = 0
+    cache_hits = cache_lookups = 0
+    for (a, b), tally in results["pairs"].items():
+        n = tally["games"]
+        b_wins = n - tally["a_wins"]
+        low, high = wilson(tally["a_wins"], n)
+        a_mean, a_half = mean_interval(tally["a_shots"], tally["a_shots_sq"], tally["a_wins"])
+        b_mean, b_half = mean_interval(tally["b_shots"], tally["b_shots_sq"], b_wins)
+        win_rate = f"{tally['a_wins'] / n:.2%} [{low:.2%}, {high:.2%}]"
+        print(f"{a + ' vs ' + b:<26}{n:>10,}  {win_rate:<24}{a_mean:>6.2f} ± {a_half:<8.3f}{b_mean:>6.2f} ± {b_half:<8.3f}")
+        for name, wins in ((a, tally["a_wins"]), (b, b_wins)):
+            played, won = overall.get(name, (0, 0))
+            overall[name] = (played + n, won + wins)
+        games += n
+        cache_hits += tally["cache_hits"]
+        cache_lookups += tally["cache_hits"] + tally["cache_misses"]
+
+    print(f"\n{'Strategy':<14}{'Games':>10}  Win rate (95% CI)")
+    for name, (played, won) in sorted(overall.items(), key=lambda item: -item[1][1] / item[1][0]):
+        low, high = wilson(won, played)
+        print(f"{name:<14}{played:>10,}  {won / played:.2%} [{low:.2%}, {high:.2%}]")
+
+    games_per_sec = games / results["seconds"]
+    if cache_lookups:
+        print(f"\nEval cache:        {cache_hits / cache_lookups:.1%} of {cache_lookups:,} evaluations reused")
+    print(f"\nElapsed:           {results['seconds']:.2f}s on {results['workers']} worker(s)")
+    print(f"Games/sec:         {games_per_sec:,.0f}")
+    print(f"Games/sec/core:    {games_per_sec / results['workers']:,.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play computer strategies against each other")
+    parser.add_argument("--strategies", default="random,apart,density",
+                        help=f"comma-separated, from {', '.join(STRATEGY_NAMES)}")
+    parser.add_argument("--games", type=int, default=10_000, help="games per pairing")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk", type=int, default=2_000, help="games per pool task")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--size", type=int, default=BOARD_SIZE, help="board width and height")
+    parser.add_argument("--fleet", help="comma-separated ship lengths, e.g. 5,4,3,3,2")
+    args = parser.parse_args()
+
+    names = args.strategies.split(",")
+    unknown = [name for name in names if name not in STRATEGY_NAMES]
+    if unknown or len(names) < 2:
+        parser.error(f"need two or more of {', '.join(STRATEGY_NAMES)}")
+    fleet = make_fleet(int(length) for length in args.fleet.split(",")) if args.fleet else None
+    report(tournament(names, args.games, args.workers, args.chunk, args.seed, args.size, fleet))
+
+
+if __name__ == "__main__":
+    main()
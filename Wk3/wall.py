@@ -0,0 +1,116 @@
+"""Spectator wall: many computer-vs-computer games played in the background, for tiling in one window.
+
+WallFeed plays the games on a background thread with batch.BatchGames,
+two slots per game: slot 2k is game k's player fleet, which the computer
+fires at, and slot 2k+1 is the computer's fleet. Both sides fire at random,
+the player first, so a game where both fleets fall on the same turn goes
+to the player. Finished games restart in place. After every turn the feed
+publishes the cell codes of every board as one array, codes, which
+tile_boards lays out as a single image for BattleshipPygame.run_wall to
+blit and scale in one go. E.g.:
+
+    python battleship_pygame.py --wall 64 --wall-speed 10
+
+Needs NumPy.
+"""
+import math
+import threading
+import time
+
+import numpy as np
+
+from batch import BatchGames
+from battleship_engine import BOARD_SIZE
+from board import EMPTY, HIT, MISS, SHIP
+
+BACKGROUND = 4  # cell code for the gaps between boards
+GAP = 1  # cells between a game's two boards
+GAME_GAP = 3  # cells between games
+
+
+class WallFeed:
+    def __init__(self, n_games, shots_per_second=10, size=BOARD_SIZE, fleet=None, seed=None):
+        self.n_games = n_games
+        self.size = size
+        self.games = BatchGames(2 * n_games, size, fleet, seed)
+        self.interval = 1 / shots_per_second
+
+        # Read by the render loop, written only by the feed thread
+        self.codes = self.board_codes()  # (2 * n_games, size, size) uint8 of board.py cell codes
+        self.turns = 0
+        self.finished = 0
+        self.player_wins = 0
+
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread.is_alive():
+            self.thread.join()
+
+    def run(self):
+        """Play a turn in every game each interval until stopped"""
+        next_turn = time.perf_counter()
+        while not self.stop_event.is_set():
+            self.turn()
+            # Skip turns rather than rush to catch up after a stall
+            next_turn = max(next_turn + self.interval, time.perf_counter())
+            self.stop_event.wait(next_turn - time.perf_counter())
+
+    def turn(self):
+        """One shot from each side of every game; finished games start over"""
+        games = self.games
+        _, finished = games.step(games.random_targets())
+        sunk = finished.reshape(-1, 2)  # game -> (player's fleet gone, computer's fleet gone)
+        over = sunk.any(axis=1)
+        if over.any():
+            self.player_wins += int(sunk[over, 1].sum())
+            self.finished += int(over.sum())
+            games.retire(np.repeat(over, 2))
+        self.turns += 1
+        # A new array each turn, so the render loop never sees one half written
+        self.codes = self.board_codes()
+
+    def board_codes(self):
+        games = self.games
+        codes = np.where(games.ships >= 0, SHIP, EMPTY).astype(np.uint8)
+        codes[games.misses] = MISS
+        codes[games.hits] = HIT  # A sunk ship's cells, including any fired at again
+        return codes
+
+
+def tile_size(size):
+    """(width, height) in cells of one game's tile: two boards side by side, with gaps"""
+    return 2 * size + GAP + GAME_GAP, size + GAME_GAP
+
+
+def wall_grid(n_games, size, width, height):
+    """(columns, pixels per cell) that tile n_games in a width x height area with the biggest cells"""
+    tile_width, tile_height = tile_size(size)
+    best = (1, 0)
+    for cols in range(1, n_games + 1):
+        rows = math.ceil(n_games / cols)
+        scale = min(width // (cols * tile_width), height // (rows * tile_height))
+        if scale > best[1]:
+            best = (cols, scale)
+    if not best[1]:
+        raise ValueError(f"{n_games} games don't fit in {width}x{height} pixels")
+    return best
+
+
+def tile_boards(codes, cols):
+    """Lay every game's two boards out in a grid, as one (height, width) array of cell codes"""
+    boards = codes.reshape(-1, 2, codes.shape[1], codes.shape[2])
+    n_games, _, size, _ = boards.shape
+    tile_width, tile_height = tile_size(size)
+    rows = math.ceil(n_games / cols)
+
+    tiles = np.full((rows * cols, tile_height, tile_width), BACKGROUND, dtype=np.uint8)
+    tiles[:n_games, :size, :size] = boards[:, 0]
+    tiles[:n_games, :size, size + GAP:2 * size + GAP] = boards[:, 1]
+    return tiles.reshape(rows, cols, tile_height, tile_width).transpose(0, 2, 1, 3).reshape(
+        rows * tile_height, cols * tile_width)
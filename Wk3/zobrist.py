@@ -0,0 +1,121 @@
+"""Zobrist hashing of a board's shots, and a bounded cache of position evaluations.
+
+A board's hash is the XOR of a fixed 64-bit key for every miss and every
+hit cell on it, so a shot updates it with one XOR (a sinking shot XORs in
+the ship's precomputed key) and the same pattern of hits, misses and sunk
+ships always hashes the same, in any game and any process. Keys come from
+a fixed mixing function of (cell, miss or hit) rather than a random table,
+so every process agrees on them without sharing anything; ordinary boards
+still read them from a precomputed list.
+
+EvalCache keeps AI evaluations keyed by such hashes, e.g. MonteCarloAI's
+sampled counts, so a position seen before costs a lookup instead of a
+fresh evaluation.
+"""
+import sys
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+MASK64 = (1 << 64) - 1
+SEED = 0x5EEDBA771E550001  # changing it changes every hash
+MISS = 0
+HIT = 1
+TABLE_CELLS = 4096  # boards up to this many cells get their keys as lists
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+ENTRY_OVERHEAD = 160  # rough bytes per cache entry beyond its value: key tuple, dict slot, links
+
+
+def zobrist_key(cell, kind):
+    """The 64-bit key for a cell being a miss (MISS) or a hit (HIT), via splitmix64"""
+    z = (SEED + (cell * 2 + kind + 1) * 0x9E3779B97F4A7C15) & MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+    return z ^ (z >> 31)
+
+
+class ComputedKeys:
+    """keys[cell] for one kind, computed on each lookup; for boards too big to list every key"""
+    def __init__(self, kind):
+        self.kind = kind
+
+    def __getitem__(self, cell):
+        return zobrist_key(cell, self.kind)
+
+
+@lru_cache(maxsize=None)
+def zobrist_keys(size):
+    """(miss keys, hit keys) for a board, each indexed by cell"""
+    if size * size > TABLE_CELLS:
+        return ComputedKeys(MISS), ComputedKeys(HIT)
+    cells = range(size * size)
+    return [zobrist_key(cell, MISS) for cell in cells], [zobrist_key(cell, HIT) for cell in cells]
+
+
+def shots_hash(size, misses, hits):
+    """Hash of miss and hit cells from scratch; Board.zobrist keeps the same value as shots land"""
+    miss_keys, hit_keys = zobrist_keys(size)
+    result = 0
+    for cell in misses:
+        result ^= miss_keys[cell]
+    for cell in hits:
+        result ^= hit_keys[cell]
+    return result
+
+
+class EvalCache:
+    """Bounded LRU cache of evaluations, capped by the memory its values take.
+
+    Each entry counts as sys.getsizeof(value) plus ENTRY_OVERHEAD bytes.
+    Adding one past max_bytes evicts the least recently used entries until
+    it fits. Keys are whatever the caller builds around a position hash;
+    putting the board size and fleet in them as well means a 64-bit
+    collision would also have to match those to give a wrong answer. One
+    cache can be shared between threads, e.g. the server's move workers.
+    """
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        with self.lock:
+            return len(self.entries)
+
+    def get(self, key):
+        """The cached value, or None"""
+        with self.lock:
+            value = self.entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Add or replace an entry, evicting least recently used ones to stay under max_bytes"""
+        size = sys.getsizeof(value) + ENTRY_OVERHEAD
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.bytes -= sys.getsizeof(old) + ENTRY_OVERHEAD
+            if size > self.max_bytes:
+                return
+            self.entries[key] = value
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.bytes -= sys.getsizeof(evicted) + ENTRY_OVERHEAD
+                self.evictions += 1
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "entries": len(self.entries), "bytes": self.bytes,
+                    "hit_rate": self.hits / lookups if lookups else 0.0}